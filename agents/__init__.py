@@ -1,5 +1,18 @@
 # agents/__init__.py
-from agents.base_agent import BaseAgent
-from agents.search_agent import SearchAgent
+# Exports are resolved lazily (PEP 562) so importing one agent module does not
+# import every other agent and its dependencies.
+from importlib import import_module
 
-__all__ = ["BaseAgent", "SearchAgent"] 
\ No newline at end of file
+_EXPORTS = {
+    "BaseAgent": "agents.base_agent",
+    "SearchAgent": "agents.search_agent",
+    "AgentRegistry": "agents.registry",
+}
+
+__all__ = ["BaseAgent", "SearchAgent", "AgentRegistry"]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module 'agents' has no attribute '{name}'")
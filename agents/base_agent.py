@@ -1,12 +1,67 @@
 # agents/base_agent.py
 from dotenv import load_dotenv
 import os
-from typing import List, Optional
-from crewai import Agent, LLM
+import json
+import threading
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, List, Mapping, Optional, Sequence, Union
 from .llm_config import LLMConfig
+from utils.lazy_import import lazy_import
+from utils.llm_cache import LLMResponseCache
+from utils.llm_router import LLMRouter, ModelSpec
+from utils.telemetry import telemetry
+from utils.resilience import CircuitBreaker, ResiliencePolicy, RetryPolicy
+from utils.tokens import count_message_tokens, count_tokens
+
+if TYPE_CHECKING:
+    from crewai import Agent, LLM
+
+# Heavy dependencies are imported on first use so importing agents stays cheap;
+# crewai is only needed when a CrewAI LLM/Agent object is actually built
+logfire = lazy_import("logfire")
+litellm = lazy_import("litellm")
 
 load_dotenv()
 
+class StreamMetrics:
+    """Collects chunks of a streamed completion and its perceived-latency metrics."""
+    def __init__(self, agent: str, model: str):
+        self.agent = agent
+        self.model = model
+        self.started = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.parts: List[str] = []
+
+    def add(self, text: Optional[str]) -> Optional[str]:
+        """Record a chunk; returns the text, or None for empty chunks."""
+        if not text:
+            return None
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.parts.append(text)
+        return text
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def finish(self, completed: bool = True) -> Dict[str, Any]:
+        """Log time-to-first-token and tokens/sec to logfire and return them."""
+        self.finished_at = time.perf_counter()
+        completion_tokens = count_tokens(self.text)
+        ttft = (self.first_token_at - self.started) if self.first_token_at is not None else None
+        generation_time = (self.finished_at - self.first_token_at) if self.first_token_at is not None else 0.0
+        metrics = {
+            "time_to_first_token_ms": round(ttft * 1000, 1) if ttft is not None else None,
+            "total_ms": round((self.finished_at - self.started) * 1000, 1),
+            "completion_tokens": completion_tokens,
+            "tokens_per_sec": round(completion_tokens / generation_time, 1) if generation_time > 0 else None,
+            "completed": completed,
+        }
+        logfire.info("LLM stream finished", agent=self.agent, model=self.model, **metrics)
+        return metrics
+
 class BaseAgent:
     """Base class for all agents in the system, providing common properties and methods."""
     def __init__(self, role: str, goal: str, backstory: str, tools: Optional[List] = None, allow_delegation: bool = False, name: str = 'Base Agent'):
@@ -18,12 +73,91 @@ class BaseAgent:
         self.name = name
         # Grouped LLM configuration as a single field with default values
         self.llm_config = LLMConfig()
+        # Memoized LLM instance, its resolved parameters and the config key it was built from
+        self._llm: Optional["LLM"] = None
+        self._llm_params: Dict[str, Any] = {}
+        self._llm_key: Optional[str] = None
+        self._llm_lock = threading.Lock()
+        # Memoized CrewAI Agent and the settings it was built from (see get_agent)
+        self._crew_agent: Optional["Agent"] = None
+        self._crew_agent_key: Optional[str] = None
+        # Opt-in exact-match response cache (see enable_response_cache)
+        self.response_cache: Optional[LLMResponseCache] = None
+        self.force_response_cache = False
+        self.response_cache_stats = {"hits": 0, "misses": 0, "bypassed": 0, "saved_tokens": 0}
+        # Metrics from the most recent streamed completion (see stream_llm)
+        self.last_stream_metrics: Dict[str, Any] = {}
+        # Per-stage spans/histograms; shared process-wide default (see utils/telemetry.py)
+        self.telemetry = telemetry
+        # Retry/hedging/circuit breaker around LLM calls; replace to tune per agent.
+        # Two attempts by default since a single LLM call can take up to llm_config.timeout
+        self.llm_resilience = ResiliencePolicy(
+            retry=RetryPolicy(max_attempts=2, base_delay=1.0),
+            breaker=CircuitBreaker(name=f"llm:{name}"),
+        )
+        # Opt-in multi-provider routing (see enable_llm_router); replaces
+        # llm_resilience for the calls it handles
+        self.llm_router: Optional[LLMRouter] = None
+
+    def _llm_config_key(self) -> str:
+        """Stable key for the current LLM config; changes whenever any field changes."""
+        return json.dumps(self.llm_config.model_dump(), sort_keys=True, default=str)
+
+    def get_llm(self) -> "LLM":
+        """
+        Return the agent's CrewAI LLM instance, building it on first use.
+        The instance is reused until the LLM config changes (e.g. via `customize_llm`).
+        """
+        key = self._llm_config_key()
+        if self._llm is not None and self._llm_key == key:
+            return self._llm
+        with self._llm_lock:
+            self._refresh_llm_params(key)
+            if self._llm is None:
+                from crewai import LLM
+                self._llm = LLM(**self._llm_params)
+            return self._llm
+
+    def get_llm_params(self) -> Dict[str, Any]:
+        """
+        Resolved completion parameters (config plus API key) for the agent's LLM.
+        Memoized like `get_llm`, but does not require building a CrewAI object.
+        """
+        key = self._llm_config_key()
+        if self._llm_key != key:
+            with self._llm_lock:
+                self._refresh_llm_params(key)
+        return dict(self._llm_params)
 
-    def get_llm(self) -> LLM:
-        """Create and return a configured CrewAI LLM instance based on the agent's config."""
+    def _refresh_llm_params(self, key: str) -> None:
+        # Caller holds self._llm_lock; drops the LLM instance when the config changed
+        if self._llm_key != key:
+            self._llm_params = self._build_llm_params()
+            self._llm = None
+            self._llm_key = key
+
+    def invalidate_llm(self) -> None:
+        """Drop the memoized LLM so the next call rebuilds it (e.g. after rotating API keys)."""
+        with self._llm_lock:
+            self._llm = None
+            self._llm_params = {}
+            self._llm_key = None
+            self._crew_agent = None
+            self._crew_agent_key = None
+
+    def _build_llm_params(self) -> Dict[str, Any]:
+        """Resolve the agent's config and provider API key into LLM parameters."""
         config_dict = self.llm_config.to_dict()
         # Ensure API key is set based on provider in model string
         model_string = config_dict.get('model', os.getenv("LLM_PROVIDER_MODEL", "gemini/gemini-1.5-pro"))
+        config_dict.setdefault('api_key', self._resolve_api_key(model_string))
+        # Commented out to reduce console clutter
+        # print(f"Using model: {model_string}")
+        return config_dict
+
+    @staticmethod
+    def _resolve_api_key(model_string: str) -> str:
+        """API key for the provider prefix of a model string (e.g. "openai/gpt-4o")."""
         provider = model_string.split('/')[0]
         api_key_map = {
             "openai": "OPENAI_API_KEY",
@@ -36,21 +170,42 @@ class BaseAgent:
         api_key = os.getenv(api_key_name)
         if not api_key:
             raise ValueError(f"Missing {api_key_name} in environment variables.")
-        config_dict.setdefault('api_key', api_key)
-        # Commented out to reduce console clutter
-        # print(f"Using model: {model_string}")
-        return LLM(**config_dict)
-
-    def get_agent(self) -> Agent:
-        """Create and return a CrewAI Agent instance with the configured settings."""
-        return Agent(
-            role=self.role,
-            goal=self.goal,
-            backstory=self.backstory,
-            tools=self.tools,
-            allow_delegation=self.allow_delegation,
-            llm=self.get_llm(),
-        )
+        return api_key
+
+    def config_fingerprint(self) -> str:
+        """Key covering everything the CrewAI Agent is built from (LLM config, persona, tools)."""
+        return json.dumps({
+            "llm": self.llm_config.model_dump(),
+            "role": self.role,
+            "goal": self.goal,
+            "backstory": self.backstory,
+            "allow_delegation": self.allow_delegation,
+            "tools": [id(tool) for tool in self.tools],
+        }, sort_keys=True, default=str)
+
+    def get_agent(self) -> "Agent":
+        """
+        Return a CrewAI Agent instance with the configured settings.
+        The instance is reused until any of its settings change (see `config_fingerprint`).
+        A CrewAI Agent must not be used by two tasks at once; pool agents across
+        threads with `agents.registry.AgentRegistry`.
+        """
+        key = self.config_fingerprint()
+        if self._crew_agent is not None and self._crew_agent_key == key:
+            return self._crew_agent
+        llm = self.get_llm()
+        from crewai import Agent
+        with self._llm_lock:
+            self._crew_agent = Agent(
+                role=self.role,
+                goal=self.goal,
+                backstory=self.backstory,
+                tools=self.tools,
+                allow_delegation=self.allow_delegation,
+                llm=llm,
+            )
+            self._crew_agent_key = key
+            return self._crew_agent
 
     def customize_llm(self, **kwargs):
         """Customize LLM parameters by updating the config object."""
@@ -60,23 +215,251 @@ class BaseAgent:
             else:
                 raise ValueError(f"Invalid LLM parameter: {key}")
 
+    def enable_response_cache(self, cache: Optional[LLMResponseCache] = None, force: bool = False) -> LLMResponseCache:
+        """
+        Serve repeated prompts from an exact-match response cache.
+
+        Args:
+            cache: Cache to use (may be shared between agents); defaults to a new in-memory cache
+            force: Cache even when temperature > 0, where responses are normally non-deterministic
+
+        Returns:
+            The cache in use
+        """
+        self.response_cache = cache or LLMResponseCache()
+        self.force_response_cache = force
+        return self.response_cache
+
+    def disable_response_cache(self) -> None:
+        """Stop using the response cache (stats are kept)."""
+        self.response_cache = None
+        self.force_response_cache = False
+
+    def get_response_cache_stats(self) -> Dict[str, Any]:
+        """Per-agent response cache counters, including hit rate and tokens saved."""
+        stats = dict(self.response_cache_stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _active_response_cache(self) -> Optional[LLMResponseCache]:
+        """The response cache to use for this call, or None when disabled or bypassed."""
+        if self.response_cache is None:
+            return None
+        if self.llm_config.temperature > 0 and not self.force_response_cache:
+            self.response_cache_stats["bypassed"] += 1
+            return None
+        return self.response_cache
+
+    def enable_llm_router(self, models: Union[Sequence[ModelSpec], Mapping[str, float], LLMRouter], **router_options) -> LLMRouter:
+        """
+        Route LLM calls across several providers, sending each call to the
+        fastest healthy model and falling back on failure or timeout.
+        Other settings (temperature, max_tokens, ...) still come from `llm_config`.
+
+        Args:
+            models: Model strings in preference order, `(model, weight)` pairs,
+                a `{model: weight}` mapping, or an existing (possibly shared) router
+            **router_options: Passed to `LLMRouter` (timeout, max_error_rate, ...)
+
+        Returns:
+            The router in use; see `LLMRouter.stats()` for its decisions
+        """
+        router = models if isinstance(models, LLMRouter) else LLMRouter(models, **router_options)
+        for model in router.models:
+            self._resolve_api_key(model)  # fail fast on unsupported providers or missing keys
+        self.llm_router = router
+        return router
+
+    def disable_llm_router(self) -> None:
+        """Go back to the single model in `llm_config`."""
+        self.llm_router = None
+
+    def get_llm_router_stats(self) -> Dict[str, Any]:
+        """Routing decisions and per-provider stats, or {} when routing is off."""
+        return self.llm_router.stats() if self.llm_router is not None else {}
+
+    def _routed_params(self, params: Dict[str, Any], model: str) -> Dict[str, Any]:
+        """Completion parameters for one routed attempt at `model`."""
+        routed = dict(params)
+        if model != params.get("model"):
+            routed["model"] = model
+            routed["api_key"] = self._resolve_api_key(model)
+        if self.llm_router.timeout is not None:
+            routed["timeout"] = min(routed.get("timeout", self.llm_router.timeout), self.llm_router.timeout)
+        return routed
+
+    def _complete(self, params: Dict[str, Any], messages: List[Dict[str, Any]],
+                  metrics: Optional[StreamMetrics] = None, **kwargs):
+        """litellm completion through the router when enabled, else through `llm_resilience`."""
+        if self.llm_router is None:
+            return self.llm_resilience.call_sync(lambda: litellm.completion(messages=messages, **kwargs, **params))
+
+        def attempt(model: str):
+            if metrics is not None:
+                metrics.model = model
+            return litellm.completion(messages=messages, **kwargs, **self._routed_params(params, model))
+        return self.llm_router.call_sync(attempt)
+
+    async def _acomplete(self, params: Dict[str, Any], messages: List[Dict[str, Any]],
+                         metrics: Optional[StreamMetrics] = None, **kwargs):
+        """Async version of `_complete`."""
+        if self.llm_router is None:
+            return await self.llm_resilience.call(lambda: litellm.acompletion(messages=messages, **kwargs, **params))
+
+        def attempt(model: str):
+            if metrics is not None:
+                metrics.model = model
+            return litellm.acompletion(messages=messages, **kwargs, **self._routed_params(params, model))
+        return await self.llm_router.call(attempt)
+
     def perform_task(self, task_input: str):
         """Example method to be implemented in subclasses."""
         raise NotImplementedError("Each agent must implement the `perform_task` method.")
 
-    def interact_with_llm(self, prompt: str):
+    def interact_with_llm(self, prompt: str, stream: bool = False):
         """
         Send prompt to the LLM and get the response.
         Uses the configured CrewAI LLM instance from get_llm().
+        With stream=True, returns an iterator of text chunks instead (see `stream_llm`).
         """
-        # Use the LLM instance from get_llm() for interaction
+        if stream:
+            return self.stream_llm(prompt)
+        messages = [{"role": "user", "content": prompt}]
+
+        cache, cache_key, cached = self._lookup_response_cache(messages)
+        if cached is not None:
+            return cached
+
+        if self.llm_router is not None:
+            # Routed calls go straight to litellm (which CrewAI's LLM wraps) so
+            # each attempt can target a different model
+            try:
+                logfire.debug("Calling LLM", agent=self.name, mode="routed")
+                completion = self._complete(self.get_llm_params(), messages)
+                response = completion.choices[0].message.content
+            except Exception as e:
+                raise ValueError(f"Error communicating with LLM: {str(e)}")
+            self._store_response_cache(cache, cache_key, messages, response)
+            return response
+
+        # Use the (memoized) LLM instance from get_llm() for interaction
         llm_instance = self.get_llm()
         
         # Handle interaction with the CrewAI LLM instance
         try:
-            print('Calling CrewAI LLM')
-            messages = [{"role": "user", "content": prompt}]
-            response = llm_instance.call(messages=messages)
-            return response
+            logfire.debug("Calling LLM", agent=self.name, mode="crewai")
+            response = self.llm_resilience.call_sync(lambda: llm_instance.call(messages=messages))
+        except Exception as e:
+            raise ValueError(f"Error communicating with LLM: {str(e)}")
+
+        self._store_response_cache(cache, cache_key, messages, response)
+        return response
+
+    async def ainteract_with_llm(self, prompt: str, stream: bool = False):
+        """
+        Async variant of `interact_with_llm`.
+        Awaits litellm's async completion with the same parameters as the agent's
+        CrewAI LLM, so many calls can share one event loop without a thread each.
+        With stream=True, returns an async iterator of text chunks (see `astream_llm`).
+        """
+        if stream:
+            return self.astream_llm(prompt)
+
+        params = self.get_llm_params()
+        messages = [{"role": "user", "content": prompt}]
+
+        cache, cache_key, cached = self._lookup_response_cache(messages)
+        if cached is not None:
+            return cached
+
+        try:
+            logfire.debug("Calling LLM", agent=self.name, mode="async")
+            completion = await self._acomplete(params, messages)
+            response = completion.choices[0].message.content
         except Exception as e:
             raise ValueError(f"Error communicating with LLM: {str(e)}")
+
+        self._store_response_cache(cache, cache_key, messages, response)
+        return response
+
+    def stream_llm(self, prompt: str) -> Iterator[str]:
+        """
+        Stream the LLM response as text chunks as they arrive.
+        Time-to-first-token and tokens/sec are logged to logfire and kept in
+        `last_stream_metrics` once the stream ends (or the caller stops early).
+        """
+        params = self.get_llm_params()
+        messages = [{"role": "user", "content": prompt}]
+
+        cache, cache_key, cached = self._lookup_response_cache(messages)
+        if cached is not None:
+            yield cached
+            return
+
+        metrics = StreamMetrics(self.name, params.get("model", ""))
+        completed = False
+        try:
+            try:
+                logfire.debug("Calling LLM", agent=self.name, mode="streaming")
+                # Only opening the stream is retried; chunks already yielded cannot be replayed
+                stream = self._complete(params, messages, metrics=metrics, stream=True)
+                for chunk in stream:
+                    text = metrics.add(chunk.choices[0].delta.content if chunk.choices else None)
+                    if text is not None:
+                        yield text
+            except Exception as e:
+                raise ValueError(f"Error communicating with LLM: {str(e)}")
+            completed = True
+        finally:
+            self.last_stream_metrics = metrics.finish(completed)
+
+        self._store_response_cache(cache, cache_key, messages, metrics.text)
+
+    async def astream_llm(self, prompt: str) -> AsyncIterator[str]:
+        """Async iterator version of `stream_llm`."""
+        params = self.get_llm_params()
+        messages = [{"role": "user", "content": prompt}]
+
+        cache, cache_key, cached = self._lookup_response_cache(messages)
+        if cached is not None:
+            yield cached
+            return
+
+        metrics = StreamMetrics(self.name, params.get("model", ""))
+        completed = False
+        try:
+            try:
+                logfire.debug("Calling LLM", agent=self.name, mode="async_streaming")
+                # Only opening the stream is retried; chunks already yielded cannot be replayed
+                response = await self._acomplete(params, messages, metrics=metrics, stream=True)
+                async for chunk in response:
+                    text = metrics.add(chunk.choices[0].delta.content if chunk.choices else None)
+                    if text is not None:
+                        yield text
+            except Exception as e:
+                raise ValueError(f"Error communicating with LLM: {str(e)}")
+            completed = True
+        finally:
+            self.last_stream_metrics = metrics.finish(completed)
+
+        self._store_response_cache(cache, cache_key, messages, metrics.text)
+
+    def _lookup_response_cache(self, messages: List[Dict[str, Any]]):
+        """Return (cache, key, cached_response); cache and key are None when caching is off."""
+        cache = self._active_response_cache()
+        if cache is None:
+            return None, None, None
+        cache_key = cache.make_key(self.llm_config.model_dump(), messages)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            response, tokens = cached
+            self.response_cache_stats["hits"] += 1
+            self.response_cache_stats["saved_tokens"] += tokens
+            return cache, cache_key, response
+        self.response_cache_stats["misses"] += 1
+        return cache, cache_key, None
+
+    def _store_response_cache(self, cache: Optional[LLMResponseCache], cache_key: Optional[str], messages: List[Dict[str, Any]], response) -> None:
+        if cache is not None and isinstance(response, str):
+            cache.set(cache_key, response, count_message_tokens(messages) + count_tokens(response))
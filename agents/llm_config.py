@@ -13,10 +13,10 @@ class LLMConfig(BaseModel):
     presence_penalty: float = 0.1
     timeout: int = Field(default=120, ge=1)
     response_format: Optional[Dict[str, Any]] = None  # e.g., {"type": "json"}
+    base_url: Optional[str] = None  # Custom API endpoint if needed, e.g. a proxy or a local stand-in
     # Commented out parameters below may not be universally supported across all LLM providers in CrewAI
     # seed: Optional[int] = None  # For reproducible results, may not work with all providers
     # stop: Optional[List[str]] = None  # Sequences to stop generation, support varies by provider
-    # base_url: Optional[str] = None  # Custom API endpoint if needed, for specific setups
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert config to dictionary for easy passing to LLM initialization.
@@ -0,0 +1,240 @@
+# agents/registry.py
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from agents.base_agent import BaseAgent
+from utils.lazy_import import lazy_import
+
+logfire = lazy_import("logfire")
+
+
+class _AgentPool:
+    """Instances and counters for one registered agent name (guarded by the registry lock)."""
+    def __init__(self, factory: Callable[[], BaseAgent], max_instances: int, llm_overrides: Dict[str, Any],
+                 warm_crewai: bool):
+        self.factory = factory
+        self.max_instances = max_instances
+        self.llm_overrides = llm_overrides
+        self.warm_crewai = warm_crewai
+        self.generation = 0
+        # Idle entries: (agent, generation it was built for, fingerprint at build time)
+        self.idle: List[Tuple[BaseAgent, int, str]] = []
+        self.total = 0
+        self.in_use = 0
+        self.created = 0
+        self.reused = 0
+        self.recycled = 0
+        self.waits = 0
+        self.build_seconds = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        average = self.build_seconds / self.created if self.created else 0.0
+        return {
+            "max_instances": self.max_instances,
+            "instances": self.total,
+            "in_use": self.in_use,
+            "idle": len(self.idle),
+            "created": self.created,
+            "reused": self.reused,
+            "recycled": self.recycled,
+            "waits": self.waits,
+            "avg_build_ms": round(average * 1000, 3),
+            # Construction time avoided by handing out an existing instance
+            "build_ms_saved": round(average * self.reused * 1000, 1),
+        }
+
+
+class AgentRegistry:
+    """
+    Creates each configured agent once and lends the instances out, one
+    caller at a time, across threads.
+
+    An agent name maps to a factory (e.g. `SearchAgent`) plus optional LLM
+    overrides. `acquire(name)` hands out an idle instance, builds a new one
+    while fewer than `max_instances` exist, or waits for one to be returned.
+    Instances keep their memoized LLM, CrewAI Agent and HTTP connection pools
+    between uses. Re-registering a name with a different factory or config
+    (or calling `configure`) recycles its instances, as does returning an
+    instance whose settings were changed while it was checked out.
+
+    Usage:
+        registry.register("search", lambda: SearchAgent(verbose=False), max_instances=8)
+        with registry.acquire("search") as agent:
+            results = agent.perform_task("query")
+    """
+    def __init__(self):
+        self._pools: Dict[str, _AgentPool] = {}
+        self._lock = threading.Condition()
+
+    def register(self, name: str, factory: Callable[[], BaseAgent], max_instances: int = 4,
+                 warm_crewai: bool = False, **llm_overrides: Any) -> None:
+        """
+        Register (or re-register) an agent configuration.
+
+        Args:
+            name: Registry key
+            factory: Builds one agent instance
+            max_instances: Most instances alive at once; further acquires wait
+            warm_crewai: Also build the CrewAI LLM/Agent at construction time
+            **llm_overrides: Applied with `customize_llm` to every new instance
+        """
+        if max_instances < 1:
+            raise ValueError("max_instances must be at least 1")
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                self._pools[name] = _AgentPool(factory, max_instances, dict(llm_overrides), warm_crewai)
+                return
+            changed = (pool.factory is not factory or pool.llm_overrides != llm_overrides
+                       or pool.warm_crewai != warm_crewai)
+            pool.factory = factory
+            pool.max_instances = max_instances
+            pool.llm_overrides = dict(llm_overrides)
+            pool.warm_crewai = warm_crewai
+            if changed:
+                self._recycle(name, pool)
+            self._lock.notify_all()
+
+    def configure(self, name: str, **llm_overrides: Any) -> None:
+        """Change the LLM overrides of a registered agent; existing instances are recycled."""
+        with self._lock:
+            pool = self._get_pool(name)
+            merged = {**pool.llm_overrides, **llm_overrides}
+            if merged != pool.llm_overrides:
+                pool.llm_overrides = merged
+                self._recycle(name, pool)
+
+    def recycle(self, name: Optional[str] = None) -> None:
+        """Drop the instances of one agent (or all agents); checked-out ones go when returned."""
+        with self._lock:
+            for key in [name] if name is not None else list(self._pools):
+                self._recycle(key, self._get_pool(key))
+
+    @contextmanager
+    def acquire(self, name: str, timeout: Optional[float] = None) -> Iterator[BaseAgent]:
+        """
+        Borrow an instance for the duration of the block.
+
+        Raises:
+            KeyError: if the name is not registered
+            TimeoutError: if no instance became available within `timeout` seconds
+        """
+        agent, generation, fingerprint = self._checkout(name, timeout)
+        try:
+            yield agent
+        finally:
+            self._checkin(name, agent, generation, fingerprint)
+
+    def prewarm(self, name: str, count: Optional[int] = None) -> int:
+        """Build instances up front (default: up to `max_instances`); returns how many were built."""
+        with self._lock:
+            pool = self._get_pool(name)
+            missing = max(0, min(count or pool.max_instances, pool.max_instances) - pool.total)
+            pool.total += missing
+            pool.in_use += missing
+        for built in range(missing):
+            try:
+                agent, generation, fingerprint = self._build(name, pool)
+            except BaseException:
+                # _build released its own slot; release the ones not built yet
+                with self._lock:
+                    pool.total -= missing - built - 1
+                    pool.in_use -= missing - built - 1
+                    self._lock.notify_all()
+                raise
+            self._checkin(name, agent, generation, fingerprint)
+        return missing
+
+    def stats(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """Pool counters (instances, reuse, recycling, build time saved) per agent name."""
+        with self._lock:
+            if name is not None:
+                return self._get_pool(name).stats()
+            return {key: pool.stats() for key, pool in self._pools.items()}
+
+    def _get_pool(self, name: str) -> _AgentPool:
+        # Caller holds self._lock
+        pool = self._pools.get(name)
+        if pool is None:
+            raise KeyError(f"Agent '{name}' is not registered")
+        return pool
+
+    def _recycle(self, name: str, pool: _AgentPool) -> None:
+        # Caller holds self._lock
+        pool.generation += 1
+        dropped = len(pool.idle)
+        pool.total -= dropped
+        pool.recycled += dropped
+        pool.idle.clear()
+        self._lock.notify_all()
+        logfire.info("Agent pool recycled", agent=name, generation=pool.generation, dropped=dropped)
+
+    def _checkout(self, name: str, timeout: Optional[float]) -> Tuple[BaseAgent, int, str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            pool = self._get_pool(name)
+            while True:
+                if pool.idle:
+                    # Most recently returned first: its connections are the warmest
+                    agent, generation, fingerprint = pool.idle.pop()
+                    pool.in_use += 1
+                    pool.reused += 1
+                    return agent, generation, fingerprint
+                if pool.total < pool.max_instances:
+                    pool.total += 1
+                    pool.in_use += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No '{name}' agent available within {timeout}s")
+                pool.waits += 1
+                self._lock.wait(remaining)
+        return self._build(name, pool)
+
+    def _build(self, name: str, pool: _AgentPool) -> Tuple[BaseAgent, int, str]:
+        # Caller has reserved the slot (total and in_use); built outside the lock
+        # so other names and returns are not blocked
+        with self._lock:
+            factory, overrides, warm, generation = (
+                pool.factory, dict(pool.llm_overrides), pool.warm_crewai, pool.generation
+            )
+        started = time.perf_counter()
+        try:
+            agent = factory()
+            if overrides:
+                agent.customize_llm(**overrides)
+            if warm:
+                agent.get_agent()
+        except BaseException:
+            with self._lock:
+                pool.total -= 1
+                pool.in_use -= 1
+                # One condition serves every pool; wake all so this pool's waiter sees it
+                self._lock.notify_all()
+            raise
+        with self._lock:
+            pool.created += 1
+            pool.build_seconds += time.perf_counter() - started
+        logfire.debug("Agent built", agent=name, build_ms=round((time.perf_counter() - started) * 1000, 3))
+        return agent, generation, agent.config_fingerprint()
+
+    def _checkin(self, name: str, agent: BaseAgent, generation: int, fingerprint: str) -> None:
+        with self._lock:
+            pool = self._pools.get(name)
+            if pool is None:
+                return
+            pool.in_use -= 1
+            # Stale config, or settings changed while checked out: do not hand it out again
+            if generation != pool.generation or agent.config_fingerprint() != fingerprint:
+                pool.total -= 1
+                pool.recycled += 1
+            else:
+                pool.idle.append((agent, generation, fingerprint))
+            # One condition serves every pool; wake all so this pool's waiter sees it
+            self._lock.notify_all()
+
+
+# Process-wide default registry
+registry = AgentRegistry()
@@ -1,16 +1,37 @@
 # agents/search_agent.py
 import os
-import logfire  # Add logfire import
-from typing import Dict, List, Any
+import asyncio
+from typing import Dict, List, Any, Optional, Tuple
 from agents.base_agent import BaseAgent
+from utils.lazy_import import lazy_import
 from utils.brave_search_tool import BraveSearchTool
+from utils.search_cache import SearchCache
+from utils.search_memory import SearchMemory
+from utils.page_fetcher import FetchedPage, PageFetcher
+from utils.search_results import SearchResponse
+from utils.prompt_packing import PackedPrompt, PromptPacker
+from utils.async_runner import run_sync
+from utils.rate_limiter import BATCH, request_priority
+from utils.tokens import count_tokens
+
+# logfire is imported on first log call, keeping agent imports cheap
+logfire = lazy_import("logfire")
 
 class SearchAgent(BaseAgent):
     """
     SearchAgent is responsible for performing internet searches and retrieving relevant information.
     It uses the Brave Search API for web searches.
+
+    With a `search_memory`, every successful search is stored in a local
+    full-text index; with `local_first=True` queries are answered from that
+    index when it holds enough fresh matches, and only go to Brave otherwise.
+
+    With a `page_fetcher`, the top result pages are downloaded concurrently
+    and their text is added to the analysis prompt next to the snippets.
     """
-    def __init__(self, name: str = "Search Specialist", verbose: bool = True):
+    def __init__(self, name: str = "Search Specialist", verbose: bool = True, search_cache: Optional[SearchCache] = None,
+                 prompt_packer: Optional[PromptPacker] = None, search_memory: Optional[SearchMemory] = None,
+                 local_first: bool = False, page_fetcher: Optional[PageFetcher] = None):
         # Define required properties for BaseAgent
         role = "Web search Specialist"
         goal = "Find accurate and relevant information from the web based on queries"
@@ -21,21 +42,54 @@ class SearchAgent(BaseAgent):
         if not os.getenv("BRAVE_API_KEY"):
             raise ValueError("BRAVE_API_KEY environment variable is required for SearchAgent")
         
-        # Initialize search tool
-        self.search_tool = BraveSearchTool()
+        # Initialize search tool (optionally backed by a shared result cache)
+        self.search_tool = BraveSearchTool(cache=search_cache, telemetry=self.telemetry)
+
+        # Packs as many ranked results as fit the prompt token budget
+        self.prompt_packer = prompt_packer or PromptPacker()
+        self.last_packed_prompt: Optional[PackedPrompt] = None
+
+        # Local index of past results (see utils/search_memory.py)
+        self.search_memory = search_memory
+        self.local_first = local_first
+
+        # Optional page-fetch stage for deeper analysis (see utils/page_fetcher.py)
+        self.page_fetcher = page_fetcher
+        self.last_fetched_pages: List[FetchedPage] = []
         
         self.verbose = verbose
 
-    def perform_task(self, query: str) -> List[Dict[str, str]]:
+    def perform_task(self, query: str) -> SearchResponse:
         """
         Performs a search using the provided query and returns the results.
+        Thin blocking wrapper around `aperform_task`.
+        
+        Args:
+            query: The search query string
+            
+        Returns:
+            SearchResponse with the results (title, url, description), or with
+            `error` set if the search failed
+        """
+        return run_sync(self.aperform_task(query))
+
+    async def aperform_task(self, query: str) -> SearchResponse:
+        """
+        Async version of `perform_task`: the Brave search and the LLM analysis are
+        both awaited, so many tasks can share one event loop without a thread each.
         
         Args:
             query: The search query string
             
         Returns:
-            A list of search results, each containing title, url, and description
+            SearchResponse with the results (title, url, description), or with
+            `error` set if the search failed
         """
+        # Each stage (search HTTP/decode, prompt, LLM) is timed in a nested span
+        with self.telemetry.task("search_agent.task", agent=self.name, query=query):
+            return await self._execute_task(query)
+
+    async def _execute_task(self, query: str) -> SearchResponse:
         logfire.info("Search started", agent=self.name, query=query)
         if self.verbose:
             print("\n" + "="*50)
@@ -50,26 +104,50 @@ class SearchAgent(BaseAgent):
             if self.verbose:
                 print(f"🔎 Executing search query: '{query}'")
                 
-            search_results = self.search_tool.search(query)
-            logfire.info("Search completed", agent=self.name, query=query, result_count=len(search_results))
+            with self.telemetry.stage("search_agent.search") as span:
+                search_results, source = await self._search(query)
+                span.set_attributes({"result_count": len(search_results), "source": source})
+            logfire.info("Search completed", agent=self.name, query=query, result_count=len(search_results), source=source)
             
             if self.verbose:
-                print(f"✅ Found {len(search_results)} results")
-                if len(search_results) > 0 and "error" in search_results[0]:
-                    print(f"❌ Error: {search_results[0]['error']}")
+                print(f"✅ Found {len(search_results)} results" + (" (search memory)" if source == "memory" else ""))
+                if not search_results.ok:
+                    print(f"❌ Error: {search_results.error}")
+
+            # Nothing to analyze: skip the page fetch, prompt and LLM stages
+            if not search_results.ok or not search_results:
+                logfire.info("LLM analysis skipped", agent=self.name, query=query,
+                             reason="search failed" if not search_results.ok else "no results")
+                return search_results
             
-            # LLM analysis enabled to enhance search results with summary
+            # LLM analysis enabled to enhance search results with summary;
+            # streamed so it is printed as it arrives rather than after the full completion
             try:
-                prompt = f"""
-                Analyze the following search results for the query: '{query}'
-                
-                {search_results[:3]}
-                
-                Provide a brief summary of the key information found:
-                """
-                analysis = self.interact_with_llm(prompt)
+                pages = await self.fetch_pages(search_results) if self.page_fetcher is not None else None
+
+                with self.telemetry.stage("search_agent.prompt") as span:
+                    packed = self.pack_analysis_prompt(query, search_results, pages=pages)
+                    prompt = packed.text
+                    span.set_attributes(packed.to_dict())
+                    self.telemetry.record("agent_x.llm.prompt_tokens", packed.tokens_used, unit="{token}", agent=self.name)
                 if self.verbose:
-                    print(f"\n📊 Analysis: {analysis}\n")
+                    print(f"🧮 Prompt: {packed.tokens_used}/{packed.budget} tokens, "
+                          f"{packed.results_packed}/{packed.results_available} results")
+
+                with self.telemetry.stage("search_agent.llm", model=self.llm_config.model) as span:
+                    parts = []
+                    async for chunk in self.astream_llm(prompt):
+                        if self.verbose:
+                            if not parts:
+                                print("\n📊 Analysis: ", end="")
+                            print(chunk, end="", flush=True)
+                        parts.append(chunk)
+                    if self.verbose and parts:
+                        print("\n")
+                    if self.telemetry.sampled:
+                        completion_tokens = count_tokens("".join(parts))
+                        span.set_attribute("completion_tokens", completion_tokens)
+                        self.telemetry.record("agent_x.llm.completion_tokens", completion_tokens, unit="{token}", agent=self.name)
             except Exception as e:
                 logfire.error("LLM analysis failed", agent=self.name, query=query, error=str(e))
                 if self.verbose:
@@ -81,8 +159,136 @@ class SearchAgent(BaseAgent):
             logfire.error("Search failed", agent=self.name, query=query, error=str(e))
             if self.verbose:
                 print(f"❌ {error_msg}")
-            return [{"error": error_msg}]
+            return SearchResponse.failure(error_msg)
     
+    async def _search(self, query: str) -> Tuple[SearchResponse, str]:
+        """
+        Search memory first when `local_first` is set, then Brave. Brave results
+        are added to the search memory. Memory errors never fail the search.
+
+        Returns:
+            (response, source) where source is "memory" or "brave"
+        """
+        memory = self.search_memory
+        if memory is not None and self.local_first:
+            try:
+                # SQLite calls run off the event loop so other tasks keep going
+                local = await asyncio.to_thread(memory.lookup, query)
+            except Exception as e:
+                logfire.error("Search memory lookup failed", agent=self.name, query=query, error=str(e))
+                local = None
+            if local is not None:
+                return local, "memory"
+
+        results = await self.search_tool.async_search(query)
+        if memory is not None and results.ok:
+            try:
+                await asyncio.to_thread(memory.remember, query, results)
+            except Exception as e:
+                logfire.error("Search memory write failed", agent=self.name, query=query, error=str(e))
+        return results, "brave"
+
+    async def fetch_pages(self, search_results: SearchResponse) -> Dict[str, str]:
+        """
+        Download the top `page_fetcher.top_n` result pages concurrently and
+        extract their text. Timed as the `search_agent.fetch` stage with bytes
+        read and success rate; the pages are kept in `last_fetched_pages`.
+
+        Args:
+            search_results: Ranked search results
+
+        Returns:
+            Extracted text by URL, for the pages that were fetched successfully
+        """
+        urls = [result.url for result in search_results.results[:self.page_fetcher.top_n]]
+        if not urls:
+            self.last_fetched_pages = []
+            return {}
+        with self.telemetry.stage("search_agent.fetch", pages=len(urls)) as span:
+            fetched = await self.page_fetcher.fetch_many(urls)
+            succeeded = sum(page.ok for page in fetched)
+            summary = {
+                "pages_ok": succeeded,
+                "success_rate": succeeded / len(fetched),
+                "bytes_read": sum(page.bytes_read for page in fetched),
+                "truncated": sum(page.truncated for page in fetched),
+                "skipped_non_html": sum(page.skipped for page in fetched),
+            }
+            span.set_attributes(summary)
+        self.last_fetched_pages = fetched
+        logfire.info("Pages fetched", agent=self.name, pages=len(fetched), **summary)
+        if self.verbose:
+            print(f"📄 Fetched {succeeded}/{len(fetched)} pages ({summary['bytes_read'] / 1024:.0f} KiB)")
+        return {page.url: page.text for page in fetched if page.ok}
+
+    def pack_analysis_prompt(self, query: str, search_results: SearchResponse,
+                             pages: Optional[Dict[str, str]] = None) -> PackedPrompt:
+        """
+        Pack the search results into the analysis prompt, in rank order, within
+        the packer's token budget (capped by the model's context window minus
+        `llm_config.max_tokens`). The result is also kept in `last_packed_prompt`.
+
+        Args:
+            query: The search query string
+            search_results: Ranked search results
+            pages: Extracted page text by result URL (see `fetch_pages`)
+
+        Returns:
+            PackedPrompt with the prompt text and tokens used versus the budget
+        """
+        budget = self.prompt_packer.budget_for(self.llm_config)
+        packed = self.prompt_packer.pack(query, search_results, budget=budget, pages=pages)
+        self.last_packed_prompt = packed
+        logfire.info("Analysis prompt packed", agent=self.name, **packed.to_dict())
+        return packed
+
+    def perform_batch(self, queries: List[str], concurrency: int = 8) -> List[SearchResponse]:
+        """
+        Performs many searches concurrently on a single event loop (no LLM analysis).
+
+        Args:
+            queries: The search query strings
+            concurrency: Maximum number of searches in flight at once
+
+        Returns:
+            One SearchResponse per query, in the same order as `queries`.
+            A failed query yields a response with `ok == False` without
+            affecting the others.
+        """
+        return run_sync(self.aperform_batch(queries, concurrency=concurrency))
+
+    async def aperform_batch(self, queries: List[str], concurrency: int = 8) -> List[SearchResponse]:
+        """
+        Async variant of `perform_batch` for callers already running an event loop.
+        Searches go through the search memory (if set) and `BraveSearchTool.async_search`,
+        bounded by a semaphore, at BATCH rate-limit priority.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(query: str) -> SearchResponse:
+            async with semaphore:
+                try:
+                    results, _ = await self._search(query)
+                    return results
+                except Exception as e:
+                    logfire.error("Batch search failed", agent=self.name, query=query, error=str(e))
+                    return SearchResponse.failure(f"Search failed: {str(e)}")
+
+        logfire.info("Batch search started", agent=self.name, query_count=len(queries), concurrency=concurrency)
+        if self.verbose:
+            print(f"🔎 Executing {len(queries)} search queries (concurrency={concurrency})")
+
+        with request_priority(BATCH):
+            results = await asyncio.gather(*(run_one(query) for query in queries))
+
+        failed = sum(1 for result in results if not result.ok)
+        logfire.info("Batch search completed", agent=self.name, query_count=len(queries), failed=failed)
+        if self.verbose:
+            print(f"✅ Completed {len(queries) - failed}/{len(queries)} searches")
+        return list(results)
+
     def get_agent_info(self) -> Dict[str, Any]:
         """
         Returns information about this agent for use in CrewAI or other frameworks.
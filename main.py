@@ -1,12 +1,13 @@
 import os
 from dotenv import load_dotenv
 load_dotenv()
-import logfire
 from tasks.agents_test.search_agent_test import run_search_task
 
-# Initialize logfire (will use LOGFIRE_TOKEN from .env)
-logfire.configure()
-
 if __name__ == "__main__":
+    # Import and initialize logfire only when running as a script
+    # (will use LOGFIRE_TOKEN from .env); importing main stays cheap
+    import logfire
+    logfire.configure()
+
     logfire.info("Starting test run from main.py")
-    run_search_task()
\ No newline at end of file
+    run_search_task()
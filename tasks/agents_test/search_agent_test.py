@@ -49,13 +49,13 @@ def run_search_task(query=None, verbose=True):
         search_results = agent.perform_task(search_query)
         
         # Display the search results
+        if not search_results.ok:
+            print(f"❌ Search error: {search_results.error}")
+            sys.exit(1)
+
         if not search_results:
             print("❌ No search results returned.")
             sys.exit(1)
-            
-        if isinstance(search_results, list) and len(search_results) > 0 and "error" in search_results[0]:
-            print(f"❌ Search error: {search_results[0]['error']}")
-            sys.exit(1)
         
         # Display results in a nicely formatted way
         print("\n" + "="*70)
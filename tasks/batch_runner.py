@@ -0,0 +1,226 @@
+# tasks/batch_runner.py
+"""
+Batch execution of search jobs with warm SearchAgent workers.
+
+Jobs are read lazily from JSONL (`{"id": ..., "query": ...}` or a bare query
+per line), run on a thread pool (agents borrowed from an AgentRegistry) or a
+process pool (one agent per worker process), and written out as JSONL as
+they complete. With a checkpoint file, successful job ids are recorded so
+an interrupted batch can be resumed; failed jobs are retried on resume.
+
+Used by the `agent-x batch` command (see tasks/cli.py).
+"""
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Set, TextIO
+
+from utils.async_runner import run_sync
+from utils.rate_limiter import BATCH, request_priority
+
+MODES = ("thread", "process")
+
+
+def read_jobs(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Parse jobs from JSONL lines. A line is either a JSON object with a `query`
+    (and optionally an `id`) or a plain query string (a line that is some
+    other JSON value, such as `2024`, is taken verbatim); blank lines are skipped.
+    Jobs without an id get their 1-based line number.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except json.JSONDecodeError:
+            job = line
+        # Only objects and strings are JSON jobs; a bare `42` or `true` is a query
+        if not isinstance(job, (dict, str)):
+            job = line
+        if isinstance(job, str):
+            job = {"query": job}
+        if not isinstance(job, dict) or not str(job.get("query", "")).strip():
+            raise ValueError(f"Line {number}: expected a query string or an object with a 'query'")
+        job.setdefault("id", number)
+        yield job
+
+
+def load_checkpoint(path: Optional[str]) -> Set[str]:
+    """Ids of jobs already completed successfully, from a checkpoint file."""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as handle:
+        return {line.rstrip("\n") for line in handle if line.strip()}
+
+
+def build_agent(options: Dict[str, Any]):
+    """Construct a quiet SearchAgent configured for batch work."""
+    from agents.search_agent import SearchAgent
+
+    agent = SearchAgent(verbose=False)
+    if options.get("model"):
+        agent.customize_llm(model=options["model"])
+    if options.get("llm_base_url"):
+        agent.customize_llm(base_url=options["llm_base_url"])
+    return agent
+
+
+async def run_job(agent, job: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one job on an agent; failures are reported in the record, never raised.
+    Searches run at BATCH rate-limit priority, behind interactive ones.
+    """
+    started = time.perf_counter()
+    record: Dict[str, Any] = {"id": job["id"], "query": job["query"]}
+    with request_priority(BATCH), agent.telemetry.task("batch.job", agent=agent.name, query=job["query"]):
+        try:
+            response = await agent.search_tool.async_search(job["query"], count=options.get("count", 10))
+        except Exception as e:
+            response = None
+            record.update(ok=False, error=f"Search failed: {str(e)}")
+        if response is not None:
+            record.update(ok=response.ok, results=response.to_dicts() if response.ok else [])
+            if not response.ok:
+                record["error"] = response.error
+            elif options.get("analyze"):
+                try:
+                    prompt = agent.pack_analysis_prompt(job["query"], response)
+                    record["analysis"] = await agent.ainteract_with_llm(prompt.text)
+                    record["prompt_tokens"] = prompt.tokens_used
+                except Exception as e:
+                    record["analysis_error"] = str(e)
+    record["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return record
+
+
+# Per-process state for process-pool workers
+_worker_agent = None
+_worker_options: Dict[str, Any] = {}
+
+
+def _init_process_worker(options: Dict[str, Any]) -> None:
+    global _worker_agent, _worker_options
+    # Agents print progress; keep it off stdout, which may carry the JSONL output
+    sys.stdout = sys.stderr
+    _worker_options = options
+    _worker_agent = build_agent(options)
+
+
+def _run_in_process(job: Dict[str, Any]) -> Dict[str, Any]:
+    return run_sync(run_job(_worker_agent, job, _worker_options))
+
+
+def run_batch(
+    jobs: Iterable[Dict[str, Any]],
+    output: TextIO,
+    mode: str = "thread",
+    concurrency: int = 4,
+    checkpoint_path: Optional[str] = None,
+    options: Optional[Dict[str, Any]] = None,
+    agent_factory: Optional[Callable[[], Any]] = None,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Run jobs with at most `concurrency` in flight and stream JSONL records to `output`.
+
+    Args:
+        jobs: Job dicts with `id` and `query` (see `read_jobs`); consumed lazily
+        output: Text stream for the JSONL records, written in completion order
+        mode: "thread" (warm agents from an AgentRegistry in this process) or
+            "process" (one warm agent per worker process)
+        concurrency: Worker threads or processes
+        checkpoint_path: File recording ids of successful jobs; jobs listed there are skipped
+        options: Job options (count, analyze, model, llm_base_url)
+        agent_factory: Builds agents for thread mode; defaults to `build_agent(options)`
+        on_result: Called with each record after it is written
+
+    Returns:
+        Summary with total, ok, failed and skipped counts, elapsed seconds and
+        throughput (plus agent pool stats in thread mode)
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    # Agents print progress; route it to stderr for the whole run (one switch
+    # here rather than per worker thread, since sys.stdout is process-global).
+    # `output` was bound before the switch, so it may still be the real stdout.
+    with redirect_stdout(sys.stderr):
+        return _run_batch(jobs, output, mode, concurrency, checkpoint_path, options or {}, agent_factory, on_result)
+
+
+def _run_batch(jobs, output, mode, concurrency, checkpoint_path, options, agent_factory, on_result) -> Dict[str, Any]:
+    done = load_checkpoint(checkpoint_path)
+    summary = {"total": 0, "ok": 0, "failed": 0, "skipped": 0}
+    started = time.perf_counter()
+
+    executor: Executor
+    registry = None
+    if mode == "thread":
+        from agents.registry import AgentRegistry
+
+        # Agents are built once and lent to one job at a time, so their HTTP
+        # connection pools, memoized LLM parameters and caches carry over between jobs
+        registry = AgentRegistry()
+        registry.register("batch", agent_factory or (lambda: build_agent(options)), max_instances=concurrency)
+        registry.prewarm("batch")
+
+        def submit(job: Dict[str, Any]):
+            def work():
+                with registry.acquire("batch") as agent:
+                    return run_sync(run_job(agent, job, options))
+            return executor.submit(work)
+
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="agent-x-batch")
+    else:
+        executor = ProcessPoolExecutor(max_workers=concurrency, initializer=_init_process_worker, initargs=(options,))
+
+        def submit(job: Dict[str, Any]):
+            return executor.submit(_run_in_process, job)
+
+    checkpoint = open(checkpoint_path, "a", encoding="utf-8") if checkpoint_path else None
+    pending = set()
+    try:
+        def drain(return_when):
+            nonlocal pending
+            finished, pending = wait(pending, return_when=return_when)
+            for future in finished:
+                record = future.result()
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                output.flush()
+                summary["ok" if record["ok"] else "failed"] += 1
+                # Written after the record, so a crash can only repeat a job, never lose one
+                if checkpoint is not None and record["ok"]:
+                    checkpoint.write(f"{record['id']}\n")
+                    checkpoint.flush()
+                if on_result is not None:
+                    on_result(record)
+
+        # Bounded window: the input is read only as fast as jobs complete
+        for job in jobs:
+            if str(job["id"]) in done:
+                summary["skipped"] += 1
+                continue
+            summary["total"] += 1
+            pending.add(submit(job))
+            if len(pending) >= concurrency * 2:
+                drain(FIRST_COMPLETED)
+        while pending:
+            drain(FIRST_COMPLETED)
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=not pending, cancel_futures=True)
+        if checkpoint is not None:
+            checkpoint.close()
+
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    summary["jobs_per_sec"] = round(summary["total"] / summary["seconds"], 2) if summary["seconds"] > 0 else None
+    if registry is not None:
+        summary["agent_pool"] = registry.stats("batch")
+    return summary
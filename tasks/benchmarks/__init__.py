@@ -0,0 +1 @@
+# tasks/benchmarks/__init__.py
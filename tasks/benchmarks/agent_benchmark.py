@@ -0,0 +1,262 @@
+# tasks/benchmarks/agent_benchmark.py
+"""
+Offline end-to-end benchmark for SearchAgent.
+
+Starts a local FakeBraveServer and an OpenAI-compatible FakeLLMServer (each
+with configurable latency, error rate and payload size), points a SearchAgent
+at them and drives it at several concurrency levels through:
+  - perform_task   (sync, one caller thread per concurrent task)
+  - aperform_task  (async, one event loop)
+  - perform_batch  (async search-only batch)
+Reports p50/p95/p99 latency and throughput per mode and level as JSON, so
+runs can be compared across commits. No API keys are needed.
+
+Run:
+    python -m tasks.benchmarks.agent_benchmark --tasks=64 --levels=1,8,32 --output=bench.json
+    python -m tasks.benchmarks.agent_benchmark --compare=bench.json
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Any, Dict, List, Optional
+
+from tasks.benchmarks.fake_brave import FakeBraveServer
+from tasks.benchmarks.fake_llm import FakeLLMServer
+
+MODES = ("perform_task", "aperform_task", "perform_batch")
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of values, or None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(mode: str, concurrency: int, latencies: List[float], elapsed: float, errors: int) -> Dict[str, Any]:
+    """Build one result row; latencies and elapsed are in seconds."""
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "tasks": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_per_sec": round(len(latencies) / elapsed, 2) if elapsed > 0 else None,
+        "latency_ms": {
+            name: round(value * 1000, 1) if value is not None else None
+            for name, value in (
+                ("p50", percentile(latencies, 50)),
+                ("p95", percentile(latencies, 95)),
+                ("p99", percentile(latencies, 99)),
+            )
+        },
+    }
+
+
+def _is_error(results) -> bool:
+    return not results.ok
+
+
+def _run_perform_task(agent, queries: List[str], concurrency: int):
+    latencies, errors = [], 0
+
+    def run_one(query: str):
+        started = time.perf_counter()
+        results = agent.perform_task(query)
+        return time.perf_counter() - started, _is_error(results)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for latency, failed in pool.map(run_one, queries):
+            latencies.append(latency)
+            errors += failed
+    return latencies, errors
+
+
+async def _run_aperform_task(agent, queries: List[str], concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(query: str):
+        async with semaphore:
+            started = time.perf_counter()
+            results = await agent.aperform_task(query)
+            return time.perf_counter() - started, _is_error(results)
+
+    outcomes = await asyncio.gather(*(run_one(query) for query in queries))
+    return [latency for latency, _ in outcomes], sum(failed for _, failed in outcomes)
+
+
+def _run_perform_batch(agent, queries: List[str], concurrency: int):
+    # Time each search inside the batch by wrapping the tool's coroutine
+    latencies = []
+    original = agent.search_tool.async_search
+
+    async def timed_search(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await original(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    agent.search_tool.async_search = timed_search
+    try:
+        results = agent.perform_batch(queries, concurrency=concurrency)
+    finally:
+        del agent.search_tool.async_search
+    return latencies, sum(_is_error(result) for result in results)
+
+
+def _current_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_agent_benchmark(
+    tasks: int = 64,
+    levels=(1, 8, 32),
+    modes=MODES,
+    brave_latency: float = 0.05,
+    brave_error_rate: float = 0.0,
+    description_size: int = 120,
+    llm_latency: float = 0.2,
+    llm_token_delay: float = 0.002,
+    llm_error_rate: float = 0.0,
+    completion_tokens: int = 64,
+) -> Dict[str, Any]:
+    """
+    Drive SearchAgent against local stand-ins and collect latency/throughput.
+
+    Returns:
+        JSON-serializable report with the configuration and one row per (mode, level)
+    """
+    os.environ.setdefault("BRAVE_API_KEY", "bench")
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ.setdefault("LOGFIRE_IGNORE_NO_CONFIG", "1")
+    from agents.search_agent import SearchAgent
+    from utils.brave_search_tool import BraveSearchTool
+
+    config = {
+        "tasks": tasks,
+        "levels": list(levels),
+        "brave": {"latency": brave_latency, "error_rate": brave_error_rate, "description_size": description_size},
+        "llm": {"latency": llm_latency, "token_delay": llm_token_delay, "error_rate": llm_error_rate,
+                "completion_tokens": completion_tokens},
+    }
+    rows = []
+    with FakeBraveServer(latency=brave_latency, error_rate=brave_error_rate, description_size=description_size) as brave, \
+            FakeLLMServer(latency=llm_latency, token_delay=llm_token_delay, error_rate=llm_error_rate,
+                          completion_tokens=completion_tokens) as llm:
+        agent = SearchAgent(verbose=False)
+        agent.search_tool = BraveSearchTool(
+            base_url=brave.url,
+            max_connections=max(levels),
+            max_keepalive_connections=max(levels),
+        )
+        agent.customize_llm(model="openai/fake-model", base_url=llm.url, temperature=0.0)
+
+        # Agents print progress; keep it (and litellm's serializer warnings) out of the report
+        with redirect_stdout(StringIO()), warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            agent.perform_task("warm up")
+            for mode in modes:
+                for level in levels:
+                    queries = [f"{mode} query {level} {i}" for i in range(tasks)]
+                    started = time.perf_counter()
+                    if mode == "perform_task":
+                        latencies, errors = _run_perform_task(agent, queries, level)
+                    elif mode == "aperform_task":
+                        latencies, errors = asyncio.run(_run_aperform_task(agent, queries, level))
+                    elif mode == "perform_batch":
+                        latencies, errors = _run_perform_batch(agent, queries, level)
+                    else:
+                        raise ValueError(f"Unknown benchmark mode: {mode}")
+                    rows.append(summarize(mode, level, latencies, time.perf_counter() - started, errors))
+
+        config["injected_errors"] = {"brave": brave.errors, "llm": llm.errors}
+
+    return {"commit": _current_commit(), "timestamp": time.time(), "config": config, "results": rows}
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    """Print the report as a table, with deltas against a baseline report if given."""
+    previous = {
+        (row["mode"], row["concurrency"]): row for row in (baseline or {}).get("results", [])
+    }
+    print("\n" + "=" * 90)
+    title = f"📊 SearchAgent offline benchmark (commit {report.get('commit') or 'unknown'})"
+    if baseline:
+        title += f" vs {baseline.get('commit') or 'baseline'}"
+    print(title)
+    print("=" * 90)
+    print(f"{'mode':<15}{'conc':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'per sec':>10}{'errors':>8}{'Δp95':>9}{'Δtput':>9}")
+    for row in report["results"]:
+        latency = row["latency_ms"]
+        line = (f"{row['mode']:<15}{row['concurrency']:>6}{latency['p50'] or 0:>10}{latency['p95'] or 0:>10}"
+                f"{latency['p99'] or 0:>10}{row['throughput_per_sec'] or 0:>10}{row['errors']:>8}")
+        before = previous.get((row["mode"], row["concurrency"]))
+        if before and before["latency_ms"]["p95"] and before["throughput_per_sec"]:
+            p95_delta = (latency["p95"] - before["latency_ms"]["p95"]) / before["latency_ms"]["p95"] * 100
+            tput_delta = (row["throughput_per_sec"] - before["throughput_per_sec"]) / before["throughput_per_sec"] * 100
+            line += f"{p95_delta:>+8.1f}%{tput_delta:>+8.1f}%"
+        print(line)
+    print("=" * 90)
+
+
+if __name__ == "__main__":
+    options: Dict[str, Any] = {}
+    output_path = None
+    compare_path = None
+    float_args = {
+        "--brave-latency": "brave_latency",
+        "--brave-error-rate": "brave_error_rate",
+        "--llm-latency": "llm_latency",
+        "--llm-token-delay": "llm_token_delay",
+        "--llm-error-rate": "llm_error_rate",
+    }
+    int_args = {
+        "--tasks": "tasks",
+        "--description-size": "description_size",
+        "--completion-tokens": "completion_tokens",
+    }
+
+    # Parse command line arguments
+    for arg in sys.argv[1:]:
+        name, _, value = arg.partition("=")
+        if name in float_args:
+            options[float_args[name]] = float(value)
+        elif name in int_args:
+            options[int_args[name]] = int(value)
+        elif name == "--levels":
+            options["levels"] = tuple(int(level) for level in value.split(","))
+        elif name == "--modes":
+            options["modes"] = tuple(value.split(","))
+        elif name == "--output":
+            output_path = value
+        elif name == "--compare":
+            compare_path = value
+
+    result = run_agent_benchmark(**options)
+    baseline_report = None
+    if compare_path:
+        with open(compare_path, "r", encoding="utf-8") as handle:
+            baseline_report = json.load(handle)
+    print_report(result, baseline_report)
+
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as handle:
+            json.dump(result, handle, indent=2)
+        print(f"Report written to {output_path}")
+    else:
+        print(json.dumps(result, indent=2))
@@ -0,0 +1,104 @@
+# tasks/benchmarks/agent_pool_benchmark.py
+"""
+Agent construction benchmark: building agents per use vs borrowing them
+from an AgentRegistry.
+
+For each of `--uses` units of work it either
+  - fresh:  constructs a SearchAgent and its CrewAI Agent (`get_agent()`)
+  - pooled: acquires an instance from an AgentRegistry (which builds each
+            instance, CrewAI Agent included, once)
+and reports the time spent getting a ready agent plus the registry's own
+construction-time-saved counters. Imports (crewai is slow to import) are
+done before timing. No API calls are made.
+
+Run:
+    python -m tasks.benchmarks.agent_pool_benchmark --uses=200 --threads=4
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+
+def run_agent_pool_benchmark(uses: int = 200, threads: int = 4, crewai: bool = True) -> Dict[str, Any]:
+    """
+    Compare per-use construction with registry reuse and print a summary.
+
+    Args:
+        uses: Units of work per scenario
+        threads: Concurrent callers (and registry instances)
+        crewai: Include building the CrewAI Agent (`get_agent()`)
+
+    Returns:
+        Dictionary with the measurements per scenario and the registry stats
+    """
+    os.environ.setdefault("BRAVE_API_KEY", "bench")
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ.setdefault("LOGFIRE_IGNORE_NO_CONFIG", "1")
+    from agents.registry import AgentRegistry
+    from agents.search_agent import SearchAgent
+
+    def build() -> SearchAgent:
+        agent = SearchAgent(verbose=False)
+        agent.customize_llm(model="openai/gpt-4o-mini")
+        if crewai:
+            agent.get_agent()
+        return agent
+
+    build()  # import crewai/litellm outside the timed sections
+
+    def fresh(_):
+        started = time.perf_counter()
+        build()
+        return time.perf_counter() - started
+
+    registry = AgentRegistry()
+    registry.register("search", lambda: SearchAgent(verbose=False), max_instances=threads,
+                      warm_crewai=crewai, model="openai/gpt-4o-mini")
+
+    def pooled(_):
+        started = time.perf_counter()
+        with registry.acquire("search") as agent:
+            if crewai:
+                agent.get_agent()
+            return time.perf_counter() - started
+
+    results: Dict[str, Any] = {}
+    for name, work in (("fresh", fresh), ("pooled", pooled)):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            durations = list(pool.map(work, range(uses)))
+        results[name] = {
+            "total_ms": round((time.perf_counter() - started) * 1000, 1),
+            "avg_ready_ms": round(sum(durations) / len(durations) * 1000, 3),
+        }
+    results["registry"] = registry.stats("search")
+
+    print("\n" + "=" * 60)
+    print(f"📊 {uses} uses on {threads} threads (CrewAI Agent {'included' if crewai else 'excluded'})")
+    print("=" * 60)
+    print(f"{'scenario':<10}{'total ms':>12}{'avg ready ms':>15}")
+    for name in ("fresh", "pooled"):
+        print(f"{name:<10}{results[name]['total_ms']:>12}{results[name]['avg_ready_ms']:>15}")
+    stats = results["registry"]
+    print(f"registry: created={stats['created']} reused={stats['reused']} "
+          f"avg_build_ms={stats['avg_build_ms']} build_ms_saved={stats['build_ms_saved']}")
+    print("=" * 60)
+    return results
+
+
+if __name__ == "__main__":
+    options: Dict[str, Any] = {}
+
+    # Parse command line arguments
+    for arg in sys.argv[1:]:
+        name, _, value = arg.partition("=")
+        if name == "--uses":
+            options["uses"] = int(value)
+        elif name == "--threads":
+            options["threads"] = int(value)
+        elif name == "--no-crewai":
+            options["crewai"] = False
+
+    run_agent_pool_benchmark(**options)
@@ -0,0 +1,82 @@
+# tasks/benchmarks/batch_search_benchmark.py
+"""
+Throughput benchmark for SearchAgent.perform_batch.
+
+Sends a fixed batch of queries to a local FakeBraveServer with artificial
+latency at increasing concurrency levels and reports queries/second and the
+speedup over concurrency=1. With a latency-bound upstream the speedup should
+track the concurrency level closely until the threaded stand-in server itself
+saturates (a few hundred requests/second on a typical machine).
+
+Run:
+    python -m tasks.benchmarks.batch_search_benchmark --queries=64 --latency=0.05
+"""
+import os
+import sys
+import time
+
+from tasks.benchmarks.fake_brave import FakeBraveServer
+from utils.brave_search_tool import BraveSearchTool
+
+
+def run_batch_benchmark(queries: int = 64, latency: float = 0.05, levels=(1, 2, 4, 8, 16, 32)):
+    """
+    Measure perform_batch throughput at each concurrency level.
+
+    Args:
+        queries: Number of queries in the batch
+        latency: Artificial server-side latency per request, in seconds
+        levels: Concurrency levels to measure
+
+    Returns:
+        Dictionary mapping concurrency level to its measurements
+    """
+    # SearchAgent validates the key on construction; the fake server ignores it
+    os.environ.setdefault("BRAVE_API_KEY", "bench")
+    os.environ.setdefault("LOGFIRE_IGNORE_NO_CONFIG", "1")
+    from agents.search_agent import SearchAgent
+
+    batch = [f"benchmark query {i}" for i in range(queries)]
+    report = {}
+    with FakeBraveServer(latency=latency) as server:
+        agent = SearchAgent(verbose=False)
+        agent.search_tool = BraveSearchTool(
+            api_key="bench",
+            base_url=server.url,
+            max_connections=max(levels),
+            max_keepalive_connections=max(levels),
+        )
+        for level in levels:
+            started = time.perf_counter()
+            results = agent.perform_batch(batch, concurrency=level)
+            elapsed = time.perf_counter() - started
+            errors = sum(1 for result in results if not result.ok)
+            report[level] = {
+                "seconds": round(elapsed, 3),
+                "qps": round(queries / elapsed, 1),
+                "errors": errors,
+            }
+
+    baseline = report[levels[0]]["qps"]
+    print("\n" + "=" * 70)
+    print(f"📊 SearchAgent.perform_batch throughput ({queries} queries, {latency * 1000:.0f}ms upstream)")
+    print("=" * 70)
+    print(f"{'concurrency':>12}{'seconds':>12}{'qps':>10}{'speedup':>10}{'errors':>8}")
+    for level, row in report.items():
+        row["speedup"] = round(row["qps"] / baseline, 2)
+        print(f"{level:>12}{row['seconds']:>12}{row['qps']:>10}{row['speedup']:>10}{row['errors']:>8}")
+    print("=" * 70)
+    return report
+
+
+if __name__ == "__main__":
+    query_count = 64
+    server_latency = 0.05
+
+    for arg in sys.argv[1:]:
+        if arg.startswith("--queries="):
+            query_count = int(arg.split("=", 1)[1])
+        elif arg.startswith("--latency="):
+            server_latency = float(arg.split("=", 1)[1])
+
+    run_batch_benchmark(queries=query_count, latency=server_latency)
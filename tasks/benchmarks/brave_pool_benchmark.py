@@ -0,0 +1,97 @@
+# tasks/benchmarks/brave_pool_benchmark.py
+"""
+Connection reuse benchmark for BraveSearchTool.
+
+Runs the same number of queries against a local FakeBraveServer twice:
+  - per-call: a fresh client per query (the tool's original behaviour)
+  - pooled:   one long-lived tool with a keep-alive connection pool
+and reports TCP handshakes per 1k queries and wall-clock time for each.
+
+Run:
+    python -m tasks.benchmarks.brave_pool_benchmark --queries=1000
+"""
+import asyncio
+import sys
+import time
+
+from tasks.benchmarks.fake_brave import FakeBraveServer
+from utils.brave_search_tool import BraveSearchTool
+
+
+def _per_call_sync(server: FakeBraveServer, queries: int):
+    for i in range(queries):
+        with BraveSearchTool(api_key="bench", base_url=server.url) as tool:
+            tool.search(f"query {i}")
+
+
+def _pooled_sync(server: FakeBraveServer, queries: int):
+    with BraveSearchTool(api_key="bench", base_url=server.url) as tool:
+        for i in range(queries):
+            tool.search(f"query {i}")
+
+
+async def _per_call_async(server: FakeBraveServer, queries: int):
+    for i in range(queries):
+        async with BraveSearchTool(api_key="bench", base_url=server.url) as tool:
+            await tool.async_search(f"query {i}")
+
+
+async def _pooled_async(server: FakeBraveServer, queries: int):
+    async with BraveSearchTool(api_key="bench", base_url=server.url) as tool:
+        for i in range(queries):
+            await tool.async_search(f"query {i}")
+
+
+def run_pool_benchmark(queries: int = 1000, latency: float = 0.0):
+    """
+    Run the per-call vs pooled comparison and print a summary table.
+
+    Args:
+        queries: Number of queries per scenario
+        latency: Artificial server-side latency per request, in seconds
+
+    Returns:
+        Dictionary mapping scenario name to its measurements
+    """
+    scenarios = {
+        "sync per-call": lambda s: _per_call_sync(s, queries),
+        "sync pooled": lambda s: _pooled_sync(s, queries),
+        "async per-call": lambda s: asyncio.run(_per_call_async(s, queries)),
+        "async pooled": lambda s: asyncio.run(_pooled_async(s, queries)),
+    }
+    report = {}
+    with FakeBraveServer(latency=latency) as server:
+        for name, scenario in scenarios.items():
+            server.reset_counters()
+            started = time.perf_counter()
+            scenario(server)
+            elapsed = time.perf_counter() - started
+            report[name] = {
+                "queries": server.requests,
+                "handshakes": server.connections,
+                "handshakes_per_1k": round(server.connections * 1000 / max(server.requests, 1), 1),
+                "seconds": round(elapsed, 3),
+            }
+
+    print("\n" + "=" * 70)
+    print(f"📊 BraveSearchTool connection reuse ({queries} queries per scenario)")
+    print("=" * 70)
+    print(f"{'scenario':<18}{'handshakes/1k':>15}{'seconds':>12}{'ms/query':>12}")
+    for name, row in report.items():
+        ms_per_query = row["seconds"] * 1000 / max(row["queries"], 1)
+        print(f"{name:<18}{row['handshakes_per_1k']:>15}{row['seconds']:>12}{ms_per_query:>12.2f}")
+    print("=" * 70)
+    return report
+
+
+if __name__ == "__main__":
+    query_count = 1000
+    server_latency = 0.0
+
+    for arg in sys.argv[1:]:
+        if arg.startswith("--queries="):
+            query_count = int(arg.split("=", 1)[1])
+        elif arg.startswith("--latency="):
+            server_latency = float(arg.split("=", 1)[1])
+
+    run_pool_benchmark(queries=query_count, latency=server_latency)
@@ -0,0 +1,91 @@
+# tasks/benchmarks/coalescing_benchmark.py
+"""
+Request coalescing benchmark for BraveSearchTool.
+
+Fires a burst of `--callers` concurrent searches drawn from `--distinct`
+queries (as when sub-agents share a topic) at a local FakeBraveServer, with
+single-flight coalescing off and on, through:
+  - async: one event loop, asyncio.gather
+  - sync:  one thread per caller
+and reports upstream requests and wall-clock time for each.
+
+Run:
+    python -m tasks.benchmarks.coalescing_benchmark --callers=64 --distinct=4 --latency=0.1
+"""
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from tasks.benchmarks.fake_brave import FakeBraveServer
+from utils.brave_search_tool import BraveSearchTool
+from utils.single_flight import SingleFlight
+
+
+def _burst(callers: int, distinct: int) -> List[str]:
+    # Vary case and spacing: coalescing matches on the normalized query
+    return [f"Shared  topic {i % distinct}" if i % 2 else f"shared topic {i % distinct}" for i in range(callers)]
+
+
+def run_coalescing_benchmark(callers: int = 64, distinct: int = 4, latency: float = 0.1) -> Dict[str, Any]:
+    """
+    Compare upstream requests with coalescing off and on.
+
+    Args:
+        callers: Concurrent searches per burst
+        distinct: Distinct (normalized) queries in the burst
+        latency: Server-side latency per request, in seconds
+
+    Returns:
+        Dictionary mapping scenario name to its measurements
+    """
+    queries = _burst(callers, distinct)
+    results: Dict[str, Any] = {}
+    with FakeBraveServer(latency=latency) as server:
+        for path in ("async", "sync"):
+            for coalesce in (False, True):
+                flight = SingleFlight()
+                tool = BraveSearchTool(api_key="bench", base_url=server.url, max_connections=callers,
+                                       max_keepalive_connections=callers, coalesce=coalesce, single_flight=flight)
+                before = server.requests
+                started = time.perf_counter()
+                if path == "async":
+                    async def burst():
+                        async with tool:
+                            return await asyncio.gather(*(tool.async_search(query) for query in queries))
+                    responses = asyncio.run(burst())
+                else:
+                    with tool, ThreadPoolExecutor(max_workers=callers) as pool:
+                        responses = list(pool.map(tool.search, queries))
+                results[f"{path} {'coalesced' if coalesce else 'plain'}"] = {
+                    "upstream_requests": server.requests - before,
+                    "seconds": round(time.perf_counter() - started, 3),
+                    "errors": sum(1 for response in responses if not response.ok),
+                    **({"coalesced": flight.stats()["coalesced"]} if coalesce else {}),
+                }
+
+    print("\n" + "=" * 64)
+    print(f"📊 Burst of {callers} searches over {distinct} distinct queries ({latency * 1000:.0f} ms upstream)")
+    print("=" * 64)
+    print(f"{'scenario':<18}{'upstream':>10}{'seconds':>10}{'errors':>8}")
+    for name, row in results.items():
+        print(f"{name:<18}{row['upstream_requests']:>10}{row['seconds']:>10}{row['errors']:>8}")
+    print("=" * 64)
+    return results
+
+
+if __name__ == "__main__":
+    options: Dict[str, Any] = {}
+
+    # Parse command line arguments
+    for arg in sys.argv[1:]:
+        name, _, value = arg.partition("=")
+        if name == "--callers":
+            options["callers"] = int(value)
+        elif name == "--distinct":
+            options["distinct"] = int(value)
+        elif name == "--latency":
+            options["latency"] = float(value)
+
+    run_coalescing_benchmark(**options)
@@ -0,0 +1,151 @@
+# tasks/benchmarks/decode_benchmark.py
+"""
+Response decoding benchmark for BraveSearchTool.
+
+Decodes the same Brave-shaped body (20 results with the extra fields the real
+API returns: profile, meta_url, thumbnail, extra_snippets, ...) several ways:
+  - dicts: `json.loads` of the whole body, then one dict per result (the
+           tool's original path)
+  - typed: only title/url/description kept in slotted SearchResult objects,
+           parsed with json and with orjson (`decode_search_payload`'s
+           default when orjson is installed)
+and reports decode time, peak allocation while decoding and the memory
+retained by the decoded results. orjson's parser reserves a document buffer
+up front, so its transient peak is higher even though it is faster.
+
+Run:
+    python -m tasks.benchmarks.decode_benchmark --results=20 --description-size=600
+"""
+import json
+import sys
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from utils.search_results import SearchResponse, response_from_payload, orjson
+
+
+def build_body(results: int = 20, description_size: int = 600) -> bytes:
+    """A Brave-like response body with realistic per-result extras."""
+    filler = ("lorem ipsum dolor sit amet " * (description_size // 27 + 1))[:description_size]
+    items = []
+    for i in range(results):
+        url = f"https://www.example-{i}.com/articles/{i}/a-fairly-long-slug-for-result-{i}"
+        items.append({
+            "title": f"Result {i}: a descriptive page title",
+            "url": url,
+            "is_source_local": False,
+            "is_source_both": False,
+            "description": filler,
+            "page_age": "2024-05-01T12:00:00",
+            "profile": {"name": f"Example {i}", "url": url, "long_name": f"example-{i}.com",
+                        "img": f"https://imgs.search.brave.com/{i}/favicon.png"},
+            "language": "en",
+            "family_friendly": True,
+            "type": "search_result",
+            "subtype": "generic",
+            "meta_url": {"scheme": "https", "netloc": f"example-{i}.com", "hostname": f"www.example-{i}.com",
+                         "favicon": f"https://imgs.search.brave.com/{i}/favicon.png", "path": f"› articles › {i}"},
+            "thumbnail": {"src": f"https://imgs.search.brave.com/{i}/thumb.jpg", "original": f"{url}/image.jpg",
+                          "logo": False},
+            "age": "May 1, 2024",
+            "extra_snippets": [filler[:200]] * 4,
+        })
+    payload = {
+        "type": "search",
+        "query": {"original": "benchmark query", "more_results_available": True},
+        "mixed": {"type": "mixed", "main": [{"type": "web", "index": i, "all": False} for i in range(results)]},
+        "web": {"type": "search", "results": items, "family_friendly": True},
+    }
+    return json.dumps(payload).encode("utf-8")
+
+
+def decode_as_dicts(body: bytes) -> List[Dict[str, str]]:
+    """The original decode path: full json.loads, then a dict per result."""
+    data = json.loads(body)
+    if "web" not in data or "results" not in data["web"]:
+        return [{"error": "No results found in API response"}]
+    return [
+        {
+            "title": item.get("title", "No title"),
+            "url": item.get("url", ""),
+            "description": item.get("description", "No description available"),
+        }
+        for item in data["web"]["results"]
+    ]
+
+
+def decode_typed_json(body: bytes) -> SearchResponse:
+    return response_from_payload(json.loads(body))
+
+
+def decode_typed_orjson(body: bytes) -> SearchResponse:
+    return response_from_payload(orjson.loads(body))
+
+
+def _measure(decode: Callable[[bytes], Any], body: bytes, repeat: int) -> Dict[str, float]:
+    seconds = min(timeit.repeat(lambda: decode(body), number=repeat, repeat=5)) / repeat
+
+    decode(body)  # warm up one-time caches before tracing
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        decoded = decode(body)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del decoded
+    return {
+        "decode_us": round(seconds * 1e6, 1),
+        "peak_kib": round((peak - before) / 1024, 1),
+        "retained_kib": round((current - before) / 1024, 1),
+    }
+
+
+def run_decode_benchmark(results: int = 20, description_size: int = 600, repeat: int = 2000) -> Dict[str, Dict[str, float]]:
+    """
+    Compare the dict and typed decode paths and print a summary table.
+
+    Args:
+        results: Results per response
+        description_size: Characters per result description
+        repeat: Decodes per timing sample
+
+    Returns:
+        Dictionary mapping path name to its measurements
+    """
+    body = build_body(results, description_size)
+    rows = {
+        "dicts (json)": _measure(decode_as_dicts, body, repeat),
+        "typed (json)": _measure(decode_typed_json, body, repeat),
+    }
+    if orjson is not None:
+        rows["typed (orjson)"] = _measure(decode_typed_orjson, body, repeat)
+
+    print("\n" + "=" * 64)
+    print(f"📊 Decoding {results} results, {len(body) / 1024:.1f} KiB per response")
+    print("=" * 64)
+    print(f"{'path':<18}{'decode µs':>12}{'peak KiB':>12}{'retained KiB':>15}")
+    for name, row in rows.items():
+        print(f"{name:<18}{row['decode_us']:>12}{row['peak_kib']:>12}{row['retained_kib']:>15}")
+    print("=" * 64)
+    if orjson is None:
+        print("orjson is not installed; skipped the orjson path (pip install orjson)")
+    return rows
+
+
+if __name__ == "__main__":
+    options = {}
+
+    # Parse command line arguments
+    for arg in sys.argv[1:]:
+        name, _, value = arg.partition("=")
+        if name == "--results":
+            options["results"] = int(value)
+        elif name == "--description-size":
+            options["description_size"] = int(value)
+        elif name == "--repeat":
+            options["repeat"] = int(value)
+
+    run_decode_benchmark(**options)
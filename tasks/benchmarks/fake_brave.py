@@ -0,0 +1,114 @@
+# tasks/benchmarks/fake_brave.py
+import math
+import threading
+import time
+from typing import Dict, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from tasks.benchmarks.local_server import CountingHandler, LocalServer
+
+MONTHLY_QUOTA = 15000
+MONTH_SECONDS = 30 * 24 * 3600
+
+# Per-second window state; each server runs in its own process
+_window_lock = threading.Lock()
+_window = {"second": 0, "count": 0, "total": 0}
+
+
+class _FakeBraveHandler(CountingHandler):
+    """Answers GET requests with a Brave-shaped `web.results` payload."""
+
+    def do_GET(self):
+        server = self.server
+        options = server.options
+        server.increment("requests")
+        if options["latency"]:
+            time.sleep(options["latency"])
+        if self.inject_error():
+            return
+        headers, over_limit = self.rate_limit_headers()
+        if over_limit:
+            server.increment("errors")
+            self.send_json({"error": "rate limited"}, status=429, headers=headers)
+            return
+
+        params = parse_qs(urlparse(self.path).query)
+        query = params.get("q", [""])[0]
+        count = int(params.get("count", ["10"])[0])
+        offset = int(params.get("offset", ["0"])[0])
+        self.send_json(self.build_payload(query, count, offset, options["description_size"]), headers=headers)
+
+    def rate_limit_headers(self) -> Tuple[Dict[str, str], bool]:
+        """
+        Brave-style quota headers for a fixed one-second window of `rate_limit`
+        requests (plus a nominal monthly quota), and whether this request is
+        over the limit.
+        """
+        limit = self.server.options["rate_limit"]
+        if not limit:
+            return {}, False
+        now = time.time()
+        with _window_lock:
+            second = math.floor(now)
+            if second != _window["second"]:
+                _window["second"], _window["count"] = second, 0
+            _window["count"] += 1
+            over = _window["count"] > limit
+            if not over:
+                _window["total"] += 1
+            remaining = max(0, limit - _window["count"])
+            total = _window["total"]
+        return {
+            "X-RateLimit-Limit": f"{limit}, {MONTHLY_QUOTA}",
+            "X-RateLimit-Policy": f"{limit};w=1, {MONTHLY_QUOTA};w={MONTH_SECONDS}",
+            "X-RateLimit-Remaining": f"{remaining}, {max(0, MONTHLY_QUOTA - total)}",
+            "X-RateLimit-Reset": f"{max(1, math.ceil(second + 1 - now))}, {MONTH_SECONDS}",
+        }, over
+
+    @staticmethod
+    def build_payload(query: str, count: int, offset: int, description_size: int):
+        filler = ("lorem ipsum " * (description_size // 12 + 1))[:description_size]
+        return {
+            "web": {
+                "results": [
+                    {
+                        "title": f"{query} result {offset * count + i}",
+                        "url": f"https://example.com/{offset}/{i}",
+                        "description": filler,
+                    }
+                    for i in range(count)
+                ]
+            }
+        }
+
+
+class FakeBraveServer(LocalServer):
+    """
+    Local stand-in for the Brave Search API used by the benchmarks.
+
+    Args:
+        latency: Seconds to wait before answering each request
+        description_size: Characters per result description (payload size)
+        error_rate: Fraction of requests answered with `error_status`
+        error_status: HTTP status used for injected failures
+        rate_limit: Requests allowed per second, advertised in X-RateLimit-*
+            headers; requests over it get a 429 (counted in `errors`).
+            0 disables the limit and the headers.
+
+    Usage:
+        with FakeBraveServer(latency=0.01) as server:
+            tool = BraveSearchTool(api_key="test", base_url=server.url)
+    """
+    handler_class = _FakeBraveHandler
+    path = "/res/v1/web/search"
+
+    def __init__(self, latency: float = 0.0, description_size: int = 120, error_rate: float = 0.0,
+                 error_status: int = 500, rate_limit: int = 0, port: int = 0):
+        super().__init__(
+            port=port,
+            rate_limit=rate_limit,
+            latency=latency,
+            description_size=description_size,
+            error_rate=error_rate,
+            error_status=error_status,
+        )
@@ -0,0 +1,97 @@
+# tasks/benchmarks/fake_llm.py
+import json
+import time
+
+from tasks.benchmarks.local_server import CountingHandler, LocalServer
+
+
+class _FakeLLMHandler(CountingHandler):
+    """Answers OpenAI-compatible `/chat/completions` requests, streaming or not."""
+
+    def do_POST(self):
+        server = self.server
+        options = server.options
+        server.increment("requests")
+        request = self.read_json()
+        if options["latency"]:
+            time.sleep(options["latency"])
+        if self.inject_error():
+            return
+
+        words = [f"token{i} " for i in range(options["completion_tokens"])]
+        model = request.get("model", "fake-model")
+        if request.get("stream"):
+            self._stream(model, words, options["token_delay"])
+            return
+
+        if options["token_delay"]:
+            time.sleep(options["token_delay"] * len(words))
+        self.send_json({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(words)},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": sum(len(str(m.get("content", ""))) // 4 for m in request.get("messages", [])),
+                "completion_tokens": len(words),
+                "total_tokens": len(words),
+            },
+        })
+
+    def _stream(self, model: str, words, token_delay: float):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, word in enumerate(words + [None]):
+            delta = {"content": word} if word is not None else {}
+            if index == 0:
+                delta["role"] = "assistant"
+            event = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": None if word is not None else "stop"}],
+            }
+            self._write_chunk(f"data: {json.dumps(event)}\n\n")
+            if word is not None and token_delay:
+                time.sleep(token_delay)
+        self._write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, text: str):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+
+
+class FakeLLMServer(LocalServer):
+    """
+    Local OpenAI-compatible chat completion endpoint used by the benchmarks.
+    Point an agent at it with `customize_llm(model="openai/fake-model", base_url=server.url)`.
+
+    Args:
+        latency: Seconds before the first token (or the full response)
+        token_delay: Seconds between streamed tokens
+        completion_tokens: Tokens per completion (payload size)
+        error_rate: Fraction of requests answered with `error_status`
+        error_status: HTTP status used for injected failures
+    """
+    handler_class = _FakeLLMHandler
+    path = "/v1"
+
+    def __init__(self, latency: float = 0.0, token_delay: float = 0.0, completion_tokens: int = 64,
+                 error_rate: float = 0.0, error_status: int = 500, port: int = 0):
+        super().__init__(
+            port=port,
+            latency=latency,
+            token_delay=token_delay,
+            completion_tokens=completion_tokens,
+            error_rate=error_rate,
+            error_status=error_status,
+        )
@@ -0,0 +1,120 @@
+# tasks/benchmarks/fake_pages.py
+import time
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from tasks.benchmarks.local_server import CountingHandler, LocalServer
+
+CHUNK_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=16)
+def build_page(size: int, title: str = "Fixture page") -> bytes:
+    """
+    An HTML document of roughly `size` bytes shaped like a real article:
+    head with styles and scripts, navigation, an <article> body and a footer.
+    """
+    head = (
+        f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{title}</title>"
+        "<style>body { font-family: sans-serif; } .ad { display: none; }</style>"
+        "<script>window.analytics = { track: function () { return 1; } };</script></head>"
+        "<body><nav><a href=\"/\">Home</a> <a href=\"/about\">About</a></nav>"
+        f"<article><h1>{title}</h1>"
+    )
+    tail = "</article><footer>&copy; Fixture Inc. All rights reserved.</footer></body></html>"
+    paragraph = (
+        "<p>Async runtimes schedule many <b>concurrent</b> tasks on a small pool of threads, "
+        "trading preemption for cheap context switches &amp; predictable latency.</p>\n"
+    )
+    repeats = max(1, (size - len(head) - len(tail)) // len(paragraph))
+    return (head + paragraph * repeats + tail).encode("utf-8")
+
+
+class _FakePageHandler(CountingHandler):
+    """
+    Serves fixture documents by path:
+      /page/<n>   HTML of `page_size` bytes
+      /large/<n>  HTML of `large_size` bytes (exceeds a typical byte cap)
+      /file/<n>   application/pdf of `large_size` bytes (not HTML)
+      anything else: 404
+    """
+
+    def do_GET(self):
+        self.server.increment("requests")
+        active = self.server.counters["active"]
+        with active.get_lock():
+            active.value += 1
+            peak = self.server.counters["peak_active"]
+            peak.value = max(peak.value, active.value)
+        try:
+            self.serve_page()
+        finally:
+            with active.get_lock():
+                active.value -= 1
+
+    def serve_page(self):
+        options = self.server.options
+        if options["latency"]:
+            time.sleep(options["latency"])
+        if self.inject_error():
+            return
+
+        kind = urlparse(self.path).path.strip("/").split("/")[0]
+        if kind == "page":
+            self.send_body(build_page(options["page_size"]), "text/html; charset=utf-8")
+        elif kind == "large":
+            self.send_body(build_page(options["large_size"], "Large fixture page"), "text/html; charset=utf-8")
+        elif kind == "file":
+            self.send_body(b"%PDF-1.4\n" + b"\0" * options["large_size"], "application/pdf")
+        else:
+            self.send_body(b"<html><body>Not found</body></html>", "text/html", status=404)
+
+    def send_body(self, body: bytes, content_type: str, status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        # Written in chunks, like a real server streaming a large document
+        try:
+            for start in range(0, len(body), CHUNK_SIZE):
+                self.wfile.write(body[start:start + CHUNK_SIZE])
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+class FakePageServer(LocalServer):
+    """
+    Local stand-in for the web pages behind search results, used to exercise
+    `PageFetcher` (byte cap, non-HTML abort, errors, per-host limits).
+    `peak_active` is the most requests the server handled at once.
+
+    Args:
+        latency: Seconds to wait before answering each request
+        page_size: Bytes per /page/<n> document
+        large_size: Bytes per /large/<n> and /file/<n> document
+        error_rate: Fraction of requests answered with `error_status`
+        error_status: HTTP status used for injected failures
+
+    Usage:
+        with FakePageServer(latency=0.02) as server:
+            pages = await PageFetcher().fetch_many([server.url + "page/1"])
+    """
+    handler_class = _FakePageHandler
+    path = "/"
+    # Requests being served right now, and the most ever served at once
+    counter_names = LocalServer.counter_names + ("active", "peak_active")
+
+    def __init__(self, latency: float = 0.0, page_size: int = 48 * 1024, large_size: int = 4 * 1024 * 1024,
+                 error_rate: float = 0.0, error_status: int = 500, port: int = 0):
+        super().__init__(
+            port=port,
+            latency=latency,
+            page_size=page_size,
+            large_size=large_size,
+            error_rate=error_rate,
+            error_status=error_status,
+        )
+
+    @property
+    def peak_active(self) -> int:
+        return self._counters["peak_active"].value
@@ -0,0 +1,131 @@
+# tasks/benchmarks/local_server.py
+import json
+import multiprocessing
+import random
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    """Base request handler for the local stand-in servers."""
+    # HTTP/1.1 so clients can keep the connection alive between requests
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # second write stalls on delayed ACKs and dominates keep-alive timings
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        # setup() runs once per accepted TCP connection, i.e. once per handshake
+        self.server.increment("connections")
+
+    def inject_error(self) -> bool:
+        """Fail the request with the configured status at the configured rate."""
+        options = self.server.options
+        if options.get("error_rate", 0.0) and random.random() < options["error_rate"]:
+            self.server.increment("errors")
+            self.send_json({"error": "injected failure"}, status=options.get("error_status", 500))
+            return True
+        return False
+
+    def read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length", "0"))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def send_json(self, payload: Any, status: int = 200, headers: Dict[str, str] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+
+class CountingHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog of 5 drops concurrent connects into SYN retries
+    request_queue_size = 256
+
+    def __init__(self, address, handler_class, options: Dict[str, Any], counters: Dict[str, Any]):
+        super().__init__(address, handler_class)
+        self.options = options
+        self.counters = counters
+
+    def increment(self, name: str):
+        counter = self.counters[name]
+        with counter.get_lock():
+            counter.value += 1
+
+
+def _serve(ready, handler_class, port: int, options: Dict[str, Any], counters: Dict[str, Any]):
+    server = CountingHTTPServer(("127.0.0.1", port), handler_class, options, counters)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+class LocalServer:
+    """
+    Threaded HTTP stand-in running on 127.0.0.1 in a child process, so the
+    server's own CPU work does not compete with the client under test for the
+    GIL. Counts accepted TCP connections (handshakes), requests and injected
+    errors. Subclasses set `handler_class` and `path`.
+    """
+    handler_class = CountingHandler
+    path = "/"
+    counter_names = ("connections", "requests", "errors")
+
+    def __init__(self, port: int = 0, **options):
+        self.port = port
+        self.options = options
+        self._counters = {name: multiprocessing.Value("i", 0) for name in self.counter_names}
+        self._process = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}{self.path}"
+
+    @property
+    def connections(self) -> int:
+        return self._counters["connections"].value
+
+    @property
+    def requests(self) -> int:
+        return self._counters["requests"].value
+
+    @property
+    def errors(self) -> int:
+        return self._counters["errors"].value
+
+    def reset_counters(self):
+        for counter in self._counters.values():
+            with counter.get_lock():
+                counter.value = 0
+
+    def start(self):
+        ready = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=_serve,
+            args=(ready, self.handler_class, self.port, self.options, self._counters),
+            daemon=True,
+        )
+        self._process.start()
+        self.port = ready.get(timeout=10)
+        return self
+
+    def stop(self):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.join()
+            self._process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,152 @@
+# tasks/benchmarks/page_fetch_benchmark.py
+"""
+PageFetcher benchmark against local fixture servers (one per simulated host).
+
+Fetches `--pages` URLs spread over `--hosts` FakePageServers. Most are
+regular HTML pages; every 10th is an oversized page (hits the byte cap),
+a PDF (aborted on its content type) or a 404. Scenarios:
+  - sequential:      one page at a time
+  - concurrent (N):  `fetch_many` with a per-host limit of N
+Reports wall-clock time, success rate, and bytes read by the client versus
+the full size of the documents (what an uncapped fetch would read). Also
+compares the regex text extraction with a stdlib html.parser baseline.
+
+Run:
+    python -m tasks.benchmarks.page_fetch_benchmark --pages=80 --hosts=4 --latency=0.05
+"""
+import asyncio
+import sys
+import time
+from contextlib import ExitStack
+from html.parser import HTMLParser
+from typing import Any, Dict, List
+
+from tasks.benchmarks.fake_pages import FakePageServer, build_page
+from utils.page_fetcher import PageFetcher, extract_text
+
+PAGE_SIZE = 48 * 1024
+LARGE_SIZE = 4 * 1024 * 1024
+
+
+class _ParserExtractor(HTMLParser):
+    """html.parser baseline: text outside script/style."""
+    def __init__(self):
+        super().__init__()
+        self.parts: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def _parser_text(markup: str) -> str:
+    parser = _ParserExtractor()
+    parser.feed(markup)
+    return " ".join(" ".join(parser.parts).split())
+
+
+_KINDS = ["page"] * 7 + ["large", "file", "missing"]
+_SIZES = {"page": PAGE_SIZE, "large": LARGE_SIZE, "file": LARGE_SIZE, "missing": 0}
+
+
+def _urls(servers: List[FakePageServer], pages: int) -> List[str]:
+    return [f"{servers[i % len(servers)].url}{_KINDS[i % len(_KINDS)]}/{i}" for i in range(pages)]
+
+
+def run_page_fetch_benchmark(pages: int = 80, hosts: int = 4, latency: float = 0.05,
+                             max_bytes: int = 256 * 1024) -> Dict[str, Any]:
+    """
+    Fetch the same URL mix sequentially and concurrently and print a summary.
+
+    Args:
+        pages: URLs per scenario
+        hosts: Fixture servers (distinct host:port pairs)
+        latency: Server-side latency per request, in seconds
+        max_bytes: PageFetcher byte cap per page
+
+    Returns:
+        Dictionary with the measurements per scenario and for text extraction
+    """
+    results: Dict[str, Any] = {}
+    with ExitStack() as stack:
+        servers = [stack.enter_context(FakePageServer(latency=latency, page_size=PAGE_SIZE, large_size=LARGE_SIZE))
+                   for _ in range(hosts)]
+        urls = _urls(servers, pages)
+        full_kib = round(sum(_SIZES[_KINDS[i % len(_KINDS)]] for i in range(pages)) / 1024)
+
+        async def sequential(fetcher: PageFetcher):
+            return [await fetcher.fetch(url) for url in urls]
+
+        scenarios = [("sequential", 1, sequential)] + [
+            (f"concurrent ({limit}/host)", limit, lambda fetcher: fetcher.fetch_many(urls)) for limit in (1, 4)
+        ]
+        for name, per_host, run in scenarios:
+            fetcher = PageFetcher(max_bytes=max_bytes, per_host=per_host, max_connections=hosts * per_host)
+
+            async def scenario():
+                async with fetcher:
+                    return await run(fetcher)
+
+            started = time.perf_counter()
+            fetched = asyncio.run(scenario())
+            stats = fetcher.stats()
+            results[name] = {
+                "seconds": round(time.perf_counter() - started, 3),
+                "success_rate": round(stats["success_rate"], 3),
+                "truncated": stats["truncated"],
+                "skipped_non_html": stats["skipped_non_html"],
+                "client_kib": round(stats["bytes_read"] / 1024),
+                "full_kib": full_kib,
+                "text_chars": sum(len(page.text) for page in fetched),
+            }
+
+    markup = build_page(256 * 1024).decode("utf-8")
+    for name, extract in (("regex", extract_text), ("html.parser", _parser_text)):
+        started = time.perf_counter()
+        for _ in range(20):
+            extract(markup)
+        seconds = (time.perf_counter() - started) / 20
+        results[f"extract {name}"] = {"ms_per_page": round(seconds * 1000, 2),
+                                      "mb_per_s": round(len(markup) / seconds / 2**20, 1)}
+
+    print("\n" + "=" * 92)
+    print(f"📊 {pages} URLs over {hosts} hosts ({latency * 1000:.0f} ms latency, {max_bytes // 1024} KiB cap)")
+    print("=" * 92)
+    print(f"{'scenario':<22}{'seconds':>9}{'success':>9}{'truncated':>11}{'skipped':>9}"
+          f"{'client KiB':>12}{'full KiB':>10}")
+    for name, row in results.items():
+        if not name.startswith("extract"):
+            print(f"{name:<22}{row['seconds']:>9}{row['success_rate']:>9}{row['truncated']:>11}"
+                  f"{row['skipped_non_html']:>9}{row['client_kib']:>12}{row['full_kib']:>10}")
+    for name in ("extract regex", "extract html.parser"):
+        row = results[name]
+        print(f"{name:<22}{row['ms_per_page']:>9} ms/page (256 KiB){row['mb_per_s']:>9} MB/s")
+    print("=" * 92)
+    return results
+
+
+if __name__ == "__main__":
+    options: Dict[str, Any] = {}
+
+    # Parse command line arguments
+    for arg in sys.argv[1:]:
+        name, _, value = arg.partition("=")
+        if name == "--pages":
+            options["pages"] = int(value)
+        elif name == "--hosts":
+            options["hosts"] = int(value)
+        elif name == "--latency":
+            options["latency"] = float(value)
+        elif name == "--max-bytes":
+            options["max_bytes"] = int(value)
+
+    run_page_fetch_benchmark(**options)
@@ -0,0 +1,102 @@
+# tasks/benchmarks/prompt_packing_benchmark.py
+"""
+Prompt size benchmark for SearchAgent's analysis prompt.
+
+Builds the analysis prompt for one Brave-shaped response (see
+decode_benchmark) with:
+  - repr:   the original prompt, the Python repr of the top 3 result dicts
+  - packed: PromptPacker at several token budgets
+and reports tokens used versus budget, results included and packing time,
+so a budget can be picked by trading summary coverage against LLM latency
+and cost.
+
+Run:
+    python -m tasks.benchmarks.prompt_packing_benchmark --budgets=250,500,1000,1500,3000
+"""
+import sys
+import timeit
+from typing import Any, Dict, List
+
+from tasks.benchmarks.decode_benchmark import build_body
+from utils.prompt_packing import PromptPacker
+from utils.search_results import SearchResponse, decode_search_payload
+from utils.tokens import count_tokens
+
+
+def legacy_prompt(query: str, results: SearchResponse) -> str:
+    """The original prompt: the repr of the first three result dicts."""
+    return f"""
+                Analyze the following search results for the query: '{query}'
+
+                {[result.to_dict() for result in results[:3]]}
+
+                Provide a brief summary of the key information found:
+                """
+
+
+def run_packing_benchmark(budgets=(250, 500, 1000, 1500, 3000), results: int = 20,
+                          description_size: int = 600, repeat: int = 50) -> List[Dict[str, Any]]:
+    """
+    Pack one response at each budget and print a summary table.
+
+    Args:
+        budgets: Token budgets to try
+        results: Results in the response
+        description_size: Characters per result description
+        repeat: Packs per timing sample
+
+    Returns:
+        One row per prompt variant
+    """
+    query = "benchmark query"
+    response = decode_search_payload(build_body(results, description_size))
+    packer = PromptPacker()
+
+    legacy = legacy_prompt(query, response)
+    rows = [{
+        "variant": "repr top 3",
+        "budget": None,
+        "tokens_used": count_tokens(legacy),
+        "results_packed": min(3, len(response)),
+        "pack_ms": round(min(timeit.repeat(lambda: legacy_prompt(query, response), number=repeat, repeat=3))
+                         / repeat * 1000, 3),
+    }]
+    for budget in budgets:
+        packed = packer.pack(query, response, budget=budget)
+        seconds = min(timeit.repeat(lambda: packer.pack(query, response, budget=budget), number=repeat, repeat=3))
+        rows.append({
+            "variant": "packed",
+            "budget": budget,
+            "tokens_used": packed.tokens_used,
+            "results_packed": packed.results_packed,
+            "pack_ms": round(seconds / repeat * 1000, 3),
+        })
+
+    print("\n" + "=" * 64)
+    print(f"📊 Analysis prompt for {len(response)} results ({description_size} chars per description)")
+    print("=" * 64)
+    print(f"{'variant':<12}{'budget':>8}{'tokens':>8}{'used %':>8}{'results':>9}{'pack ms':>10}")
+    for row in rows:
+        used = f"{row['tokens_used'] / row['budget'] * 100:.0f}" if row["budget"] else "-"
+        print(f"{row['variant']:<12}{row['budget'] or '-':>8}{row['tokens_used']:>8}{used:>8}"
+              f"{row['results_packed']:>9}{row['pack_ms']:>10}")
+    print("=" * 64)
+    return rows
+
+
+if __name__ == "__main__":
+    options = {}
+
+    # Parse command line arguments
+    for arg in sys.argv[1:]:
+        name, _, value = arg.partition("=")
+        if name == "--budgets":
+            options["budgets"] = tuple(int(budget) for budget in value.split(","))
+        elif name == "--results":
+            options["results"] = int(value)
+        elif name == "--description-size":
+            options["description_size"] = int(value)
+        elif name == "--repeat":
+            options["repeat"] = int(value)
+
+    run_packing_benchmark(**options)
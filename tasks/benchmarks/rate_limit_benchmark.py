@@ -0,0 +1,118 @@
+# tasks/benchmarks/rate_limit_benchmark.py
+"""
+Rate limiter benchmark: a burst of searches against a FakeBraveServer that
+enforces `--limit` requests per second and advertises it in Brave-style
+X-RateLimit-* headers.
+
+Scenarios:
+  - unpaced: rate limiting off, only the default retry policy
+  - paced:   the shared RateLimiter learns the limit from the headers
+  - priority: a BATCH backlog is queued, then a few INTERACTIVE searches
+    arrive; reports how long each class waited
+
+Run:
+    python -m tasks.benchmarks.rate_limit_benchmark --searches=60 --limit=10
+"""
+import asyncio
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+from tasks.benchmarks.fake_brave import FakeBraveServer
+from utils.brave_search_tool import BraveSearchTool
+from utils.rate_limiter import BATCH, INTERACTIVE, RateLimiter, request_priority
+
+
+async def _timed_search(tool: BraveSearchTool, query: str, priority: int):
+    with request_priority(priority):
+        started = time.perf_counter()
+        response = await tool.async_search(query)
+        return response, time.perf_counter() - started
+
+
+def run_rate_limit_benchmark(searches: int = 60, limit: int = 10, interactive: int = 5) -> Dict[str, Any]:
+    """
+    Fire bursts of searches with and without pacing and print a summary.
+
+    Args:
+        searches: Searches per burst
+        limit: Requests per second the fake server allows
+        interactive: INTERACTIVE searches issued behind the BATCH backlog
+
+    Returns:
+        Dictionary with the measurements per scenario
+    """
+    results: Dict[str, Any] = {}
+    queries = [f"rate limited query {i}" for i in range(searches)]
+    with FakeBraveServer(rate_limit=limit) as server:
+        for name, paced in (("unpaced", False), ("paced", True)):
+            limiter = RateLimiter(name="bench") if paced else None
+            tool = BraveSearchTool(api_key="bench", base_url=server.url, coalesce=False,
+                                   rate_limit=paced, rate_limiter=limiter)
+            before_requests, before_429 = server.requests, server.errors
+
+            async def burst():
+                async with tool:
+                    return await asyncio.gather(*(_timed_search(tool, query, BATCH) for query in queries))
+
+            started = time.perf_counter()
+            outcomes = asyncio.run(burst())
+            results[name] = {
+                "seconds": round(time.perf_counter() - started, 2),
+                "failed": sum(1 for response, _ in outcomes if not response.ok),
+                "requests": server.requests - before_requests,
+                "http_429": server.errors - before_429,
+                **({"limiter": limiter.stats()} if limiter is not None else {}),
+            }
+
+        # Priority: interactive searches submitted after the batch backlog
+        limiter = RateLimiter(name="bench-priority")
+        tool = BraveSearchTool(api_key="bench", base_url=server.url, coalesce=False, rate_limiter=limiter)
+
+        async def mixed():
+            async with tool:
+                batch = [asyncio.ensure_future(_timed_search(tool, query, BATCH)) for query in queries]
+                await asyncio.sleep(0.5)
+                urgent = [asyncio.ensure_future(_timed_search(tool, f"urgent {i}", INTERACTIVE))
+                          for i in range(interactive)]
+                return await asyncio.gather(*batch), await asyncio.gather(*urgent)
+
+        batch_outcomes, urgent_outcomes = asyncio.run(mixed())
+        latency = lambda outcomes: round(statistics.fmean(elapsed for _, elapsed in outcomes) * 1000)
+        results["priority"] = {
+            "batch_avg_ms": latency(batch_outcomes),
+            "interactive_avg_ms": latency(urgent_outcomes),
+            "interactive_max_ms": round(max(elapsed for _, elapsed in urgent_outcomes) * 1000),
+            "failed": sum(1 for response, _ in batch_outcomes + urgent_outcomes if not response.ok),
+        }
+
+    print("\n" + "=" * 64)
+    print(f"📊 {searches} concurrent searches, server limit {limit}/s")
+    print("=" * 64)
+    print(f"{'scenario':<10}{'seconds':>9}{'requests':>10}{'429s':>7}{'failed':>8}")
+    for name in ("unpaced", "paced"):
+        row = results[name]
+        print(f"{name:<10}{row['seconds']:>9}{row['requests']:>10}{row['http_429']:>7}{row['failed']:>8}")
+    row = results["priority"]
+    print(f"priority: {interactive} interactive searches behind the backlog waited "
+          f"{row['interactive_avg_ms']} ms on average (max {row['interactive_max_ms']} ms) "
+          f"vs {row['batch_avg_ms']} ms for batch; {row['failed']} failed")
+    print("=" * 64)
+    return results
+
+
+if __name__ == "__main__":
+    options: Dict[str, Any] = {}
+
+    # Parse command line arguments
+    for arg in sys.argv[1:]:
+        name, _, value = arg.partition("=")
+        if name == "--searches":
+            options["searches"] = int(value)
+        elif name == "--limit":
+            options["limit"] = int(value)
+        elif name == "--interactive":
+            options["interactive"] = int(value)
+
+    run_rate_limit_benchmark(**options)
@@ -0,0 +1,153 @@
+# tasks/benchmarks/search_memory_benchmark.py
+"""
+SearchMemory benchmark: bulk load, local lookup latency and pruning on a
+large index.
+
+Generates `--rows` synthetic results (Zipf-distributed vocabulary, fetch
+times spread over the last 14 days) into a temporary SQLite file, then
+reports:
+  - bulk insert throughput and on-disk size
+  - `lookup` latency (p50/p95/p99) and hit rate for 1-, 2- and 3-term
+    queries, plus for queries that were stored verbatim
+  - one incremental prune batch and a full prune of results older than
+    7 days
+
+Run:
+    python -m tasks.benchmarks.search_memory_benchmark --rows=2000000 --lookups=500
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List
+
+from utils.search_memory import MemoryRow, SearchMemory
+
+DAY = 24 * 3600.0
+
+
+def _vocabulary(size: int, rng: random.Random) -> List[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(letters, k=rng.randint(3, 10))))
+    return sorted(words)
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+    return {"p50_ms": round(pick(0.50), 3), "p95_ms": round(pick(0.95), 3), "p99_ms": round(pick(0.99), 3),
+            "mean_ms": round(statistics.fmean(ordered) * 1000, 3)}
+
+
+def run_search_memory_benchmark(rows: int = 2_000_000, lookups: int = 500, vocabulary: int = 50_000,
+                                seed: int = 7) -> Dict[str, Any]:
+    """
+    Load a synthetic index and measure lookups and pruning.
+
+    Args:
+        rows: Results to store
+        lookups: Lookups per query shape
+        vocabulary: Distinct words in the synthetic corpus
+        seed: Random seed
+
+    Returns:
+        Dictionary with the load, lookup and prune measurements
+    """
+    rng = random.Random(seed)
+    words = _vocabulary(vocabulary, rng)
+    cum_weights = list(accumulate(1.0 / rank for rank in range(1, len(words) + 1)))
+    sample = lambda k: rng.choices(words, cum_weights=cum_weights, k=k)
+    now = time.time()
+    stored_queries: List[str] = []
+
+    def generate() -> Iterator[MemoryRow]:
+        query = ""
+        for i in range(rows):
+            # Ten results per search, like a Brave page
+            if i % 10 == 0:
+                query = " ".join(sample(3))
+                if len(stored_queries) < lookups:
+                    stored_queries.append(query)
+            text = sample(30)
+            yield (f"https://example{i % 997}.com/{i}", " ".join(text[:6]), " ".join(text[6:]), query,
+                   now - rng.random() * 14 * DAY)
+
+    results: Dict[str, Any] = {"rows": rows}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "memory.db")
+        memory = SearchMemory(path, max_age=7 * DAY, min_results=5)
+
+        started = time.perf_counter()
+        memory.insert_many(generate())
+        load_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        memory.optimize()
+        results["load"] = {
+            "seconds": round(load_seconds, 1),
+            "rows_per_s": round(rows / load_seconds),
+            "optimize_seconds": round(time.perf_counter() - started, 1),
+            "db_mb": round(sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) / 2**20, 1),
+        }
+
+        shapes = {f"{terms}-term": [" ".join(sample(terms)) for _ in range(lookups)] for terms in (1, 2, 3)}
+        shapes["stored query"] = stored_queries
+        results["lookup"] = {}
+        for shape, queries in shapes.items():
+            durations, hits = [], 0
+            for query in queries:
+                started = time.perf_counter()
+                hits += memory.lookup(query) is not None
+                durations.append(time.perf_counter() - started)
+            results["lookup"][shape] = {**_percentiles(durations), "hit_rate": round(hits / len(queries), 3)}
+
+        started = time.perf_counter()
+        batch = memory.prune(limit=memory.prune_batch)
+        batch_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        rest = memory.prune()
+        results["prune"] = {
+            "batch_rows": batch,
+            "batch_ms": round(batch_seconds * 1000, 1),
+            "full_rows": rest,
+            "full_seconds": round(time.perf_counter() - started, 1),
+            "remaining_rows": len(memory),
+        }
+        memory.close()
+
+    load = results["load"]
+    print("\n" + "=" * 68)
+    print(f"📊 SearchMemory with {rows:,} results")
+    print("=" * 68)
+    print(f"load: {load['seconds']}s ({load['rows_per_s']:,} rows/s), optimize {load['optimize_seconds']}s, "
+          f"{load['db_mb']} MB on disk")
+    print(f"{'lookup':<14}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'hit rate':>10}")
+    for shape, row in results["lookup"].items():
+        print(f"{shape:<14}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['hit_rate']:>10}")
+    prune = results["prune"]
+    print(f"prune: batch of {prune['batch_rows']} in {prune['batch_ms']} ms, then {prune['full_rows']:,} rows "
+          f"in {prune['full_seconds']}s ({prune['remaining_rows']:,} left)")
+    print("=" * 68)
+    return results
+
+
+if __name__ == "__main__":
+    options: Dict[str, Any] = {}
+
+    # Parse command line arguments
+    for arg in sys.argv[1:]:
+        name, _, value = arg.partition("=")
+        if name == "--rows":
+            options["rows"] = int(value)
+        elif name == "--lookups":
+            options["lookups"] = int(value)
+        elif name == "--vocabulary":
+            options["vocabulary"] = int(value)
+        elif name == "--seed":
+            options["seed"] = int(value)
+
+    run_search_memory_benchmark(**options)
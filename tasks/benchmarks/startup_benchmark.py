@@ -0,0 +1,111 @@
+# tasks/benchmarks/startup_benchmark.py
+"""
+Cold-start (import time) benchmark for the CLI entry points.
+
+Imports each entry module in a fresh interpreter with `python -X importtime`,
+takes the median cumulative import time over several runs and checks it
+against a regression budget. It also fails if any of the heavy dependencies
+(crewai, litellm) are imported at startup; they must load lazily on first use.
+
+Note: logfire ships a pydantic plugin, so defining any pydantic model (e.g.
+LLMConfig) imports logfire through pydantic's plugin loader. Jobs that do not
+use logfire's pydantic instrumentation can skip that cost with
+PYDANTIC_DISABLE_PLUGINS=logfire-plugin.
+
+Run:
+    python -m tasks.benchmarks.startup_benchmark --runs=5 --budget-ms=1000
+Exits with status 1 when a budget is exceeded.
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ENTRY_MODULES = [
+    "agents",
+    "agents.search_agent",
+    "tasks.agents_test.search_agent_test",
+    "main",
+]
+LAZY_DEPENDENCIES = ["crewai", "litellm"]
+
+
+def measure_import(module: str):
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        (cumulative import time in ms, set of top-level packages imported)
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    total_us = 0
+    packages = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        name = name.strip()
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        packages.add(name.split(".")[0])
+        if name == module:
+            total_us = int(cumulative)
+    return total_us / 1000, packages
+
+
+def run_startup_benchmark(runs: int = 5, budget_ms: float = 1000.0) -> bool:
+    """
+    Measure cold-start import time of each entry module.
+
+    Args:
+        runs: Fresh interpreters per module; the median is reported
+        budget_ms: Maximum allowed median import time per module
+
+    Returns:
+        True if every module is within budget and no lazy dependency was imported
+    """
+    ok = True
+    print("\n" + "=" * 70)
+    print(f"📊 Cold-start import time (median of {runs} runs, budget {budget_ms:.0f} ms)")
+    print("=" * 70)
+    print(f"{'module':<40}{'ms':>10}  status")
+    for module in ENTRY_MODULES:
+        timings = []
+        eager = set()
+        for _ in range(runs):
+            elapsed_ms, packages = measure_import(module)
+            timings.append(elapsed_ms)
+            eager |= packages.intersection(LAZY_DEPENDENCIES)
+        median_ms = statistics.median(timings)
+        problems = []
+        if median_ms > budget_ms:
+            problems.append("over budget")
+        if eager:
+            problems.append(f"eager import of {', '.join(sorted(eager))}")
+        ok = ok and not problems
+        status = "✅" if not problems else "❌ " + "; ".join(problems)
+        print(f"{module:<40}{median_ms:>10.1f}  {status}")
+    print("=" * 70)
+    return ok
+
+
+if __name__ == "__main__":
+    run_count = 5
+    budget = 1000.0
+
+    for arg in sys.argv[1:]:
+        if arg.startswith("--runs="):
+            run_count = int(arg.split("=", 1)[1])
+        elif arg.startswith("--budget-ms="):
+            budget = float(arg.split("=", 1)[1])
+
+    sys.exit(0 if run_startup_benchmark(runs=run_count, budget_ms=budget) else 1)
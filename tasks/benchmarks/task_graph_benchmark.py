@@ -0,0 +1,130 @@
+# tasks/benchmarks/task_graph_benchmark.py
+"""
+TaskGraph benchmark: a research workflow run as a linear flow and as a DAG.
+
+The workflow has `--branches` independent branches, each a Brave search
+followed by an LLM analysis of its results, and a final report node that
+combines every analysis:
+
+    search:i -> analyze:i -> report
+
+It runs against a local FakeBraveServer and FakeLLMServer with a SearchAgent
+configured like in agent_benchmark. Scenarios:
+  - linear:   one node at a time (`max_concurrency=1`), like the sequential test flow
+  - dag (N):  ready nodes run concurrently, at most N at once
+  - dag:      no concurrency limit
+Reports wall-clock time, critical-path time and achieved parallelism, then
+the per-node timing table of the unlimited DAG run.
+
+Run:
+    python -m tasks.benchmarks.task_graph_benchmark --branches=8 --brave-latency=0.1 --llm-latency=0.2
+"""
+import os
+import sys
+import warnings
+from contextlib import redirect_stdout
+from io import StringIO
+from typing import Any, Dict, Optional
+
+from tasks.benchmarks.fake_brave import FakeBraveServer
+from tasks.benchmarks.fake_llm import FakeLLMServer
+from tasks.task_graph import GraphResult, TaskGraph
+
+
+def build_research_graph(agent, topic: str, branches: int) -> TaskGraph:
+    """Fan-out/fan-in workflow: one search and one analysis per branch, then a combined report."""
+    graph = TaskGraph("research")
+    for i in range(branches):
+        query = f"{topic} aspect {i}"
+
+        def search(query=query):
+            return agent.search_tool.async_search(query)
+
+        async def analyze(query=query, **inputs):
+            (response,) = inputs.values()
+            return await agent.ainteract_with_llm(agent.pack_analysis_prompt(query, response).text)
+
+        graph.add(f"search:{i}", search)
+        graph.add(f"analyze:{i}", analyze, depends_on=[f"search:{i}"])
+
+    async def report(**analyses):
+        notes = "\n\n".join(f"{name}: {text}" for name, text in analyses.items())
+        return await agent.ainteract_with_llm(f"Write a short report on {topic} from these notes:\n\n{notes}")
+
+    graph.add("report", report, depends_on=[f"analyze:{i}" for i in range(branches)])
+    return graph
+
+
+def run_task_graph_benchmark(branches: int = 8, brave_latency: float = 0.1, llm_latency: float = 0.2,
+                             levels: tuple = (1, 4)) -> Dict[str, Any]:
+    """
+    Run the research workflow at each concurrency level and print a summary.
+
+    Args:
+        branches: Independent search/analysis branches
+        brave_latency: Fake Brave latency per request, in seconds
+        llm_latency: Fake LLM latency per completion, in seconds
+        levels: `max_concurrency` values to compare with the unlimited DAG
+
+    Returns:
+        Dictionary with wall, critical-path time and parallelism per scenario
+    """
+    # The fake endpoints ignore credentials, but the clients require them to be set
+    os.environ.setdefault("BRAVE_API_KEY", "bench")
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ.setdefault("LOGFIRE_IGNORE_NO_CONFIG", "1")
+    from agents.search_agent import SearchAgent
+    from utils.brave_search_tool import BraveSearchTool
+
+    results: Dict[str, Any] = {}
+    last: Optional[GraphResult] = None
+    with FakeBraveServer(latency=brave_latency) as brave, FakeLLMServer(latency=llm_latency) as llm:
+        agent = SearchAgent(verbose=False)
+        agent.search_tool = BraveSearchTool(base_url=brave.url)
+        agent.customize_llm(model="openai/fake-model", base_url=llm.url, temperature=0.0)
+
+        scenarios = [("linear" if level == 1 else f"dag ({level})", level) for level in levels] + [("dag", None)]
+        # Agents print progress; keep it (and litellm's serializer warnings) out of the report
+        with redirect_stdout(StringIO()), warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            agent.perform_task("warm up")
+            for name, level in scenarios:
+                # Distinct queries per scenario, so no result is served from an earlier run
+                last = build_research_graph(agent, f"{name} topic", branches).run(max_concurrency=level)
+                results[name] = {
+                    "ok": last.ok,
+                    "wall_ms": round(last.wall_ms, 1),
+                    "critical_path_ms": round(last.critical_path_ms, 1),
+                    "parallelism": last.parallelism,
+                    "critical_path": last.critical_path,
+                }
+
+    print("\n" + "=" * 72)
+    print(f"📊 Research workflow: {branches} branches + report ({2 * branches + 1} nodes), "
+          f"Brave {brave_latency * 1000:.0f} ms, LLM {llm_latency * 1000:.0f} ms")
+    print("=" * 72)
+    print(f"{'scenario':<12}{'ok':>5}{'wall ms':>10}{'critical ms':>13}{'parallelism':>13}")
+    for name, row in results.items():
+        print(f"{name:<12}{str(row['ok']):>5}{row['wall_ms']:>10}{row['critical_path_ms']:>13}{row['parallelism']:>12}x")
+    print("=" * 72)
+    if last is not None:
+        print(last.report())
+    return results
+
+
+if __name__ == "__main__":
+    options: Dict[str, Any] = {}
+
+    # Parse command line arguments
+    for arg in sys.argv[1:]:
+        name, _, value = arg.partition("=")
+        if name == "--branches":
+            options["branches"] = int(value)
+        elif name == "--brave-latency":
+            options["brave_latency"] = float(value)
+        elif name == "--llm-latency":
+            options["llm_latency"] = float(value)
+        elif name == "--levels":
+            options["levels"] = tuple(int(level) for level in value.split(","))
+
+    run_task_graph_benchmark(**options)
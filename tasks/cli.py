@@ -0,0 +1,84 @@
+# tasks/cli.py
+"""
+Command line entry point, installed as `agent-x` (see pyproject.toml).
+
+    agent-x batch queries.jsonl --output results.jsonl --concurrency 8 --checkpoint run.ckpt
+    cat queries.txt | agent-x batch - --mode process --concurrency 4 > results.jsonl
+
+Also runnable without installing: `python -m tasks.cli batch ...`
+"""
+import json
+import sys
+from typing import Optional
+
+import typer
+from dotenv import load_dotenv
+
+app = typer.Typer(help="Agent-X command line tools.", no_args_is_help=True, add_completion=False)
+
+
+@app.callback()
+def main():
+    """Agent-X command line tools."""
+    load_dotenv()
+
+
+@app.command()
+def batch(
+    input_path: str = typer.Argument("-", metavar="INPUT", help="JSONL file of jobs, or '-' for stdin"),
+    output_path: Optional[str] = typer.Option(None, "--output", "-o", help="JSONL results file (default: stdout)"),
+    mode: str = typer.Option("thread", help="Worker pool: 'thread' or 'process'"),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", min=1, help="Worker threads or processes"),
+    checkpoint: Optional[str] = typer.Option(
+        None, help="Checkpoint file; successful jobs listed there are skipped, so rerunning resumes the batch"
+    ),
+    count: int = typer.Option(10, min=1, max=20, help="Search results per query"),
+    analyze: bool = typer.Option(False, help="Also summarize each job's results with the LLM"),
+    model: Optional[str] = typer.Option(None, help="LLM model string for --analyze, e.g. openai/gpt-4o-mini"),
+    llm_base_url: Optional[str] = typer.Option(None, help="Custom LLM API endpoint for --analyze"),
+):
+    """
+    Run search jobs from JSONL (or one query per line) and stream results as JSONL.
+
+    Each input line is {"id": ..., "query": ...} or a bare query. Each output
+    line has id, query, ok, results and elapsed_ms (plus error, and analysis
+    with --analyze), in completion order. A summary is printed to stderr.
+    """
+    from tasks.batch_runner import MODES, read_jobs, run_batch
+
+    if mode not in MODES:
+        raise typer.BadParameter(f"must be one of: {', '.join(MODES)}", param_hint="--mode")
+
+    source = sys.stdin if input_path == "-" else open(input_path, "r", encoding="utf-8")
+    # Append when resuming so results of earlier runs are kept
+    output_mode = "a" if checkpoint else "w"
+    destination = sys.stdout if output_path in (None, "-") else open(output_path, output_mode, encoding="utf-8")
+    options = {"count": count, "analyze": analyze, "model": model, "llm_base_url": llm_base_url}
+    try:
+        summary = run_batch(
+            read_jobs(source),
+            destination,
+            mode=mode,
+            concurrency=concurrency,
+            checkpoint_path=checkpoint,
+            options=options,
+        )
+    except KeyboardInterrupt:
+        typer.echo("Interrupted; rerun with the same --checkpoint to resume.", err=True)
+        raise typer.Exit(130)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(2)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if destination is not sys.stdout:
+            destination.close()
+
+    typer.echo(json.dumps(summary), err=True)
+    if summary["failed"]:
+        raise typer.Exit(1)
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,393 @@
+# tasks/task_graph.py
+"""
+Concurrent execution of agent workflows described as a task graph (DAG).
+
+Each node is a callable; its dependencies' outputs are passed to it as
+keyword arguments named after them. Nodes whose dependencies are done are
+started right away on one event loop, so independent branches (e.g. several
+searches feeding one summary) overlap instead of running one after another.
+
+    graph = TaskGraph("research")
+    graph.add("news", lambda: agent.aperform_task("rust async news"))
+    graph.add("docs", lambda: agent.aperform_task("tokio documentation"), timeout=10)
+    graph.add("summary", summarize, depends_on=["news", "docs"])  # summarize(news=..., docs=...)
+    result = graph.run()
+    print(result.report())
+
+Failures stay in-band: a node that raises or times out is reported in the
+`GraphResult`, and the nodes downstream of it are skipped.
+"""
+import asyncio
+import inspect
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from utils.async_runner import run_sync
+from utils.telemetry import Telemetry, telemetry as default_telemetry
+
+OK = "ok"
+FAILED = "failed"
+TIMEOUT = "timeout"
+CANCELLED = "cancelled"
+SKIPPED = "skipped"
+
+
+@dataclass(frozen=True)
+class NodeResult:
+    """
+    Outcome of one node. Times are milliseconds since the start of the run;
+    nodes that never started (skipped) have no times.
+    """
+    name: str
+    status: str
+    output: Any = None
+    error: Optional[str] = None
+    depends_on: Tuple[str, ...] = ()
+    started_ms: Optional[float] = None
+    finished_ms: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == OK
+
+    @property
+    def duration_ms(self) -> float:
+        if self.started_ms is None or self.finished_ms is None:
+            return 0.0
+        return round(self.finished_ms - self.started_ms, 3)
+
+
+@dataclass
+class GraphResult:
+    """
+    Outcome of a graph run: per-node results (in the order nodes were added),
+    wall-clock time and the critical path.
+
+    The critical path is the chain of dependencies that ended last: starting
+    from the last node to finish, each step goes to the dependency that
+    finished latest. Speeding up any node on it shortens the run; nodes off
+    it have slack. `parallelism` is the summed node time divided by wall time.
+    """
+    name: str
+    nodes: Dict[str, NodeResult]
+    wall_ms: float
+    critical_path: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(node.ok for node in self.nodes.values())
+
+    @property
+    def outputs(self) -> Dict[str, Any]:
+        """Outputs of the nodes that succeeded."""
+        return {name: node.output for name, node in self.nodes.items() if node.ok}
+
+    @property
+    def critical_path_ms(self) -> float:
+        return round(sum(self.nodes[name].duration_ms for name in self.critical_path), 3)
+
+    @property
+    def parallelism(self) -> float:
+        busy = sum(node.duration_ms for node in self.nodes.values())
+        return round(busy / self.wall_ms, 2) if self.wall_ms else 0.0
+
+    def report(self) -> str:
+        """Human-readable timing table, critical-path nodes marked with `*`."""
+        on_path = set(self.critical_path)
+        lines = [
+            f"{self.name}: {len(self.nodes)} nodes in {self.wall_ms:.1f} ms "
+            f"(critical path {self.critical_path_ms:.1f} ms, parallelism {self.parallelism}x)",
+            f"  {'node':<24}{'status':<11}{'start ms':>10}{'end ms':>10}{'took ms':>10}",
+        ]
+        for node in self.nodes.values():
+            started = f"{node.started_ms:.1f}" if node.started_ms is not None else "-"
+            finished = f"{node.finished_ms:.1f}" if node.finished_ms is not None else "-"
+            marker = "*" if node.name in on_path else " "
+            lines.append(f"{marker} {node.name:<24}{node.status:<11}{started:>10}{finished:>10}"
+                         f"{node.duration_ms:>10.1f}" + (f"  {node.error}" if node.error else ""))
+        lines.append(f"  critical path: {' -> '.join(self.critical_path) or '-'}")
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly summary (node outputs are left out)."""
+        return {
+            "name": self.name,
+            "ok": self.ok,
+            "wall_ms": self.wall_ms,
+            "critical_path": list(self.critical_path),
+            "critical_path_ms": self.critical_path_ms,
+            "parallelism": self.parallelism,
+            "nodes": {
+                name: {
+                    "status": node.status,
+                    "error": node.error,
+                    "depends_on": list(node.depends_on),
+                    "started_ms": node.started_ms,
+                    "finished_ms": node.finished_ms,
+                    "duration_ms": node.duration_ms,
+                }
+                for name, node in self.nodes.items()
+            },
+        }
+
+
+@dataclass(frozen=True)
+class _Node:
+    name: str
+    fn: Callable[..., Any]
+    depends_on: Tuple[str, ...]
+    timeout: Optional[float]
+
+
+class TaskGraph:
+    """
+    A DAG of agent tasks, run with as much concurrency as the edges allow.
+
+    Nodes are async functions (awaited on the loop), plain functions (run in
+    a worker thread via `asyncio.to_thread`) or plain functions that return
+    an awaitable, such as `lambda: agent.aperform_task(query)`. A node is
+    called with one keyword argument per dependency, holding that
+    dependency's output.
+
+    Per-node `timeout`s are enforced with `asyncio.wait_for`. An async node
+    is cancelled at its deadline; a thread cannot be interrupted, so a timed
+    out (or cancelled) sync node keeps running in the background and its
+    result is dropped.
+
+    Args:
+        name: Name used in telemetry and reports
+        telemetry: Telemetry instance; defaults to the process-wide one
+    """
+    def __init__(self, name: str = "task_graph", telemetry: Optional[Telemetry] = None):
+        self.name = name
+        self.telemetry = telemetry or default_telemetry
+        self._nodes: Dict[str, _Node] = {}
+
+    def add(self, name: str, fn: Callable[..., Any], depends_on: Iterable[str] = (),
+            timeout: Optional[float] = None) -> "TaskGraph":
+        """
+        Add a node. Dependencies may be added later, before the graph runs.
+
+        Args:
+            name: Unique node name; dependents receive the output under it
+            fn: Callable taking the dependencies' outputs as keyword arguments
+            depends_on: Names of the nodes whose outputs this node needs
+            timeout: Seconds the node may run before it is reported as timed out
+
+        Returns:
+            The graph, so calls can be chained
+        """
+        if name in self._nodes:
+            raise ValueError(f"Duplicate task graph node: {name!r}")
+        if timeout is not None and timeout <= 0:
+            raise ValueError("timeout must be positive")
+        depends_on = tuple(dict.fromkeys(depends_on))
+        if name in depends_on:
+            raise ValueError(f"Node {name!r} cannot depend on itself")
+        self._nodes[name] = _Node(name, fn, depends_on, timeout)
+        return self
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._nodes
+
+    def validate(self) -> List[str]:
+        """
+        Check that every dependency exists and the graph has no cycle.
+
+        Returns:
+            Node names in a topological order
+
+        Raises:
+            ValueError: On an unknown dependency or a cycle
+        """
+        for node in self._nodes.values():
+            missing = [dep for dep in node.depends_on if dep not in self._nodes]
+            if missing:
+                raise ValueError(f"Node {node.name!r} depends on unknown node(s): {', '.join(missing)}")
+        waiting = {name: len(node.depends_on) for name, node in self._nodes.items()}
+        dependents = self._dependents()
+        ready = deque(name for name, count in waiting.items() if count == 0)
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dependent in dependents[name]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) < len(self._nodes):
+            cyclic = [name for name in self._nodes if name not in order]
+            raise ValueError(f"Task graph has a cycle through: {', '.join(cyclic)}")
+        return order
+
+    def _dependents(self) -> Dict[str, List[str]]:
+        dependents: Dict[str, List[str]] = {name: [] for name in self._nodes}
+        for node in self._nodes.values():
+            for dep in node.depends_on:
+                dependents[dep].append(node.name)
+        return dependents
+
+    def run(self, max_concurrency: Optional[int] = None, fail_fast: bool = False,
+            timeout: Optional[float] = None) -> GraphResult:
+        """Synchronous `arun`, executed on the shared background event loop."""
+        return run_sync(self.arun(max_concurrency=max_concurrency, fail_fast=fail_fast, timeout=timeout))
+
+    async def arun(self, max_concurrency: Optional[int] = None, fail_fast: bool = False,
+                   timeout: Optional[float] = None) -> GraphResult:
+        """
+        Run the graph, starting each node as soon as its dependencies succeed.
+
+        Args:
+            max_concurrency: Nodes allowed to run at once (unlimited by default)
+            fail_fast: On the first failure or timeout, cancel running nodes and
+                skip everything not yet started
+            timeout: Seconds for the whole run; running nodes are cancelled and
+                the rest skipped when it expires
+
+        Returns:
+            GraphResult with every node's status, output and timing. Node
+            failures never raise; cancelling the `arun` task itself cancels
+            the running nodes and propagates.
+
+        Raises:
+            ValueError: If the graph is invalid (see `validate`)
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.validate()
+        dependents = self._dependents()
+        waiting = {name: set(node.depends_on) for name, node in self._nodes.items()}
+        ready: Deque[str] = deque(name for name, deps in waiting.items() if not deps)
+        results: Dict[str, NodeResult] = {}
+        running: Dict[asyncio.Task, Tuple[str, float]] = {}
+
+        def elapsed_ms(at: Optional[float] = None) -> float:
+            return round(((at if at is not None else time.perf_counter()) - origin) * 1000, 3)
+
+        def skip_downstream(name: str, reason: str) -> None:
+            pending = deque(dependents[name])
+            while pending:
+                dependent = pending.popleft()
+                if dependent not in results:
+                    node = self._nodes[dependent]
+                    results[dependent] = NodeResult(dependent, SKIPPED, error=reason, depends_on=node.depends_on)
+                    pending.extend(dependents[dependent])
+
+        def record(task: asyncio.Task, cancel_reason: str) -> Tuple[str, str]:
+            name, started = running.pop(task)
+            if task.cancelled():
+                status, output, error, finished_at = CANCELLED, None, cancel_reason, time.perf_counter()
+            else:
+                status, output, error, finished_at = task.result()
+            results[name] = NodeResult(name, status, output=output, error=error,
+                                       depends_on=self._nodes[name].depends_on, started_ms=started,
+                                       finished_ms=elapsed_ms(finished_at))
+            return name, status
+
+        async def cancel_running(reason: str) -> None:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            for task in list(running):
+                # A node may have finished before the cancellation reached it
+                record(task, reason)
+
+        def skip_unstarted(reason: str) -> None:
+            for name, node in self._nodes.items():
+                if name not in results:
+                    results[name] = NodeResult(name, SKIPPED, error=reason, depends_on=node.depends_on)
+
+        with self.telemetry.task("task_graph.run", graph=self.name, nodes=len(self._nodes)) as span:
+            origin = time.perf_counter()
+            deadline = origin + timeout if timeout is not None else None
+            try:
+                while ready or running:
+                    while ready and (max_concurrency is None or len(running) < max_concurrency):
+                        name = ready.popleft()
+                        inputs = {dep: results[dep].output for dep in self._nodes[name].depends_on}
+                        task = asyncio.ensure_future(self._run_node(self._nodes[name], inputs))
+                        running[task] = (name, elapsed_ms())
+
+                    remaining = deadline - time.perf_counter() if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        await cancel_running(f"Graph timed out after {timeout}s")
+                        skip_unstarted(f"Graph timed out after {timeout}s")
+                        break
+                    done, _ = await asyncio.wait(running, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+
+                    stop_reason = None
+                    for task in done:
+                        name, status = record(task, "Cancelled")
+                        if status == OK:
+                            for dependent in dependents[name]:
+                                waiting[dependent].discard(name)
+                                if not waiting[dependent] and dependent not in results:
+                                    ready.append(dependent)
+                        else:
+                            skip_downstream(name, f"Dependency {name!r} {status}")
+                            if fail_fast:
+                                stop_reason = f"Cancelled after {name!r} {status}"
+                    if stop_reason is not None:
+                        await cancel_running(stop_reason)
+                        skip_unstarted(stop_reason)
+                        break
+            except asyncio.CancelledError:
+                for task in running:
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+                raise
+
+            nodes = {name: results[name] for name in self._nodes}
+            result = GraphResult(self.name, nodes, wall_ms=elapsed_ms(), critical_path=_critical_path(nodes))
+            span.set_attributes({
+                "ok": result.ok,
+                "wall_ms": result.wall_ms,
+                "critical_path": " -> ".join(result.critical_path),
+                "critical_path_ms": result.critical_path_ms,
+            })
+        self.telemetry.record("agent_x.task_graph.duration", result.wall_ms, unit="ms", graph=self.name, ok=result.ok)
+        return result
+
+    async def _run_node(self, node: _Node, inputs: Dict[str, Any]) -> Tuple[str, Any, Optional[str], float]:
+        """Run one node; returns (status, output, error, finish time) and never raises except on cancellation."""
+        with self.telemetry.stage("task_graph.node", graph=self.name, node=node.name) as span:
+            try:
+                output = await asyncio.wait_for(self._call(node.fn, inputs), node.timeout)
+                outcome = (OK, output, None)
+            except asyncio.TimeoutError:
+                outcome = (TIMEOUT, None, f"Timed out after {node.timeout}s")
+            except Exception as e:
+                outcome = (FAILED, None, f"{type(e).__name__}: {e}")
+            span.set_attribute("status", outcome[0])
+        return (*outcome, time.perf_counter())
+
+    @staticmethod
+    async def _call(fn: Callable[..., Any], inputs: Dict[str, Any]) -> Any:
+        if inspect.iscoroutinefunction(fn):
+            return await fn(**inputs)
+        # to_thread copies the context, so request priority and telemetry sampling carry over
+        output = await asyncio.to_thread(fn, **inputs)
+        if inspect.isawaitable(output):
+            output = await output
+        return output
+
+
+def _critical_path(nodes: Dict[str, NodeResult]) -> List[str]:
+    """Walk back from the last node to finish through each node's latest-finishing dependency."""
+    finished = [node for node in nodes.values() if node.finished_ms is not None]
+    if not finished:
+        return []
+    current = max(finished, key=lambda node: node.finished_ms)
+    path = [current.name]
+    while True:
+        deps = [nodes[dep] for dep in current.depends_on if nodes[dep].finished_ms is not None]
+        if not deps:
+            break
+        current = max(deps, key=lambda node: node.finished_ms)
+        path.append(current.name)
+    return path[::-1]
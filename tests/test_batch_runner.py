@@ -0,0 +1,23 @@
+import pytest
+
+from tasks.batch_runner import read_jobs
+
+
+def test_read_jobs_accepts_objects_strings_and_plain_lines():
+    lines = ['{"id": "a", "query": "rust async"}', '"quoted query"', "plain query", "", "  "]
+
+    assert list(read_jobs(lines)) == [
+        {"id": "a", "query": "rust async"},
+        {"id": 2, "query": "quoted query"},
+        {"id": 3, "query": "plain query"},
+    ]
+
+
+@pytest.mark.parametrize("line", ["2024", "42", "true", "null", "[1, 2]"])
+def test_read_jobs_treats_other_json_values_as_queries(line):
+    assert list(read_jobs([line])) == [{"id": 1, "query": line}]
+
+
+def test_read_jobs_rejects_object_without_query():
+    with pytest.raises(ValueError, match="Line 1"):
+        list(read_jobs(['{"id": 1}']))
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from utils.brave_search_tool import BraveSearchTool
+from utils.search_results import SearchResponse, SearchResult
+
+
+class PagedStub:
+    """Stands in for `async_search`: unique results per offset, tracking requests in flight."""
+    def __init__(self, total: int):
+        self.total = total
+        self.active = 0
+        self.offsets = []
+
+    async def __call__(self, query: str, count: int = 10, offset: int = 0) -> SearchResponse:
+        self.offsets.append(offset)
+        self.active += 1
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            self.active -= 1
+        start = offset * count
+        return SearchResponse(results=tuple(
+            SearchResult(title=f"r{i}", url=f"https://example.com/{i}", description="")
+            for i in range(start, min(start + count, self.total))
+        ))
+
+
+def consume(prefetch: int, max_results: int, total: int = 1000):
+    tool = BraveSearchTool(api_key="test", coalesce=False, rate_limit=False)
+    stub = tool.async_search = PagedStub(total)
+    in_flight_while_consuming = []
+
+    async def run():
+        urls = []
+        async for result in tool.iter_results("q", max_results=max_results, page_size=5, prefetch=prefetch):
+            urls.append(result.url)
+            # Let the prefetch tasks start before sampling
+            await asyncio.sleep(0.001)
+            in_flight_while_consuming.append(stub.active)
+        return urls
+
+    return asyncio.run(run()), stub, in_flight_while_consuming
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 2])
+def test_prefetch_window_matches_argument(prefetch):
+    urls, stub, in_flight = consume(prefetch, max_results=30)
+
+    assert len(urls) == len(set(urls)) == 30
+    assert stub.offsets == list(range(6))
+    assert max(in_flight) == prefetch
+
+
+def test_stops_when_upstream_runs_out():
+    urls, stub, _ = consume(prefetch=2, max_results=50, total=12)
+
+    assert len(urls) == 12
+    # Page 2 is short; only the `prefetch` pages already behind it were requested
+    assert stub.offsets == [0, 1, 2, 3, 4]
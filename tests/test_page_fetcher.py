@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from tasks.benchmarks.fake_pages import FakePageServer
+from utils.page_fetcher import PageFetcher, extract_text
+
+
+@pytest.fixture(scope="module")
+def server():
+    with FakePageServer(page_size=8 * 1024, large_size=1024 * 1024) as server:
+        yield server
+
+
+def fetch(fetcher: PageFetcher, *urls: str):
+    async def run():
+        async with fetcher:
+            return await fetcher.fetch_many(urls)
+    return asyncio.run(run())
+
+
+def test_per_host_limit_caps_concurrent_requests():
+    with FakePageServer(latency=0.1, page_size=1024) as server:
+        pages = fetch(PageFetcher(per_host=2), *(f"{server.url}page/{i}" for i in range(8)))
+
+        assert all(page.ok for page in pages)
+        assert server.requests == 8
+        assert server.peak_active == 2
+
+
+def test_max_bytes_truncates_large_page(server):
+    (page,) = fetch(PageFetcher(max_bytes=64 * 1024), f"{server.url}large/1")
+
+    assert page.ok
+    assert page.truncated
+    assert page.bytes_read == 64 * 1024
+    assert "concurrent" in page.text
+
+
+def test_small_page_is_read_whole(server):
+    (page,) = fetch(PageFetcher(max_bytes=64 * 1024), f"{server.url}page/1")
+
+    assert page.ok
+    assert not page.truncated
+    assert page.status_code == 200
+    assert page.text.startswith("Fixture page")
+
+
+def test_non_html_is_skipped_without_reading_body(server):
+    fetcher = PageFetcher()
+    (page,) = fetch(fetcher, f"{server.url}file/1")
+
+    assert not page.ok
+    assert page.skipped
+    assert page.content_type == "application/pdf"
+    assert page.bytes_read == 0
+    assert fetcher.stats()["skipped_non_html"] == 1
+
+
+def test_not_found_is_reported_not_raised(server):
+    (page,) = fetch(PageFetcher(), f"{server.url}missing/1")
+
+    assert not page.ok
+    assert page.status_code == 404
+    assert page.error == "HTTP 404"
+    assert page.text == ""
+
+
+def test_extract_text_prefers_article_and_drops_scripts_and_navigation():
+    markup = (
+        "<html><head><title>Title</title><script>var tracking = 1;</script></head>"
+        "<body><nav><a href='/'>Home menu</a></nav><div>Sidebar teaser</div>"
+        "<article><h1>Headline</h1><p>First &amp; second</p><script>alert(1)</script><p>Third</p></article>"
+        "<footer>Copyright notice</footer></body></html>"
+    )
+    text = extract_text(markup)
+
+    assert text == "Title\nHeadline\nFirst & second\nThird"
+
+
+def test_extract_text_uses_main_element_and_max_chars():
+    markup = "<body><nav>Menu</nav><main><p>Main content here</p></main><aside>Related</aside></body>"
+
+    assert extract_text(markup) == "Main content here"
+    assert extract_text(markup, max_chars=4) == "Main"
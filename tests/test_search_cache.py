@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+from utils.search_cache import SearchCache
+from utils.search_results import SearchResponse
+
+RESPONSE = SearchResponse.from_dicts([{"title": "T", "url": "https://example.com", "description": "D"}])
+
+
+def test_async_disk_tier_runs_off_the_event_loop(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite")
+    cache = SearchCache(persist_path=path)
+    threads = []
+    for name in ("get", "set"):
+        original = getattr(cache._disk, name)
+
+        def traced(*args, _original=original):
+            threads.append(threading.current_thread())
+            return _original(*args)
+        monkeypatch.setattr(cache._disk, name, traced)
+
+    async def run():
+        assert await cache.aset("Rust  Async", 10, 0, RESPONSE)
+        cache._entries.clear()
+        return await cache.aget("rust async", 10, 0), threading.current_thread()
+
+    cached, loop_thread = asyncio.run(run())
+    assert cached == RESPONSE
+    assert len(threads) == 2
+    assert loop_thread not in threads
+    assert cache.stats()["disk_hits"] == 1
+    cache.close()
+
+
+def test_async_and_sync_share_counters_and_skip_failures():
+    cache = SearchCache()
+
+    async def run():
+        assert not await cache.aset("q", 10, 0, SearchResponse.failure("boom"))
+        assert await cache.aget("q", 10, 0) is None
+        await cache.aset("q", 10, 0, RESPONSE)
+        return await cache.aget("q", 10, 0)
+
+    assert asyncio.run(run()) == RESPONSE
+    assert cache.get("q", 10, 0) == RESPONSE
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
@@ -0,0 +1,25 @@
+import pytest
+
+from utils.search_results import SearchResponse, SearchResult
+
+
+def test_search_result_supports_dict_style_reads():
+    result = SearchResult(title="Title", url="https://example.com", description="About")
+
+    assert result["url"] == "https://example.com"
+    assert result.get("title") == "Title"
+    assert result.get("error") is None
+    assert "url" in result
+    assert "error" not in result
+    assert dict(result) == result.to_dict()
+    with pytest.raises(KeyError):
+        result["__class__"]
+
+
+def test_search_response_round_trips_dicts():
+    response = SearchResponse.from_dicts([{"title": "T", "url": "https://example.com", "description": "D"}])
+
+    assert response.ok
+    assert len(response) == 1
+    assert response[0]["title"] == "T"
+    assert SearchResponse.failure("boom").to_dicts() == [{"error": "boom"}]
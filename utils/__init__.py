@@ -1,5 +1,26 @@
 # utils/__init__.py
 # from utils.tools import get_llm_client
-from utils.brave_search_tool import BraveSearchTool
+# Exports are resolved lazily (PEP 562) so importing a light submodule such as
+# utils.tokens does not pull in httpx and the search tool.
+from importlib import import_module
 
-__all__ = ["BraveSearchTool"]
+_EXPORTS = {
+    "BraveSearchTool": "utils.brave_search_tool",
+    "SearchCache": "utils.search_cache",
+    "SearchMemory": "utils.search_memory",
+    "SearchResult": "utils.search_results",
+    "SearchResponse": "utils.search_results",
+    "LLMResponseCache": "utils.llm_cache",
+    "LLMRouter": "utils.llm_router",
+    "PromptPacker": "utils.prompt_packing",
+    "PageFetcher": "utils.page_fetcher",
+    "RateLimiter": "utils.rate_limiter",
+}
+
+__all__ = ["BraveSearchTool", "SearchCache", "SearchMemory", "SearchResult", "SearchResponse", "LLMResponseCache", "LLMRouter", "PromptPacker", "PageFetcher", "RateLimiter"]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module 'utils' has no attribute '{name}'")
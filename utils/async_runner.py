@@ -0,0 +1,40 @@
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the process-wide event loop that runs in a daemon thread, starting it on first use.
+
+    Sync wrappers submit their coroutines here instead of calling `asyncio.run`,
+    so loop-bound resources (e.g. a tool's pooled AsyncClient) survive between
+    calls and the wrappers also work when the caller is inside a running loop.
+    """
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="agent-x-loop", daemon=True)
+                thread.start()
+                _loop = loop
+    return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the background loop and block until it returns."""
+    loop = get_background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync cannot be called from the background loop itself; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
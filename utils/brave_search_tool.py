@@ -1,12 +1,44 @@
 import os
+import asyncio
+import math
+import threading
 import httpx
 import json
-from typing import Dict, List, Union, Any, Optional
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Any, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
+from utils.search_cache import SearchCache
+from utils.telemetry import Telemetry, telemetry as default_telemetry
+from utils.resilience import ResiliencePolicy
+from utils.single_flight import SingleFlight, single_flight as default_single_flight
+from utils.rate_limiter import RateLimiter, shared_rate_limiter
+from utils.search_results import SearchError, SearchResponse, SearchResult, decode_search_payload, response_from_payload
 
 load_dotenv()
 
+# Brave API paging limits
+MAX_PAGE_SIZE = 20
+MAX_OFFSET = 9
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a result URL for de-duplication: ignores scheme, a leading
+    "www.", host case, trailing slashes, fragments, utm_* tracking parameters
+    and query parameter order.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_")
+    ))
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
 class SearchQuery(BaseModel):
     """Input model for Brave Search queries."""
     query: str = Field(..., description="The search query string")
@@ -17,95 +49,345 @@ class BraveSearchTool:
     """
     Tool that performs searches using the Brave Search API.
     Requires a BRAVE_API_KEY environment variable.
+
+    The tool keeps one long-lived, pooled HTTP client per mode (sync and async)
+    so consecutive searches reuse keep-alive connections instead of paying a
+    new TCP+TLS handshake per query. Call `close()` / `aclose()` or use the
+    tool as a (async) context manager to release the connections.
+
+    Pass a `SearchCache` to serve repeated (query, count, offset) searches
+    without calling the API; error results are never cached.
+
+    Requests go through a `ResiliencePolicy` (by default: 3 attempts with
+    jittered backoff on 429/5xx/network errors and a circuit breaker; pass a
+    policy with a `HedgePolicy` to enable hedged requests).
+
+    Concurrent searches with the same normalized (query, count, offset) share
+    one in-flight request (single-flight), on both the async and the sync
+    path. Tools share the process-wide `SingleFlight` unless one is passed;
+    `coalesce=False` turns this off. Nothing is kept after a request finishes.
+
+    Outgoing requests are paced by a `RateLimiter` that learns the quota from
+    Brave's X-RateLimit-* headers and queues excess requests by priority
+    (see `utils.rate_limiter.request_priority`) instead of running into 429s.
+    Tools with the same endpoint and API key share one limiter per process;
+    `rate_limit=False` turns pacing off.
     """
-    def __init__(self, api_key: str = None, timeout: int = 30):
+    def __init__(
+        self,
+        api_key: str = None,
+        timeout: int = 30,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        base_url: Optional[str] = None,
+        cache: Optional[SearchCache] = None,
+        telemetry: Optional[Telemetry] = None,
+        resilience: Optional[ResiliencePolicy] = None,
+        coalesce: bool = True,
+        single_flight: Optional[SingleFlight] = None,
+        rate_limit: bool = True,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
         self.api_key = api_key or os.getenv("BRAVE_API_KEY")
         if not self.api_key:
             raise ValueError("BRAVE_API_KEY is required")
         self.timeout = timeout
-        self.base_url = "https://api.search.brave.com/res/v1/web/search"
+        self.base_url = base_url or os.getenv("BRAVE_SEARCH_URL", "https://api.search.brave.com/res/v1/web/search")
         self.headers = {
             "Accept": "application/json",
             "Accept-Encoding": "gzip",
             "X-Subscription-Token": self.api_key
         }
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2 and self._http2_available()
+        self.cache = cache
+        self.telemetry = telemetry or default_telemetry
+        self.resilience = resilience or ResiliencePolicy.default(name="brave")
+        self.single_flight = (single_flight or default_single_flight) if coalesce else None
+        self.rate_limiter = (
+            rate_limiter or shared_rate_limiter((self.base_url, self.api_key), name="brave")
+        ) if rate_limit else None
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client_lock = threading.Lock()
+
+    @staticmethod
+    def _http2_available() -> bool:
+        """HTTP/2 needs the optional `h2` package (`pip install httpx[http2]`)."""
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            return False
+        return True
 
-    async def async_search(self, query: str, count: int = 10, offset: int = 0) -> List[Dict[str, str]]:
+    @property
+    def client(self) -> httpx.Client:
+        """Shared synchronous client, created on first use."""
+        if self._client is None or self._client.is_closed:
+            with self._client_lock:
+                if self._client is None or self._client.is_closed:
+                    self._client = httpx.Client(
+                        timeout=self.timeout,
+                        headers=self.headers,
+                        limits=self.limits,
+                        http2=self.http2,
+                    )
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        Shared asynchronous client, created on first use.
+        An AsyncClient's connections belong to the event loop that opened them,
+        so a new client is created when the tool is used from a different loop
+        (e.g. successive `asyncio.run` calls).
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            self._async_client is None
+            or self._async_client.is_closed
+            or self._async_client_loop is not loop
+        ):
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=self.headers,
+                limits=self.limits,
+                http2=self.http2,
+            )
+            self._async_client_loop = loop
+        return self._async_client
+
+    def close(self) -> None:
+        """Close the pooled synchronous client and drop the async client reference."""
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+        # The async client can only be closed from its own loop (see `aclose`);
+        # dropping the reference lets its loop clean the sockets up.
+        self._async_client = None
+        self._async_client_loop = None
+
+    async def aclose(self) -> None:
+        """Close the pooled asynchronous client (and the sync one, if open)."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_client_loop = None
+        self.close()
+
+    def __enter__(self) -> "BraveSearchTool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "BraveSearchTool":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def async_search(self, query: str, count: int = 10, offset: int = 0) -> SearchResponse:
         """
         Perform an asynchronous search using the Brave Search API.
-        
+
         Args:
             query: The search query
             count: Number of results to return (1-20)
             offset: Pagination offset
-            
+
         Returns:
-            List of search results with title, url, and description
+            SearchResponse with the results (title, url, description), or with
+            `error` set if the search failed (`response.ok` is False)
         """
+        if self.cache is not None:
+            cached = await self.cache.aget(query, count, offset)
+            if cached is not None:
+                return cached
+        if self.single_flight is None:
+            return await self._async_search_uncached(query, count, offset)
+        return await self.single_flight.ado(
+            self._flight_key(query, count, offset),
+            lambda: self._async_search_uncached(query, count, offset),
+        )
+
+    async def _async_search_uncached(self, query: str, count: int, offset: int) -> SearchResponse:
         params = {"q": query, "count": count, "offset": offset}
-        
+
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    self.base_url,
-                    params=params,
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                data = response.json()
-                return self._format_results(data)
+            results = await self.resilience.call(lambda: self._async_fetch(params))
         except Exception as e:
-            return [{"error": f"Async search failed: {str(e)}"}]
+            return SearchResponse.failure(f"Async search failed: {str(e)}")
+
+        if self.cache is not None:
+            await self.cache.aset(query, count, offset, results)
+        return results
 
-    def search(self, query: str, count: int = 10, offset: int = 0) -> List[Dict[str, str]]:
+    def search(self, query: str, count: int = 10, offset: int = 0) -> SearchResponse:
         """
         Perform a synchronous search using the Brave Search API.
-        
+
         Args:
             query: The search query
             count: Number of results to return (1-20)
             offset: Pagination offset
-            
+
         Returns:
-            List of search results with title, url, and description
+            SearchResponse with the results (title, url, description), or with
+            `error` set if the search failed (`response.ok` is False)
         """
+        if self.cache is not None:
+            cached = self.cache.get(query, count, offset)
+            if cached is not None:
+                return cached
+        if self.single_flight is None:
+            return self._search_uncached(query, count, offset)
+        return self.single_flight.do(
+            self._flight_key(query, count, offset),
+            lambda: self._search_uncached(query, count, offset),
+        )
+
+    def _search_uncached(self, query: str, count: int, offset: int) -> SearchResponse:
         params = {"q": query, "count": count, "offset": offset}
-        
+
         try:
-            with httpx.Client(timeout=self.timeout) as client:
-                response = client.get(
-                    self.base_url,
-                    params=params,
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                data = response.json()
-                return self._format_results(data)
+            results = self.resilience.call_sync(lambda: self._fetch(params))
         except Exception as e:
-            return [{"error": f"Search failed: {str(e)}"}]
+            return SearchResponse.failure(f"Search failed: {str(e)}")
+
+        if self.cache is not None:
+            self.cache.set(query, count, offset, results)
+        return results
+
+    def _flight_key(self, query: str, count: int, offset: int) -> str:
+        # Same normalization as the cache; the endpoint is included because
+        # the default SingleFlight is shared by every tool in the process
+        return f"{self.base_url}\x1f{SearchCache.make_key(query, count, offset)}"
 
-    def _format_results(self, data: Dict[str, Any]) -> List[Dict[str, str]]:
+    async def iter_results(self, query: str, max_results: int = 50, page_size: int = MAX_PAGE_SIZE,
+                           prefetch: int = 2) -> AsyncIterator[SearchResult]:
         """
-        Format the raw API response into a clean list of results.
-        
+        Stream results across pages, de-duplicated by normalized URL.
+
+        While the caller consumes one page, up to `prefetch` following pages
+        are already being fetched. Only the pages needed for `max_results` are
+        requested (plus one more per page lost to duplicates), and in-flight
+        requests are cancelled as soon as the caller stops iterating. Memory is
+        bounded by `prefetch` pages plus the seen-URL set (at most `max_results`).
+
+        Args:
+            query: The search query
+            max_results: Maximum number of unique results to yield
+            page_size: Results per page (1-20)
+            prefetch: Pages fetched ahead of the one being consumed
+
+        Yields:
+            SearchResult objects in rank order
+
+        Raises:
+            SearchError: if a page fails (results already yielded stay valid)
+        """
+        page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+        last_offset = min(MAX_OFFSET, math.ceil(max_results / page_size) - 1)
+        next_offset = 0
+        pending: Deque[asyncio.Future] = deque()
+        seen = set()
+        yielded = 0
+
+        def schedule(window: int):
+            nonlocal next_offset
+            while len(pending) < window and next_offset <= last_offset:
+                pending.append(asyncio.ensure_future(self.async_search(query, page_size, next_offset)))
+                next_offset += 1
+
+        try:
+            while yielded < max_results:
+                # The next page plus `prefetch` pages behind it
+                schedule(prefetch + 1)
+                if not pending:
+                    return
+                page = await pending.popleft()
+                if not page.ok:
+                    raise SearchError(page.error)
+                # Keep `prefetch` pages in flight while the caller consumes this one
+                schedule(prefetch)
+                for result in page:
+                    key = normalize_url(result.url)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield result
+                    yielded += 1
+                    if yielded >= max_results:
+                        return
+                if len(page) < page_size:
+                    return  # no more results upstream
+                if not pending and next_offset > last_offset and last_offset < MAX_OFFSET:
+                    # Duplicates ate into the estimate; fetch one more page
+                    last_offset += 1
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def _async_fetch(self, params: Dict[str, Any]) -> SearchResponse:
+        """One request attempt; raises on HTTP or network errors so the policy can retry."""
+        if self.rate_limiter is not None:
+            self._record_wait(await self.rate_limiter.aacquire())
+        with self.telemetry.stage("brave.http") as span:
+            response = await self.async_client.get(self.base_url, params=params)
+            span.set_attribute("status_code", response.status_code)
+            if self.rate_limiter is not None:
+                self.rate_limiter.observe(response.headers, response.status_code)
+            response.raise_for_status()
+        return self._decode_response(response)
+
+    def _fetch(self, params: Dict[str, Any]) -> SearchResponse:
+        """One request attempt; raises on HTTP or network errors so the policy can retry."""
+        if self.rate_limiter is not None:
+            self._record_wait(self.rate_limiter.acquire())
+        with self.telemetry.stage("brave.http") as span:
+            response = self.client.get(self.base_url, params=params)
+            span.set_attribute("status_code", response.status_code)
+            if self.rate_limiter is not None:
+                self.rate_limiter.observe(response.headers, response.status_code)
+            response.raise_for_status()
+        return self._decode_response(response)
+
+    def _record_wait(self, waited: float) -> None:
+        """Time spent queued by the rate limiter (only recorded when a request had to wait)."""
+        if waited > 0:
+            self.telemetry.record("brave.rate_limit.wait", waited * 1000, unit="ms")
+
+    def _decode_response(self, response: httpx.Response) -> SearchResponse:
+        """Decode the JSON body into typed results, recording payload size and decode time."""
+        body = response.content
+        self.telemetry.record("brave.response.size", len(body), unit="By")
+        with self.telemetry.stage("brave.decode", response_bytes=len(body)) as span:
+            results = decode_search_payload(body)
+            span.set_attribute("result_count", len(results))
+        return results
+
+    def _format_results(self, data: Dict[str, Any]) -> SearchResponse:
+        """
+        Format an already-decoded API response into a SearchResponse.
+
         Args:
             data: Raw API response data
-            
+
         Returns:
-            List of formatted search results
+            SearchResponse with the formatted results, or an error if the
+            payload has no web results
         """
-        results = []
-        if "web" not in data or "results" not in data["web"]:
-            return [{"error": "No results found in API response"}]
-            
-        for item in data["web"]["results"]:
-            results.append({
-                "title": item.get("title", "No title"),
-                "url": item.get("url", ""),
-                "description": item.get("description", "No description available")
-            })
-        return results
+        return response_from_payload(data)
 
 # Note: CrewAI tool definitions are removed as they might vary between versions
 # If you need to create CrewAI tools, check the current CrewAI documentation
-# and implement them accordingly
\ No newline at end of file
+# and implement them accordingly
@@ -0,0 +1,41 @@
+import importlib
+import threading
+import types
+from typing import Any, Optional
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module proxy that defers the real import until an attribute is first accessed.
+
+    Used for heavy optional-at-startup dependencies (logfire, crewai, litellm) so
+    importing agent-x packages stays cheap for short-lived processes:
+
+        logfire = lazy_import("logfire")
+        logfire.info("...")  # logfire is imported here, on first use
+    """
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        module: Optional[types.ModuleType] = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Return a proxy for `name` that imports the module on first attribute access."""
+    return LazyModule(name)
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class SQLiteResponseBackend:
+    """
+    Persistent LLM response store in a single SQLite table.
+    Bounded to `max_entries` rows; the least recently used rows are evicted first.
+    """
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_response_cache ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, tokens INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_response_cache_accessed "
+                "ON llm_response_cache (accessed_at)"
+            )
+
+    def get(self, key: str, now: float) -> Optional[Tuple[float, str, int]]:
+        """Return (expires_at, response, tokens) for the key, or None if it is not stored."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT expires_at, response, tokens FROM llm_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE llm_response_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+        return row
+
+    def set(self, key: str, response: str, tokens: int, expires_at: float, now: float) -> int:
+        """Store a response and return how many rows were evicted to stay within bounds."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache "
+                "(key, response, tokens, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, response, tokens, expires_at, now),
+            )
+            cursor = self._conn.execute(
+                "DELETE FROM llm_response_cache WHERE key IN ("
+                "SELECT key FROM llm_response_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        return cursor.rowcount
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_response_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_response_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class LLMResponseCache:
+    """
+    Exact-match cache for LLM completions.
+
+    Keys hash the full LLM config (model, temperature and every other field)
+    together with the chat messages, so any change to either is a miss.
+    Entries expire after `ttl` seconds and the store is bounded to
+    `max_entries`, evicting the least recently used entry first.
+
+    backend="memory" keeps entries in-process; backend="disk" stores them in
+    SQLite at `path` so they survive restarts.
+    """
+    def __init__(self, max_entries: int = 512, ttl: float = 86400.0, backend: str = "memory", path: Optional[str] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if backend not in ("memory", "disk"):
+            raise ValueError(f"Unsupported cache backend: {backend}")
+        if backend == "disk" and not path:
+            raise ValueError("The disk backend requires a path")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backend = backend
+        self._entries: "OrderedDict[str, Tuple[float, str, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = SQLiteResponseBackend(path, max_entries) if backend == "disk" else None
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(config: Dict[str, Any], messages: List[Dict[str, Any]]) -> str:
+        """Hash the LLM config and messages into a cache key."""
+        payload = json.dumps({"config": config, "messages": messages}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, int]]:
+        """Return (response, tokens) for a fresh entry, or None on a miss."""
+        now = time.time()
+        if self._disk is not None:
+            row = self._disk.get(key, now)
+            if row is None:
+                return None
+            expires_at, response, tokens = row
+            if expires_at <= now:
+                self._disk.delete(key)
+                with self._lock:
+                    self.evictions += 1
+                return None
+            return response, tokens
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, response, tokens = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return response, tokens
+
+    def set(self, key: str, response: str, tokens: int) -> None:
+        """Store a response along with the tokens a future hit will save."""
+        now = time.time()
+        expires_at = now + self.ttl
+        if self._disk is not None:
+            evicted = self._disk.set(key, response, tokens, expires_at, now)
+            with self._lock:
+                self.evictions += evicted
+            return
+
+        with self._lock:
+            self._entries[key] = (expires_at, response, tokens)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
@@ -0,0 +1,243 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Mapping, Optional, Sequence, Tuple, TypeVar, Union
+
+from utils.lazy_import import lazy_import
+from utils.resilience import CircuitBreaker, CircuitOpenError
+
+logfire = lazy_import("logfire")
+
+T = TypeVar("T")
+
+ModelSpec = Union[str, Tuple[str, float]]
+
+
+def _percentile(ordered: List[float], pct: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+class ProviderStats:
+    """Rolling latency and outcome history for one model string."""
+    def __init__(self, model: str, weight: float, index: int, window: int, alpha: float, breaker: CircuitBreaker):
+        self.model = model
+        self.weight = weight
+        self.index = index
+        self.alpha = alpha
+        self.breaker = breaker
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.ewma: Optional[float] = None
+        self.calls = 0
+        self.failures = 0
+        self.routed = 0
+        self.last_failure_at = 0.0
+
+    def observe(self, latency: float, ok: bool) -> None:
+        self.calls += 1
+        self.failures += not ok
+        self.outcomes.append(ok)
+        if not ok:
+            self.last_failure_at = time.monotonic()
+        self.latencies.append(latency)
+        self.ewma = latency if self.ewma is None else self.alpha * latency + (1 - self.alpha) * self.ewma
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        p50, p95 = _percentile(ordered, 50), _percentile(ordered, 95)
+        return {
+            "weight": self.weight,
+            "calls": self.calls,
+            "failures": self.failures,
+            "routed": self.routed,
+            "error_rate": round(self.error_rate, 3),
+            "latency_ewma_ms": round(self.ewma * 1000, 1) if self.ewma is not None else None,
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "circuit_state": self.breaker.state,
+        }
+
+
+class LLMRouter:
+    """
+    Routes each LLM call to the fastest healthy model out of several providers,
+    falling back down the ranking when a call fails or times out.
+
+    Ranking: healthy models by rolling latency (EWMA) divided by weight; a
+    model with too few samples ties with the best measured one, so list order
+    (then weight) decides until it has been measured. A small share of calls
+    (`explore_rate`) goes to another healthy model to keep its latency fresh.
+    Models whose error rate over the window exceeds `max_error_rate` are only
+    tried after the healthy ones, until `recovery_timeout` passes without a
+    new failure; models whose circuit breaker is open are skipped.
+
+    Args:
+        models: Model strings in preference order, `(model, weight)` pairs or a
+            `{model: weight}` mapping. Higher weight tolerates more latency.
+        timeout: Per-attempt timeout in seconds before falling back (None to
+            rely on the provider call's own timeout)
+        window: Calls kept per model for error rate and latency percentiles
+        min_samples: Calls before a model's latency and error rate are trusted
+        max_error_rate: Error rate above which a model counts as unhealthy
+        explore_rate: Share of calls sent to a non-best healthy model
+        alpha: EWMA smoothing factor for latency (higher reacts faster)
+        failure_threshold: Consecutive failures that open a model's breaker
+        recovery_timeout: Seconds before an open breaker allows a trial call
+    """
+    def __init__(self, models: Union[Sequence[ModelSpec], Mapping[str, float]], timeout: Optional[float] = None,
+                 window: int = 50, min_samples: int = 5, max_error_rate: float = 0.5, explore_rate: float = 0.05,
+                 alpha: float = 0.3, failure_threshold: int = 3, recovery_timeout: float = 30.0):
+        specs = list(models.items()) if isinstance(models, Mapping) else list(models)
+        if not specs:
+            raise ValueError("LLMRouter needs at least one model")
+        self.timeout = timeout
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.explore_rate = explore_rate
+        self.recovery_timeout = recovery_timeout
+        self.providers: Dict[str, ProviderStats] = {}
+        for index, spec in enumerate(specs):
+            model, weight = (spec, 1.0) if isinstance(spec, str) else spec
+            if weight <= 0:
+                raise ValueError(f"Weight for {model} must be positive")
+            breaker = CircuitBreaker(failure_threshold=failure_threshold, recovery_timeout=recovery_timeout,
+                                     name=f"llm:{model}")
+            self.providers[model] = ProviderStats(model, float(weight), index, window, alpha, breaker)
+        self.decisions: Deque[Dict[str, Any]] = deque(maxlen=100)
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    @property
+    def models(self) -> List[str]:
+        return list(self.providers)
+
+    def ranked(self, explore: bool = True) -> List[str]:
+        """Models in the order the next call will try them (explore=False skips exploration)."""
+        with self._lock:
+            providers = list(self.providers.values())
+            measured = [p.ewma / p.weight for p in providers if p.ewma is not None and len(p.latencies) >= self.min_samples]
+            default_score = min(measured) if measured else 0.0
+
+            def score(p: ProviderStats):
+                trusted = p.ewma is not None and len(p.latencies) >= self.min_samples
+                return (p.ewma / p.weight if trusted else default_score, -p.weight, p.index)
+
+            now = time.monotonic()
+
+            def healthy(p: ProviderStats) -> bool:
+                return (len(p.outcomes) < self.min_samples or p.error_rate <= self.max_error_rate
+                        or now - p.last_failure_at > self.recovery_timeout)
+
+            good = sorted((p for p in providers if healthy(p)), key=score)
+            bad = sorted((p for p in providers if not healthy(p)), key=score)
+
+        if explore and len(good) > 1 and random.random() < self.explore_rate:
+            good.insert(0, good.pop(random.randrange(1, len(good))))
+        return [p.model for p in good + bad]
+
+    async def call(self, fn: Callable[[str], Awaitable[T]]) -> T:
+        """
+        Run `fn(model)` on the best model, falling back on failure or timeout.
+        Raises the last error when every model fails.
+        """
+        attempted: List[str] = []
+        error: Optional[BaseException] = None
+        for model in self.ranked():
+            provider = self.providers[model]
+            try:
+                trial = provider.breaker.before_call()
+            except CircuitOpenError as e:
+                error = error or e
+                continue
+            attempted.append(model)
+            started = time.perf_counter()
+            try:
+                if self.timeout is not None:
+                    result = await asyncio.wait_for(fn(model), self.timeout)
+                else:
+                    result = await fn(model)
+            except Exception as e:
+                self._record(provider, time.perf_counter() - started, e)
+                error = e
+                continue
+            except BaseException:
+                # Cancelled mid-call: free the breaker's half-open trial slot
+                if trial:
+                    provider.breaker.release_trial()
+                raise
+            self._record(provider, time.perf_counter() - started, None)
+            self._decide(model, attempted, None)
+            return result
+        self._decide(None, attempted, error)
+        raise error
+
+    def call_sync(self, fn: Callable[[str], T]) -> T:
+        """
+        Blocking version of `call`. The per-attempt timeout is not enforced
+        here; pass `timeout` on to the provider call (see `BaseAgent`).
+        """
+        attempted: List[str] = []
+        error: Optional[BaseException] = None
+        for model in self.ranked():
+            provider = self.providers[model]
+            try:
+                trial = provider.breaker.before_call()
+            except CircuitOpenError as e:
+                error = error or e
+                continue
+            attempted.append(model)
+            started = time.perf_counter()
+            try:
+                result = fn(model)
+            except Exception as e:
+                self._record(provider, time.perf_counter() - started, e)
+                error = e
+                continue
+            except BaseException:
+                # Cancelled mid-call: free the breaker's half-open trial slot
+                if trial:
+                    provider.breaker.release_trial()
+                raise
+            self._record(provider, time.perf_counter() - started, None)
+            self._decide(model, attempted, None)
+            return result
+        self._decide(None, attempted, error)
+        raise error
+
+    def _record(self, provider: ProviderStats, latency: float, error: Optional[BaseException]) -> None:
+        with self._lock:
+            provider.observe(latency, error is None)
+        if error is None:
+            provider.breaker.record_success()
+        else:
+            provider.breaker.record_failure()
+            logfire.warn("LLM provider failed", model=provider.model, latency_ms=round(latency * 1000, 1),
+                         error=str(error) or type(error).__name__)
+
+    def _decide(self, model: Optional[str], attempted: List[str], error: Optional[BaseException]) -> None:
+        decision = {"model": model, "attempted": attempted, "fallback": len(attempted) > 1, "time": time.time()}
+        if error is not None:
+            decision["error"] = str(error) or type(error).__name__
+        with self._lock:
+            if model is not None:
+                self.providers[model].routed += 1
+            self.fallbacks += decision["fallback"]
+            self.decisions.append(decision)
+        if decision["fallback"] or error is not None:
+            logfire.info("LLM call rerouted", **decision)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-model counters and latency, current ranking and recent decisions, for tuning."""
+        with self._lock:
+            providers = {model: provider.to_dict() for model, provider in self.providers.items()}
+            recent = list(self.decisions)[-10:]
+            fallbacks = self.fallbacks
+        return {"ranking": self.ranked(explore=False), "fallbacks": fallbacks, "providers": providers, "recent_decisions": recent}
@@ -0,0 +1,247 @@
+import asyncio
+import html
+import re
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from utils.telemetry import Telemetry, telemetry as default_telemetry
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# Elements whose content is never readable text
+_SKIPPED = re.compile(
+    r"<(script|style|noscript|template|svg|iframe|head|nav|footer|form)\b[^>]*>.*?</\1\s*>|<!--.*?-->",
+    re.IGNORECASE | re.DOTALL,
+)
+_MAIN = re.compile(r"<(article|main)\b[^>]*>", re.IGNORECASE)
+_TITLE = re.compile(r"<title\b[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+# Block-level tags become line breaks so words on either side do not run together
+_BLOCK = re.compile(r"<(?:/?(?:p|div|br|li|h[1-6]|tr|section|article|blockquote|pre)\b)[^>]*>", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+
+def extract_text(markup: str, max_chars: Optional[int] = None) -> str:
+    """
+    Readable text of an HTML document, using regular expressions rather than
+    a DOM (several times faster than html.parser, and tolerant of pages cut
+    off by the byte cap).
+
+    Drops scripts, styles, navigation and other non-content elements,
+    prefers the <article>/<main> element when the page has one, and
+    collapses whitespace (one line per block element).
+    """
+    title_match = _TITLE.search(markup)
+    title = html.unescape(_TAG.sub("", title_match.group(1))).strip() if title_match else ""
+    body = _SKIPPED.sub(" ", markup)
+    main = _MAIN.search(body)
+    if main is not None:
+        end = body.lower().rfind(f"</{main.group(1).lower()}")
+        body = body[main.end():end if end > main.end() else len(body)]
+    text = html.unescape(_TAG.sub(" ", _BLOCK.sub("\n", body)))
+    # str.split is much faster than a whitespace regex over the whole page
+    text = "\n".join(" ".join(words) for words in (line.split() for line in text.split("\n")) if words)
+    if title and not text.startswith(title):
+        text = f"{title}\n{text}" if text else title
+    return text[:max_chars] if max_chars is not None else text
+
+
+def _charset(response: httpx.Response, head: bytes) -> str:
+    if response.charset_encoding:
+        return response.charset_encoding
+    match = _META_CHARSET.search(head[:2048])
+    return match.group(1).decode("ascii") if match else "utf-8"
+
+
+@dataclass(frozen=True)
+class FetchedPage:
+    """Outcome of fetching one page; `text` is empty unless `ok`. `skipped` marks non-HTML responses."""
+    url: str
+    ok: bool
+    status_code: Optional[int] = None
+    content_type: str = ""
+    text: str = ""
+    bytes_read: int = 0
+    truncated: bool = False
+    skipped: bool = False
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+
+class PageFetcher:
+    """
+    Downloads result pages concurrently and extracts their text for the LLM.
+
+    Pages are read over one pooled async client (per event loop, like
+    `BraveSearchTool`), at most `per_host` at a time per host and
+    `max_connections` overall. Bodies are streamed and reading stops at
+    `max_bytes` (the page is kept, marked `truncated`); responses that are
+    not HTML are abandoned once their headers arrive, without reading the
+    body. Failures never raise: they come back as `FetchedPage(ok=False)`.
+
+    Counters for success rate, bytes and time are available via `stats()`.
+
+    Args:
+        top_n: How many result URLs `SearchAgent` fetches per task
+        max_bytes: Body bytes read per page
+        per_host: Concurrent requests per host
+        max_connections: Concurrent requests overall
+        timeout: Per-page timeout in seconds (connect, read and total)
+        max_text_chars: Characters of extracted text kept per page
+    """
+    def __init__(
+        self,
+        top_n: int = 3,
+        max_bytes: int = 512 * 1024,
+        per_host: int = 2,
+        max_connections: int = 16,
+        timeout: float = 5.0,
+        max_text_chars: int = 20_000,
+        telemetry: Optional[Telemetry] = None,
+    ):
+        if per_host < 1:
+            raise ValueError("per_host must be at least 1")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self.top_n = top_n
+        self.max_bytes = max_bytes
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_text_chars = max_text_chars
+        self.telemetry = telemetry or default_telemetry
+        self.headers = {
+            "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.1",
+            "Accept-Encoding": "gzip",
+            "User-Agent": "agent-x/1.0 (+page fetcher)",
+        }
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Semaphores are bound to the loop they are first used on, like the client
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+        self.attempted = 0
+        self.succeeded = 0
+        self.skipped_non_html = 0
+        self.truncated = 0
+        self.bytes_read = 0
+        self.fetch_seconds = 0.0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared asynchronous client for the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=self.headers,
+                limits=self.limits,
+                follow_redirects=True,
+            )
+            self._client_loop = loop
+            self._host_limits = {}
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
+    async def __aenter__(self) -> "PageFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def fetch_many(self, urls: Iterable[str]) -> List[FetchedPage]:
+        """
+        Fetch pages concurrently (duplicate URLs are fetched once).
+
+        Args:
+            urls: Page URLs, e.g. the top search results
+
+        Returns:
+            One FetchedPage per distinct URL, in input order
+        """
+        unique = list(dict.fromkeys(urls))
+        client = self.client
+        return list(await asyncio.gather(*(self.fetch(url, client) for url in unique)))
+
+    async def fetch(self, url: str, client: Optional[httpx.AsyncClient] = None) -> FetchedPage:
+        """Fetch one page within the per-host limit; never raises."""
+        client = client or self.client
+        host = urlsplit(url).netloc.lower()
+        semaphore = self._host_limits.get(host)
+        if semaphore is None:
+            semaphore = self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                # One deadline for the whole page, so a slow trickle cannot exceed it
+                page = await asyncio.wait_for(self._read(client, url), self.timeout)
+            except asyncio.TimeoutError:
+                page = FetchedPage(url=url, ok=False, error=f"Timed out after {self.timeout}s")
+            except Exception as e:
+                page = FetchedPage(url=url, ok=False, error=f"{type(e).__name__}: {e}")
+            elapsed = time.perf_counter() - started
+        page = replace(page, elapsed_ms=round(elapsed * 1000, 3))
+        self._count(page, elapsed)
+        return page
+
+    async def _read(self, client: httpx.AsyncClient, url: str) -> FetchedPage:
+        async with client.stream("GET", url) as response:
+            content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+            if response.status_code >= 400:
+                return FetchedPage(url=url, ok=False, status_code=response.status_code, content_type=content_type,
+                                   error=f"HTTP {response.status_code}")
+            if content_type and content_type not in HTML_CONTENT_TYPES:
+                # Leaving the block closes the stream without reading the body
+                return FetchedPage(url=url, ok=False, status_code=response.status_code, content_type=content_type,
+                                   skipped=True, error=f"Skipped non-HTML content ({content_type})")
+
+            chunks: List[bytes] = []
+            size = 0
+            truncated = False
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= self.max_bytes:
+                    # Stop reading; leaving the block closes the connection
+                    truncated = True
+                    break
+            body = b"".join(chunks)[:self.max_bytes]
+            text = extract_text(body.decode(_charset(response, body), errors="replace"), self.max_text_chars)
+            return FetchedPage(url=url, ok=bool(text), status_code=response.status_code, content_type=content_type,
+                               text=text, bytes_read=len(body), truncated=truncated,
+                               error=None if text else "No text extracted")
+
+    def _count(self, page: FetchedPage, elapsed: float) -> None:
+        with self._lock:
+            self.attempted += 1
+            self.succeeded += page.ok
+            self.skipped_non_html += page.skipped
+            self.truncated += page.truncated
+            self.bytes_read += page.bytes_read
+            self.fetch_seconds += elapsed
+        self.telemetry.record("agent_x.fetch.duration", elapsed * 1000, unit="ms", ok=page.ok)
+        self.telemetry.record("agent_x.fetch.bytes", page.bytes_read, unit="By")
+
+    def stats(self) -> Dict[str, Any]:
+        """Success rate, bytes read and average fetch time across all fetches."""
+        with self._lock:
+            return {
+                "attempted": self.attempted,
+                "succeeded": self.succeeded,
+                "success_rate": self.succeeded / self.attempted if self.attempted else 0.0,
+                "skipped_non_html": self.skipped_non_html,
+                "truncated": self.truncated,
+                "bytes_read": self.bytes_read,
+                "avg_fetch_ms": round(self.fetch_seconds / self.attempted * 1000, 3) if self.attempted else 0.0,
+            }
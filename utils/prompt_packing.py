@@ -0,0 +1,194 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from utils.lazy_import import lazy_import
+from utils.search_results import SearchResponse, SearchResult
+from utils.tokens import count_tokens, truncate_to_tokens
+
+litellm = lazy_import("litellm")
+
+ANALYSIS_HEADER = "Analyze the following search results for the query: '{query}'\n\n"
+ANALYSIS_FOOTER = "\n\nProvide a brief summary of the key information found:"
+NO_RESULTS = "(no results)"
+
+
+@lru_cache(maxsize=64)
+def get_context_window(model: str) -> Optional[int]:
+    """Input token limit of a model according to litellm's model map, or None if unknown."""
+    try:
+        info = litellm.get_model_info(model)
+    except Exception:
+        return None
+    window = info.get("max_input_tokens") or info.get("max_tokens")
+    return int(window) if window else None
+
+
+@dataclass(frozen=True)
+class PackedPrompt:
+    """A packed prompt and what went into it."""
+    text: str
+    tokens_used: int
+    budget: int
+    results_packed: int
+    results_available: int
+    descriptions_truncated: int
+    pages_packed: int = 0
+
+    @property
+    def utilization(self) -> float:
+        """Share of the budget the prompt uses (0.0-1.0)."""
+        return self.tokens_used / self.budget if self.budget else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "tokens_used": self.tokens_used,
+            "budget": self.budget,
+            "results_packed": self.results_packed,
+            "results_available": self.results_available,
+            "descriptions_truncated": self.descriptions_truncated,
+            "pages_packed": self.pages_packed,
+        }
+
+
+class PromptPacker:
+    """
+    Packs ranked search results into an analysis prompt that fits a token budget.
+
+    Results are added in rank order as compact numbered entries
+    ("1. Title\\n   url\\n   description"). Each description is capped at
+    `max_description_tokens`; the entry that would overflow the budget gets
+    its description cut to what is left (if at least `min_description_tokens`),
+    and packing stops there.
+
+    Page text fetched for a result (see `utils.page_fetcher`) is added below
+    its description as a "Page:" excerpt of up to `max_page_tokens`, when at
+    least `min_description_tokens` of the budget are left for it.
+
+    Args:
+        budget_tokens: Prompt token budget, template included
+        max_description_tokens: Cap per result description
+        min_description_tokens: Smallest description worth keeping when space runs out
+        context_window: Model input limit; looked up via litellm when None
+        max_page_tokens: Cap per fetched page excerpt
+    """
+    def __init__(self, budget_tokens: int = 1500, max_description_tokens: int = 120,
+                 min_description_tokens: int = 24, context_window: Optional[int] = None,
+                 max_page_tokens: int = 400):
+        if budget_tokens < 1:
+            raise ValueError("budget_tokens must be at least 1")
+        if min_description_tokens > max_description_tokens:
+            raise ValueError("min_description_tokens must not exceed max_description_tokens")
+        self.budget_tokens = budget_tokens
+        self.max_description_tokens = max_description_tokens
+        self.min_description_tokens = min_description_tokens
+        self.context_window = context_window
+        self.max_page_tokens = max_page_tokens
+
+    def budget_for(self, config: Any = None) -> int:
+        """
+        Effective budget for an LLM config: `budget_tokens`, lowered if the
+        model's context window minus `config.max_tokens` (room for the
+        completion) is smaller.
+        """
+        if config is None:
+            return self.budget_tokens
+        window = self.context_window or get_context_window(config.model)
+        if window is None:
+            return self.budget_tokens
+        return max(1, min(self.budget_tokens, window - config.max_tokens))
+
+    def pack(self, query: str, results: SearchResponse, budget: Optional[int] = None,
+             pages: Optional[Dict[str, str]] = None) -> PackedPrompt:
+        """
+        Build the analysis prompt for `query` within `budget` tokens.
+
+        Args:
+            query: The search query
+            results: Ranked search results
+            budget: Token budget; defaults to `budget_tokens`
+            pages: Extracted page text by result URL
+
+        Returns:
+            PackedPrompt with the text and the tokens used versus the budget
+        """
+        budget = budget or self.budget_tokens
+        pages = pages or {}
+        header = ANALYSIS_HEADER.format(query=query)
+        remaining = budget - count_tokens(header + NO_RESULTS + ANALYSIS_FOOTER) + count_tokens(NO_RESULTS)
+
+        entries: List[str] = []
+        truncated: List[bool] = []
+        with_page: List[bool] = []
+        costs: List[int] = []
+        for rank, result in enumerate(results, 1):
+            entry, was_truncated, page_used = self._format_entry(rank, result, remaining, pages.get(result.url))
+            if entry is None:
+                break
+            cost = count_tokens(entry + "\n")
+            if cost > remaining:
+                break
+            entries.append(entry)
+            truncated.append(was_truncated)
+            with_page.append(page_used)
+            costs.append(cost)
+            remaining -= cost
+
+        # Per-entry counts can drift by a token or two at the joins: shrink
+        # the last entry by the overshoot, dropping it if it no longer fits
+        while True:
+            text = header + ("\n".join(entries) or NO_RESULTS) + ANALYSIS_FOOTER
+            tokens_used = count_tokens(text)
+            if tokens_used <= budget or not entries:
+                break
+            old_cost = costs.pop()
+            entries.pop()
+            was_truncated = truncated.pop()
+            with_page.pop()
+            room = old_cost - (tokens_used - budget)
+            result = results[len(entries)]
+            entry, shrunk, page_used = self._format_entry(len(entries) + 1, result, room, pages.get(result.url))
+            # Keep the entry only if it actually got shorter, so the loop ends
+            if entry is not None and count_tokens(entry + "\n") < old_cost:
+                entries.append(entry)
+                truncated.append(was_truncated or shrunk)
+                with_page.append(page_used)
+                costs.append(room)
+
+        return PackedPrompt(
+            text=text,
+            tokens_used=tokens_used,
+            budget=budget,
+            results_packed=len(entries),
+            results_available=len(results),
+            descriptions_truncated=sum(truncated),
+            pages_packed=sum(with_page),
+        )
+
+    def _format_entry(self, rank: int, result: SearchResult, remaining: int, page_text: Optional[str] = None):
+        """
+        Format one result within `remaining` tokens.
+        Returns (entry, description truncated, page excerpt added); entry is None if it does not fit.
+        """
+        heading = f"{rank}. {' '.join(result.title.split())}\n   {result.url}"
+        room = remaining - count_tokens(heading + "\n   \n")
+        description = " ".join(result.description.split())
+        if not description:
+            if room < 0:
+                return None, False, False
+            entry, was_truncated = heading, False
+        else:
+            limit = min(self.max_description_tokens, room)
+            if limit < self.min_description_tokens and count_tokens(description) > limit:
+                return None, False, False
+            short = truncate_to_tokens(description, limit)
+            entry, was_truncated = f"{heading}\n   {short}", short != description
+
+        if page_text:
+            page_room = min(self.max_page_tokens, remaining - count_tokens(entry + "\n   Page: \n"))
+            if page_room >= self.min_description_tokens:
+                # Tokens average ~4 characters: tokenize at most 8 per token of room, not the whole page
+                excerpt = truncate_to_tokens(" ".join(page_text[:page_room * 8].split()), page_room)
+                if excerpt:
+                    return f"{entry}\n   Page: {excerpt}", was_truncated, True
+        return entry, was_truncated, False
@@ -0,0 +1,372 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from utils.lazy_import import lazy_import
+
+logfire = lazy_import("logfire")
+
+# Lower runs first
+INTERACTIVE = 0
+BATCH = 10
+
+# Priority of requests made in the current context (inherited by tasks and
+# threads started from it, like the telemetry sampling decision)
+_request_priority: ContextVar[int] = ContextVar("agent_x_request_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """
+    Run the block's rate-limited requests at `priority` (`INTERACTIVE` or `BATCH`).
+
+    Usage:
+        with request_priority(BATCH):
+            results = await agent.aperform_batch(queries)
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request could not be scheduled within the limiter's `max_wait`."""
+
+
+def _parse_list(value: Optional[str]) -> List[float]:
+    if not value:
+        return []
+    try:
+        return [float(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        return []
+
+
+def _parse_windows(policy: Optional[str]) -> List[float]:
+    """Window lengths from `X-RateLimit-Policy: 1;w=1, 15000;w=2592000`."""
+    windows = []
+    for part in (policy or "").split(","):
+        for field in part.split(";")[1:]:
+            name, _, value = field.strip().partition("=")
+            if name == "w":
+                try:
+                    windows.append(float(value))
+                except ValueError:
+                    return []
+    return windows
+
+
+class _Waiter:
+    """A queued request; woken from any thread, waited on by a thread or a coroutine."""
+    __slots__ = ("priority", "seq", "granted", "event", "loop")
+
+    def __init__(self, priority: int, seq: int, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.priority = priority
+        self.seq = seq
+        self.granted = False
+        self.loop = loop
+        self.event = asyncio.Event() if loop is not None else threading.Event()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def notify(self) -> None:
+        if self.loop is None:
+            self.event.set()
+        elif not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.event.set)
+
+
+class RateLimiter:
+    """
+    Token-bucket scheduler that paces requests to an API's advertised limits.
+
+    Limits are learned from the `X-RateLimit-Limit`, `-Remaining` and `-Reset`
+    headers (comma-separated, shortest window first, as Brave sends them;
+    window lengths come from `X-RateLimit-Policy` when present, otherwise the
+    first window is taken to be one second). Until the first response
+    arrives, only `burst` requests go out (for at most `probe_timeout`
+    seconds), so a cold burst does not run into 429s before anything is
+    known; if responses carry no rate-limit headers, requests are not paced.
+    Otherwise:
+
+    - requests are released at `utilization` x the shortest window's rate,
+      with bursts of up to `burst` requests;
+    - a window reported exhausted (`Remaining: 0`), or a 429, pauses all
+      requests until its reset (or `Retry-After`);
+    - requests that have to wait are queued by priority (`INTERACTIVE`
+      before `BATCH`, FIFO within a priority) rather than failed, unless
+      they could not go out within `max_wait` seconds, in which case
+      `RateLimitExceeded` is raised (e.g. a monthly quota is used up).
+
+    Works from threads (`acquire`) and event loops (`aacquire`) at once.
+    `BraveSearchTool` instances share one limiter per endpoint and API key
+    (see `shared_rate_limiter`).
+    """
+    def __init__(self, name: str = "upstream", utilization: float = 0.95, burst: int = 1,
+                 max_wait: float = 60.0, poll_interval: float = 1.0, probe_timeout: float = 5.0):
+        if not 0.0 < utilization <= 1.0:
+            raise ValueError("utilization must be in (0, 1]")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.name = name
+        self.utilization = utilization
+        self.burst = burst
+        self.max_wait = max_wait
+        self.poll_interval = poll_interval
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        # Learned from headers; rate None means "no limit known yet"
+        self.rate: Optional[float] = None
+        self.limits: List[Tuple[float, float]] = []
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        # Set once any response has been observed; until then the first
+        # requests act as probes
+        self._observed = False
+        self._probe_started: Optional[float] = None
+        self.granted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.throttled_responses = 0
+        self.wait_seconds = 0.0
+        self.max_queue = 0
+
+    def acquire(self, priority: Optional[int] = None) -> float:
+        """
+        Block until a request may go out. Returns the seconds waited.
+
+        Raises:
+            RateLimitExceeded: if the request cannot go out within `max_wait`
+        """
+        if self._try_fast_path():
+            return 0.0
+        started = time.monotonic()
+        waiter = self._enqueue(priority, loop=None)
+        try:
+            while True:
+                wait = self._dispatch(waiter, started)
+                if wait == 0.0:
+                    return self._finish(started)
+                waiter.event.wait(wait)
+                waiter.event.clear()
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    async def aacquire(self, priority: Optional[int] = None) -> float:
+        """Async version of `acquire`; cancelling the caller leaves the queue cleanly."""
+        if self._try_fast_path():
+            return 0.0
+        started = time.monotonic()
+        waiter = self._enqueue(priority, loop=asyncio.get_running_loop())
+        try:
+            while True:
+                wait = self._dispatch(waiter, started)
+                if wait == 0.0:
+                    return self._finish(started)
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                waiter.event.clear()
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+    def observe(self, headers: Mapping[str, str], status_code: Optional[int] = None) -> None:
+        """Update the limits from a response's rate-limit headers (and 429 status)."""
+        limits = _parse_list(headers.get("x-ratelimit-limit"))
+        remaining = _parse_list(headers.get("x-ratelimit-remaining"))
+        resets = _parse_list(headers.get("x-ratelimit-reset"))
+        retry_after = _parse_list(headers.get("retry-after"))
+        windows = _parse_windows(headers.get("x-ratelimit-policy"))
+        now = time.monotonic()
+        learned = None
+        with self._lock:
+            self._observed = True
+            self._refill(now)
+            if limits:
+                # Shortest window first; assume one second if the policy header is missing
+                window = windows[0] if windows else 1.0
+                rate = limits[0] / window * self.utilization
+                if rate != self.rate:
+                    learned = {"limit": limits[0], "window": window, "rate": rate}
+                self.rate = rate
+                self.limits = list(zip(limits, remaining))
+                for left, reset in zip(remaining, resets):
+                    if left < 1:
+                        self._pause(now + reset)
+                if remaining:
+                    # The server's count also covers other clients of the same key
+                    self._tokens = min(self._tokens, remaining[0])
+            if status_code == 429:
+                self.throttled_responses += 1
+                delay = retry_after[0] if retry_after else (resets[0] if resets else 1.0)
+                self._pause(now + max(delay, 0.0))
+            head = self._queue[0] if self._queue else None
+        if learned is not None:
+            logfire.info("Rate limit learned", upstream=self.name, **learned)
+        if head is not None:
+            # Limits changed; let the head of the queue recompute its wait
+            head.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        """Learned limits, queue depth and how long requests waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            waited = self.queued
+            return {
+                "rate_per_s": round(self.rate, 3) if self.rate is not None else None,
+                "limits": [{"limit": limit, "remaining": left} for limit, left in self.limits],
+                "paused_for_s": round(max(0.0, self._paused_until - now), 3),
+                "queue": len(self._queue),
+                "max_queue": self.max_queue,
+                "granted": self.granted,
+                "queued": waited,
+                "rejected": self.rejected,
+                "throttled_responses": self.throttled_responses,
+                "avg_wait_ms": round(self.wait_seconds / waited * 1000, 3) if waited else 0.0,
+            }
+
+    def _try_fast_path(self) -> bool:
+        # No queue and a token at hand: no waiter bookkeeping
+        now = time.monotonic()
+        with self._lock:
+            if self._queue or now < self._paused_until:
+                return False
+            self._refill(now)
+            if self._tokens < 1.0:
+                return False
+            self._take(now)
+            return True
+
+    def _enqueue(self, priority: Optional[int], loop: Optional[asyncio.AbstractEventLoop]) -> _Waiter:
+        waiter = _Waiter(_request_priority.get() if priority is None else priority, next(self._seq), loop)
+        with self._lock:
+            heapq.heappush(self._queue, waiter)
+            self.queued += 1
+            self.max_queue = max(self.max_queue, len(self._queue))
+        return waiter
+
+    def _dispatch(self, waiter: _Waiter, started: float) -> float:
+        """
+        Grant tokens to the head of the queue. Returns 0.0 once `waiter` is
+        granted, otherwise how long it should sleep before trying again.
+        """
+        now = time.monotonic()
+        rejected = False
+        with self._lock:
+            self._refill(now)
+            if now >= self._paused_until:
+                while self._queue and self._tokens >= 1.0:
+                    head = heapq.heappop(self._queue)
+                    head.granted = True
+                    self._take(now)
+                    if head is not waiter:
+                        head.notify()
+            if waiter.granted:
+                next_head = self._queue[0] if self._queue else None
+                wait = 0.0
+            else:
+                next_head = None
+                if self._queue[0] is waiter:
+                    wait = max(self._paused_until - now, self._time_to_token(now), 0.001)
+                else:
+                    # Woken when it reaches the head; poll as a safety net
+                    wait = self.poll_interval
+                if now + wait - started > self.max_wait and self._queue[0] is waiter:
+                    heapq.heappop(self._queue)
+                    self.rejected += 1
+                    rejected = True
+                    next_head = self._queue[0] if self._queue else None
+        if next_head is not None:
+            next_head.notify()
+        if waiter.granted:
+            return 0.0
+        if rejected:
+            raise RateLimitExceeded(
+                f"{self.name}: request could not be scheduled within {self.max_wait}s "
+                f"(rate {self.rate}/s, paused {max(0.0, self._paused_until - now):.1f}s)"
+            )
+        return wait
+
+    def _finish(self, started: float) -> float:
+        waited = time.monotonic() - started
+        with self._lock:
+            self.wait_seconds += waited
+        return waited
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        with self._lock:
+            if waiter.granted:
+                return
+            if waiter in self._queue:
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+            head = self._queue[0] if self._queue else None
+        if head is not None:
+            head.notify()
+
+    def _take(self, now: float) -> None:
+        # Caller holds self._lock
+        self._tokens -= 1.0
+        self.granted += 1
+        if not self._observed and self._probe_started is None:
+            self._probe_started = now
+
+    def _probing(self, now: float) -> bool:
+        # Caller holds self._lock
+        return (not self._observed and self._probe_started is not None
+                and now - self._probe_started < self.probe_timeout)
+
+    def _refill(self, now: float) -> None:
+        # Caller holds self._lock
+        if self.rate is None:
+            if not self._probing(now):
+                self._tokens = float(self.burst)
+        else:
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _time_to_token(self, now: float) -> float:
+        # Caller holds self._lock
+        if self._tokens >= 1.0:
+            return 0.0
+        if self.rate is None:
+            # Waiting for the probe's response (observe() wakes the queue)
+            return max(0.0, self._probe_started + self.probe_timeout - now)
+        return (1.0 - self._tokens) / self.rate
+
+    def _pause(self, until: float) -> None:
+        # Caller holds self._lock
+        if until > self._paused_until:
+            self._paused_until = until
+            self._tokens = min(self._tokens, 0.0)
+
+
+_shared: Dict[Any, RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiter(key: Any, name: str = "upstream") -> RateLimiter:
+    """
+    The process-wide limiter for `key` (e.g. an endpoint and API key), created
+    on first use, so every client of the same quota paces against it.
+    """
+    with _shared_lock:
+        limiter = _shared.get(key)
+        if limiter is None:
+            limiter = _shared[key] = RateLimiter(name=name)
+        return limiter
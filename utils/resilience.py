@@ -0,0 +1,327 @@
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Deque, Optional, Set, TypeVar
+
+from utils.lazy_import import lazy_import
+
+logfire = lazy_import("logfire")
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """Best-effort HTTP status of an exception (httpx and litellm/openai errors)."""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is None:
+        status = getattr(error, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(error: BaseException, retry_on_status: Set[int] = RETRYABLE_STATUS_CODES) -> bool:
+    """
+    Retry on the given HTTP statuses and on network-level failures
+    (timeouts, refused/reset connections), never on circuit-open errors.
+    """
+    if isinstance(error, CircuitOpenError):
+        return False
+    status = get_status_code(error)
+    if status is not None:
+        return status in retry_on_status
+    if isinstance(error, (TimeoutError, ConnectionError, asyncio.TimeoutError)):
+        return True
+    # httpx.TransportError and litellm's APIConnectionError/Timeout, matched
+    # by name so this module does not import either library
+    names = {cls.__name__ for cls in type(error).__mro__}
+    return bool(names & {"TransportError", "TimeoutException", "APIConnectionError", "Timeout", "APITimeoutError"})
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: the n-th retry sleeps a random time
+    in [0, min(max_delay, base_delay * 2**n)].
+    """
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.25, max_delay: float = 5.0,
+                 retry_on_status: Set[int] = RETRYABLE_STATUS_CODES):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on_status = set(retry_on_status)
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        return attempt < self.max_attempts and is_retryable(error, self.retry_on_status)
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+class CircuitBreaker:
+    """
+    Fails fast while an upstream is unhealthy.
+
+    closed    -> calls pass; `failure_threshold` consecutive failures open it
+    open      -> calls raise CircuitOpenError until `recovery_timeout` elapses
+    half-open -> one trial call; success closes the circuit, failure re-opens it
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, name: str = "upstream"):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.name = name
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """
+        Raise CircuitOpenError if the call must not go out.
+
+        Returns:
+            True if this call is the half-open trial; if it ends without an
+            outcome (e.g. it is cancelled), the caller must `release_trial()`
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.recovery_timeout:
+                    raise CircuitOpenError(f"Circuit open for {self.name}; failing fast")
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    raise CircuitOpenError(f"Circuit half-open for {self.name}; trial call in flight")
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def release_trial(self) -> None:
+        """Free the half-open trial slot of a call that ended without success or failure."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logfire.warn("Circuit opened", upstream=self.name, failures=self.failures)
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+class HedgePolicy:
+    """
+    Sends one duplicate request when the first is slower than the recent
+    `quantile` latency (p95 by default), and uses whichever finishes first.
+    Until `min_samples` latencies are observed, `initial_delay` is used.
+    """
+    def __init__(self, quantile: float = 0.95, window: int = 200, min_samples: int = 20,
+                 initial_delay: float = 1.0, min_delay: float = 0.01):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.hedges_sent = 0
+        self.hedges_won = 0
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def delay(self) -> float:
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_delay
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(self.quantile * len(ordered)))
+        return max(self.min_delay, ordered[index])
+
+
+class ResiliencePolicy:
+    """
+    Retry, optional hedging and a circuit breaker around one upstream.
+    Tools and agents each hold their own policy; pass the same instance to
+    several of them to share breaker state and latency history.
+
+    Args:
+        retry: Retry policy, or None for a single attempt
+        hedge: Hedging policy, or None to disable hedged requests
+        breaker: Circuit breaker, or None to disable it
+    """
+    def __init__(self, retry: Optional[RetryPolicy] = None, hedge: Optional[HedgePolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.retry = retry or RetryPolicy(max_attempts=1)
+        self.hedge = hedge
+        self.breaker = breaker
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @classmethod
+    def default(cls, name: str = "upstream") -> "ResiliencePolicy":
+        """3 attempts with jittered backoff and a breaker; hedging off."""
+        return cls(retry=RetryPolicy(), breaker=CircuitBreaker(name=name))
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run an async call under the policy."""
+        attempt = 0
+        while True:
+            attempt += 1
+            trial = self.breaker.before_call() if self.breaker is not None else False
+            try:
+                result = await self._hedged_call(fn)
+            except Exception as e:
+                self._record_outcome(e)
+                if not self.retry.should_retry(e, attempt):
+                    raise
+                delay = self.retry.backoff(attempt)
+                logfire.info("Retrying after failure", attempt=attempt, delay=delay, error=str(e))
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled (or interrupted) before an outcome: do not leave
+                # the breaker waiting for a trial that will never report
+                if trial:
+                    self.breaker.release_trial()
+                raise
+            if self.breaker is not None:
+                self.breaker.record_success()
+            return result
+
+    def call_sync(self, fn: Callable[[], T]) -> T:
+        """Run a blocking call under the policy (hedges run on a small thread pool)."""
+        attempt = 0
+        while True:
+            attempt += 1
+            trial = self.breaker.before_call() if self.breaker is not None else False
+            try:
+                result = self._hedged_call_sync(fn)
+            except Exception as e:
+                self._record_outcome(e)
+                if not self.retry.should_retry(e, attempt):
+                    raise
+                delay = self.retry.backoff(attempt)
+                logfire.info("Retrying after failure", attempt=attempt, delay=delay, error=str(e))
+                time.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled (or interrupted) before an outcome: do not leave
+                # the breaker waiting for a trial that will never report
+                if trial:
+                    self.breaker.release_trial()
+                raise
+            if self.breaker is not None:
+                self.breaker.record_success()
+            return result
+
+    def _record_outcome(self, error: BaseException) -> None:
+        # Only upstream-health failures count against the breaker; a 4xx such
+        # as a bad request means the upstream answered and is healthy
+        if self.breaker is None or isinstance(error, CircuitOpenError):
+            return
+        if is_retryable(error, self.retry.retry_on_status):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    async def _hedged_call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        started = time.perf_counter()
+        if self.hedge is None:
+            return await fn()
+
+        primary = asyncio.ensure_future(fn())
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge.delay())
+        if done:
+            result = primary.result()
+            self.hedge.observe(time.perf_counter() - started)
+            return result
+
+        self.hedge.hedges_sent += 1
+        hedge = asyncio.ensure_future(fn())
+        pending = {primary, hedge}
+        try:
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge.hedges_won += 1
+                        self.hedge.observe(time.perf_counter() - started)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _hedged_call_sync(self, fn: Callable[[], T]) -> T:
+        started = time.perf_counter()
+        if self.hedge is None:
+            return fn()
+
+        executor = self._get_executor()
+        # Each thread runs in a copy of the caller's context (telemetry sampling, spans)
+        primary = executor.submit(contextvars.copy_context().run, fn)
+        done, _ = wait({primary}, timeout=self.hedge.delay())
+        if done:
+            result = primary.result()
+            self.hedge.observe(time.perf_counter() - started)
+            return result
+
+        self.hedge.hedges_sent += 1
+        hedge = executor.submit(contextvars.copy_context().run, fn)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self.hedge.hedges_won += 1
+                    self.hedge.observe(time.perf_counter() - started)
+                    # The slower request cannot be interrupted; it finishes in the background
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="agent-x-hedge")
+        return self._executor
+
+    def stats(self) -> dict:
+        """Breaker state and hedge counters, for tuning."""
+        stats = {}
+        if self.breaker is not None:
+            stats.update(circuit_state=self.breaker.state, consecutive_failures=self.breaker.failures)
+        if self.hedge is not None:
+            stats.update(hedge_delay=self.hedge.delay(), hedges_sent=self.hedge.hedges_sent,
+                         hedges_won=self.hedge.hedges_won)
+        return stats
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from utils.search_results import SearchResponse
+
+
+class SQLiteCacheBackend:
+    """
+    Persistent cache tier stored in a single SQLite table.
+    Entries survive process restarts and expire by absolute wall-clock time.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                "key TEXT PRIMARY KEY, results TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[Tuple[float, List[Dict[str, str]]]]:
+        """Return (expires_at, results) for the key, or None if it is not stored."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, results FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def set(self, key: str, results: List[Dict[str, str]], expires_at: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, results, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(results), expires_at),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Delete every expired entry and return how many were removed."""
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM search_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SearchCache:
+    """
+    Two-tier cache for Brave search results.
+
+    - In-memory LRU bounded by `max_entries`, with per-entry TTL eviction.
+    - Optional SQLite tier (`persist_path`) that survives restarts; memory
+      misses fall through to it and disk hits are promoted back into memory.
+
+    Keys are the normalized (query, count, offset) triple. Responses are
+    immutable, so the memory tier hands out the stored object without copying.
+    Failed responses are never stored. Hit, miss and eviction counters are available via `stats()`.
+    Async callers use `aget`/`aset`, which keep SQLite work off the event loop.
+    """
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0, persist_path: Optional[str] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, SearchResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = SQLiteCacheBackend(persist_path) if persist_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired_evictions = 0
+        self.lru_evictions = 0
+
+    @staticmethod
+    def make_key(query: str, count: int = 10, offset: int = 0) -> str:
+        """Normalize a search into a cache key (case and whitespace insensitive)."""
+        normalized = " ".join(query.lower().split())
+        return f"{normalized}\x1f{int(count)}\x1f{int(offset)}"
+
+    @staticmethod
+    def is_cacheable(results: SearchResponse) -> bool:
+        """Only successful responses are cacheable."""
+        return results.ok
+
+    def get(self, query: str, count: int = 10, offset: int = 0) -> Optional[SearchResponse]:
+        """Return the cached response, or None on a miss."""
+        key = self.make_key(query, count, offset)
+        now = time.time()
+        results = self._get_memory(key, now)
+        if results is None and self._disk is not None:
+            results = self._get_disk(key, now)
+        if results is None:
+            self._count_miss()
+        return results
+
+    async def aget(self, query: str, count: int = 10, offset: int = 0) -> Optional[SearchResponse]:
+        """
+        Async `get` for code on an event loop: the memory tier is checked
+        inline, the SQLite tier in a worker thread so disk reads never block the loop.
+        """
+        key = self.make_key(query, count, offset)
+        now = time.time()
+        results = self._get_memory(key, now)
+        if results is None and self._disk is not None:
+            results = await asyncio.to_thread(self._get_disk, key, now)
+        if results is None:
+            self._count_miss()
+        return results
+
+    def set(self, query: str, count: int, offset: int, results: SearchResponse) -> bool:
+        """Store the response for the search. Returns False if it was not cacheable."""
+        if not self.is_cacheable(results):
+            return False
+        key, expires_at = self._set_memory(query, count, offset, results)
+        if self._disk is not None:
+            self._disk.set(key, results.to_dicts(), expires_at)
+        return True
+
+    async def aset(self, query: str, count: int, offset: int, results: SearchResponse) -> bool:
+        """Async `set`; the SQLite write and commit run in a worker thread."""
+        if not self.is_cacheable(results):
+            return False
+        key, expires_at = self._set_memory(query, count, offset, results)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.set, key, results.to_dicts(), expires_at)
+        return True
+
+    def _get_memory(self, key: str, now: float) -> Optional[SearchResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, results = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return results
+            del self._entries[key]
+            self.expired_evictions += 1
+            return None
+
+    def _get_disk(self, key: str, now: float) -> Optional[SearchResponse]:
+        stored = self._disk.get(key)
+        if stored is None:
+            return None
+        expires_at, items = stored
+        if expires_at > now:
+            results = SearchResponse.from_dicts(items)
+            with self._lock:
+                self._store(key, results, expires_at)
+                self.hits += 1
+                self.disk_hits += 1
+            return results
+        self._disk.delete(key)
+        with self._lock:
+            self.expired_evictions += 1
+        return None
+
+    def _count_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def _set_memory(self, query: str, count: int, offset: int, results: SearchResponse) -> Tuple[str, float]:
+        key = self.make_key(query, count, offset)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._store(key, results, expires_at)
+        return key, expires_at
+
+    def _store(self, key: str, results: SearchResponse, expires_at: float) -> None:
+        # Caller holds self._lock
+        self._entries[key] = (expires_at, results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.lru_evictions += 1
+
+    def prune(self) -> int:
+        """Drop expired entries from both tiers and return how many were removed."""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+            self.expired_evictions += len(expired)
+        removed = len(expired)
+        if self._disk is not None:
+            removed += self._disk.prune(now)
+        return removed
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+
+    def stats(self) -> Dict[str, float]:
+        """Counters for sizing the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.expired_evictions + self.lru_evictions,
+                "expired_evictions": self.expired_evictions,
+                "lru_evictions": self.lru_evictions,
+            }
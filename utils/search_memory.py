@@ -0,0 +1,266 @@
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.search_results import SearchResponse, SearchResult
+
+# (url, title, description, query, fetched_at)
+MemoryRow = Tuple[str, str, str, str, float]
+
+# Dropped from lookups: every stored result would "match" them
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from how in is it of on or the to was what when where which who why with".split()
+)
+_TERM = re.compile(r"\w+")
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS search_memory ("
+    "id INTEGER PRIMARY KEY, url TEXT NOT NULL UNIQUE, title TEXT NOT NULL, "
+    "description TEXT NOT NULL, query TEXT NOT NULL, fetched_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS search_memory_fetched_at ON search_memory (fetched_at)",
+    # External-content index: the text is stored once, in search_memory. It is
+    # maintained by SearchMemory per batch rather than by per-row triggers,
+    # which made bulk loads ~2.5x slower
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_memory_fts USING fts5("
+    "title, description, query, content='search_memory', content_rowid='id')",
+    "CREATE TEMP TABLE IF NOT EXISTS search_memory_incoming ("
+    "url TEXT PRIMARY KEY, title TEXT, description TEXT, query TEXT, fetched_at REAL, id INTEGER, reindex INTEGER)",
+)
+
+# One batch upsert, run in a single transaction after filling search_memory_incoming
+_UPSERT_BATCH = (
+    "UPDATE search_memory_incoming SET id = (SELECT id FROM search_memory AS m WHERE m.url = search_memory_incoming.url)",
+    # New URLs, and known URLs whose text changed, need (re)indexing;
+    # re-seeing a URL usually only refreshes fetched_at
+    "UPDATE search_memory_incoming SET reindex = id IS NULL OR EXISTS ("
+    "SELECT 1 FROM search_memory AS m WHERE m.id = search_memory_incoming.id AND "
+    "(m.title IS NOT search_memory_incoming.title OR m.description IS NOT search_memory_incoming.description "
+    "OR m.query IS NOT search_memory_incoming.query))",
+    "INSERT INTO search_memory_fts (search_memory_fts, rowid, title, description, query) "
+    "SELECT 'delete', m.id, m.title, m.description, m.query FROM search_memory_incoming AS i "
+    "JOIN search_memory AS m ON m.id = i.id WHERE i.reindex",
+    "INSERT INTO search_memory (url, title, description, query, fetched_at) "
+    "SELECT url, title, description, query, fetched_at FROM search_memory_incoming WHERE true "
+    "ON CONFLICT (url) DO UPDATE SET title = excluded.title, description = excluded.description, "
+    "query = excluded.query, fetched_at = excluded.fetched_at",
+    "INSERT INTO search_memory_fts (rowid, title, description, query) "
+    "SELECT m.id, m.title, m.description, m.query FROM search_memory_incoming AS i "
+    "JOIN search_memory AS m ON m.url = i.url WHERE i.reindex",
+    "DELETE FROM search_memory_incoming",
+)
+
+# Ranks (bm25 column weights: title, description, query) only the most
+# recently indexed matches, so very common terms do not score the whole index
+_LOOKUP = (
+    "SELECT m.title, m.url, m.description FROM ("
+    "SELECT rowid, bm25(search_memory_fts, 4.0, 1.0, 2.0) AS score FROM search_memory_fts "
+    "WHERE search_memory_fts MATCH ? ORDER BY rowid DESC LIMIT ?) AS candidate "
+    "JOIN search_memory AS m ON m.id = candidate.rowid "
+    "WHERE m.fetched_at >= ? ORDER BY candidate.score LIMIT ?"
+)
+
+
+def match_expression(query: str, max_terms: int = 8) -> Optional[str]:
+    """
+    Turn a free-text query into an FTS5 MATCH expression requiring every
+    significant term (implicit AND). Terms are quoted, so FTS5 operators in
+    the query are treated as text. Returns None if no term is left.
+    """
+    terms: List[str] = []
+    for term in _TERM.findall(query.lower()):
+        if term not in _STOPWORDS and term not in terms:
+            terms.append(term)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms[:max_terms])
+
+
+class SearchMemory:
+    """
+    Local full-text index (SQLite FTS5) of every search result seen.
+
+    Results are stored once per URL with the query that returned them and
+    when they were fetched; seeing a URL again refreshes it. `lookup` answers
+    a query locally when at least `min_results` results younger than
+    `max_age` match every significant query term, ranked by BM25 (title
+    matches weigh most); otherwise it returns None and the caller should go
+    to Brave and `remember` the response.
+
+    Only the `candidates` most recently indexed matches are ranked, which
+    keeps lookups for very common terms fast on large indexes.
+
+    Rows older than `max_age` are pruned incrementally: `remember` deletes at
+    most `prune_batch` of them every `prune_interval` seconds, so pruning
+    never holds the write lock for long. `prune()` removes all of them.
+    """
+    def __init__(
+        self,
+        path: str = ":memory:",
+        max_age: float = 7 * 24 * 3600.0,
+        min_results: int = 5,
+        prune_batch: int = 1000,
+        prune_interval: float = 60.0,
+        candidates: int = 1000,
+    ):
+        if max_age <= 0:
+            raise ValueError("max_age must be positive")
+        if min_results < 1:
+            raise ValueError("min_results must be at least 1")
+        self.path = path
+        self.max_age = max_age
+        self.min_results = min_results
+        self.prune_batch = prune_batch
+        self.prune_interval = prune_interval
+        self.candidates = candidates
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            if path != ":memory:":
+                # Readers do not block the writer; fsync only at checkpoints
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                for statement in _SCHEMA:
+                    self._conn.execute(statement)
+        self._last_prune = time.monotonic()
+        self.lookups = 0
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.pruned = 0
+
+    def lookup(self, query: str, count: int = 10, min_results: Optional[int] = None,
+               max_age: Optional[float] = None) -> Optional[SearchResponse]:
+        """
+        Answer a query from the index.
+
+        Args:
+            query: The search query string
+            count: Most results to return
+            min_results: Fewest fresh matches that count as an answer (default: `self.min_results`)
+            max_age: Freshness limit in seconds (default: `self.max_age`)
+
+        Returns:
+            SearchResponse with up to `count` results, best match first, or
+            None if there are not enough fresh, relevant matches
+        """
+        needed = min(self.min_results if min_results is None else min_results, count)
+        expression = match_expression(query)
+        results: List[SearchResult] = []
+        if expression is not None:
+            cutoff = time.time() - (self.max_age if max_age is None else max_age)
+            with self._lock:
+                rows = self._conn.execute(_LOOKUP, (expression, max(count, self.candidates), cutoff, count)).fetchall()
+            results = [SearchResult(title, url, description) for title, url, description in rows]
+        with self._lock:
+            self.lookups += 1
+            if expression is None or len(results) < needed:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return SearchResponse(results=tuple(results))
+
+    def remember(self, query: str, response: SearchResponse, fetched_at: Optional[float] = None) -> int:
+        """
+        Store the results of a successful search; failed responses are ignored.
+        Returns how many results were written.
+        """
+        if not response.ok or not response.results:
+            return 0
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        stored = self.insert_many(
+            (result.url, result.title, result.description, query, fetched_at) for result in response.results
+        )
+        if time.monotonic() - self._last_prune >= self.prune_interval:
+            self._last_prune = time.monotonic()
+            self.prune(limit=self.prune_batch)
+        return stored
+
+    def insert_many(self, rows: Iterable[MemoryRow], batch_size: int = 50_000) -> int:
+        """
+        Bulk upsert (url, title, description, query, fetched_at) rows, one
+        transaction per `batch_size` rows. Returns how many rows were written.
+        """
+        written = 0
+        batch: List[MemoryRow] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                written += self._write(batch)
+                batch = []
+        if batch:
+            written += self._write(batch)
+        return written
+
+    def _write(self, batch: List[MemoryRow]) -> int:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO search_memory_incoming (url, title, description, query, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                batch,
+            )
+            for statement in _UPSERT_BATCH:
+                self._conn.execute(statement)
+            self.stored += len(batch)
+        return len(batch)
+
+    def prune(self, max_age: Optional[float] = None, limit: Optional[int] = None) -> int:
+        """
+        Delete results older than `max_age` (default: `self.max_age`), oldest
+        first, in batches of `prune_batch` so each transaction stays short.
+
+        Args:
+            max_age: Age in seconds beyond which results are deleted
+            limit: Stop after deleting this many rows (default: no limit)
+
+        Returns:
+            How many rows were deleted
+        """
+        cutoff = time.time() - (self.max_age if max_age is None else max_age)
+        removed = 0
+        while limit is None or removed < limit:
+            size = self.prune_batch if limit is None else min(self.prune_batch, limit - removed)
+            with self._lock, self._conn:
+                expired = self._conn.execute(
+                    "SELECT 'delete', id, title, description, query FROM search_memory "
+                    "WHERE fetched_at < ? ORDER BY fetched_at LIMIT ?",
+                    (cutoff, size),
+                ).fetchall()
+                self._conn.executemany(
+                    "INSERT INTO search_memory_fts (search_memory_fts, rowid, title, description, query) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    expired,
+                )
+                self._conn.executemany("DELETE FROM search_memory WHERE id = ?", [(row[1],) for row in expired])
+                self.pruned += len(expired)
+            removed += len(expired)
+            if len(expired) < size:
+                break
+        return removed
+
+    def optimize(self) -> None:
+        """Merge the FTS index segments (worth running after large bulk loads)."""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO search_memory_fts (search_memory_fts) VALUES ('optimize')")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM search_memory").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Lookup hit rate and write/prune counters."""
+        with self._lock:
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+                "stored": self.stored,
+                "pruned": self.pruned,
+            }
@@ -0,0 +1,113 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # optional fast path, `pip install orjson`
+    orjson = None
+
+
+class SearchError(Exception):
+    """Raised by streaming search APIs (e.g. `iter_results`) when a page fails."""
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResult:
+    """
+    One web search hit. Immutable and slotted to keep per-result memory small.
+    Supports read-only dict-style access (`result["url"]`, `result.get("title")`,
+    `"url" in result`, `keys()`) for callers written against the old dict results.
+    """
+    title: str
+    url: str
+    description: str
+
+    _KEYS = ("title", "url", "description")
+
+    def __getitem__(self, key: str) -> str:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._KEYS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self._KEYS else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._KEYS
+
+    def to_dict(self) -> Dict[str, str]:
+        return {"title": self.title, "url": self.url, "description": self.description}
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResponse:
+    """
+    Envelope for one search: either results or an error, never both.
+    Iterating, `len()` and indexing go straight to `results`, so a response can
+    be used like the list it replaces; check `ok` instead of probing for an
+    in-band `"error"` entry.
+    """
+    results: Tuple[SearchResult, ...] = ()
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @classmethod
+    def failure(cls, error: str) -> "SearchResponse":
+        return cls(results=(), error=error)
+
+    @classmethod
+    def from_dicts(cls, items: List[Dict[str, str]]) -> "SearchResponse":
+        """Rebuild a response from `to_dicts()` output (e.g. a persisted cache entry)."""
+        if items and "error" in items[0]:
+            return cls.failure(items[0]["error"])
+        return cls(results=tuple(
+            SearchResult(item["title"], item["url"], item["description"]) for item in items
+        ))
+
+    def to_dicts(self) -> List[Dict[str, str]]:
+        """Plain dicts, in the legacy `[{"error": ...}]` form for failures."""
+        if self.error is not None:
+            return [{"error": self.error}]
+        return [result.to_dict() for result in self.results]
+
+    def __iter__(self) -> Iterator[SearchResult]:
+        return iter(self.results)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def __getitem__(self, index: Union[int, slice]):
+        return self.results[index]
+
+    def __bool__(self) -> bool:
+        return bool(self.results)
+
+
+def response_from_payload(data: Any) -> SearchResponse:
+    """Build a SearchResponse from a decoded Brave payload, keeping only the fields we use."""
+    web = data.get("web") if isinstance(data, dict) else None
+    if not web or "results" not in web:
+        return SearchResponse.failure("No results found in API response")
+    return SearchResponse(results=tuple(
+        SearchResult(
+            item.get("title", "No title"),
+            item.get("url", ""),
+            item.get("description", "No description available"),
+        )
+        for item in web["results"]
+    ))
+
+
+def decode_search_payload(body: bytes) -> SearchResponse:
+    """
+    Decode a raw Brave response body straight into a SearchResponse.
+    Uses orjson when it is installed (roughly 2x faster than json here).
+    """
+    return response_from_payload(orjson.loads(body) if orjson is not None else json.loads(body))
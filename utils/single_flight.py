@@ -0,0 +1,116 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    """One in-flight blocking call that other threads can wait on."""
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for a key is in flight,
+    callers with the same key wait for it and share its result (or error)
+    instead of starting their own. Nothing is kept once the call finishes.
+
+    `do` serves threads and `ado` serves coroutines. Async calls are shared
+    per event loop, since their result is a loop-bound future.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, str], "asyncio.Future[Any]"] = {}
+        # Callers still awaiting each shared task
+        self._waiters: Dict["asyncio.Future[Any]", int] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run `fn()` unless a call for `key` is already in flight, then share its outcome."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Async version of `do`. The shared call runs as its own task, so a
+        cancelled caller does not cancel it for the others; once every caller
+        has been cancelled, the shared call is cancelled too.
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = self._tasks[task_key] = loop.create_task(fn())
+                task.add_done_callback(lambda done: self._forget(task_key, done))
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+            self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            with self._lock:
+                waiting = self._waiters.pop(task, 1) - 1
+                if waiting:
+                    self._waiters[task] = waiting
+                elif not task.done():
+                    # Nobody wants the result any more; new callers start a fresh call
+                    if self._tasks.get(task_key) is task:
+                        del self._tasks[task_key]
+                    task.cancel()
+
+    def _forget(self, task_key: Tuple[asyncio.AbstractEventLoop, str], task: "asyncio.Future[Any]") -> None:
+        with self._lock:
+            if self._tasks.get(task_key) is task:
+                del self._tasks[task_key]
+        # Mark the error as retrieved even if every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Calls that went upstream (leaders) vs calls that joined one in flight (coalesced)."""
+        with self._lock:
+            total = self.leaders + self.coalesced
+            return {
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "coalesced_rate": self.coalesced / total if total else 0.0,
+                "in_flight": len(self._calls) + len(self._tasks),
+            }
+
+
+# Process-wide default shared by search tools unless one is passed explicitly,
+# so agents that search the same topic at the same time share requests
+single_flight = SingleFlight()
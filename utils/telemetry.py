@@ -0,0 +1,125 @@
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from utils.lazy_import import lazy_import
+
+logfire = lazy_import("logfire")
+
+# Sampling decision of the enclosing task, inherited by nested stages (and by
+# tool calls made inside the task) through the context
+_task_sampled: ContextVar[Optional[bool]] = ContextVar("agent_x_task_sampled", default=None)
+
+
+class _NoopSpan:
+    """Stand-in for a logfire span when a task is not sampled."""
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Telemetry:
+    """
+    Cheap per-stage instrumentation for agents and tools.
+
+    Every stage records its duration in the `agent_x.stage.duration` histogram
+    (a few microseconds). Nested logfire spans and the more expensive
+    attributes (token counts, payload sizes) are only produced for sampled
+    tasks, so the instrumentation can stay on in production.
+
+    Args:
+        sample_rate: Fraction of tasks traced with spans, 0.0-1.0. Defaults to
+            the AGENT_X_TRACE_SAMPLE_RATE environment variable, or 1.0.
+        enabled: Turn all instrumentation, including histograms, off.
+    """
+    def __init__(self, sample_rate: Optional[float] = None, enabled: bool = True):
+        if sample_rate is None:
+            sample_rate = float(os.getenv("AGENT_X_TRACE_SAMPLE_RATE", "1.0"))
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be between 0.0 and 1.0")
+        self.sample_rate = sample_rate
+        self.enabled = enabled
+        self._histograms: Dict[str, Any] = {}
+        self._histogram_lock = threading.Lock()
+
+    def should_sample(self) -> bool:
+        """Sampling decision for the current task (inherited from an enclosing task if any)."""
+        if not self.enabled:
+            return False
+        inherited = _task_sampled.get()
+        if inherited is not None:
+            return inherited
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def histogram(self, name: str, unit: str = "", description: str = ""):
+        """Return a logfire histogram, created once per name."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._histogram_lock:
+                histogram = self._histograms.get(name)
+                if histogram is None:
+                    histogram = logfire.metric_histogram(name, unit=unit, description=description)
+                    self._histograms[name] = histogram
+        return histogram
+
+    def record(self, name: str, value: float, unit: str = "", **attributes: Any) -> None:
+        """Record a value in a histogram (always, regardless of sampling)."""
+        if self.enabled:
+            self.histogram(name, unit=unit).record(value, attributes)
+
+    @contextmanager
+    def task(self, name: str, **attributes: Any) -> Iterator[Any]:
+        """
+        Top-level span for one unit of work. Makes the sampling decision once;
+        stages opened inside (including in tools) follow it.
+        """
+        sampled = self.should_sample()
+        token = _task_sampled.set(sampled)
+        try:
+            with self.stage(name, **attributes) as span:
+                yield span
+        finally:
+            _task_sampled.reset(token)
+
+    @contextmanager
+    def stage(self, name: str, **attributes: Any) -> Iterator[Any]:
+        """
+        Time one stage. Yields a span (or a no-op stand-in when not sampled)
+        that callers can attach extra attributes to.
+        """
+        if not self.enabled:
+            yield _NOOP_SPAN
+            return
+        started = time.perf_counter()
+        try:
+            if self.should_sample():
+                with logfire.span(name, **attributes) as span:
+                    yield span
+                    span.set_attribute("duration_ms", round((time.perf_counter() - started) * 1000, 3))
+            else:
+                yield _NOOP_SPAN
+        finally:
+            self.record(
+                "agent_x.stage.duration",
+                (time.perf_counter() - started) * 1000,
+                unit="ms",
+                stage=name,
+            )
+
+    @property
+    def sampled(self) -> bool:
+        """Whether the current task is sampled; use it to skip costly attributes."""
+        return self.enabled and bool(_task_sampled.get())
+
+
+# Process-wide default used by agents and tools unless one is passed explicitly
+telemetry = Telemetry()
@@ -0,0 +1,58 @@
+from functools import lru_cache
+from typing import Any, Dict, List
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tiktoken encoding once; None if tiktoken or its data is unavailable."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens in text with tiktoken's cl100k_base encoding.
+    Falls back to a ~4 characters/token estimate when tiktoken cannot be loaded.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: List[Dict[str, Any]]) -> int:
+    """Count tokens across the `content` of chat messages."""
+    return sum(count_tokens(str(message.get("content", ""))) for message in messages)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, ellipsis: str = "…") -> str:
+    """
+    Shorten text to at most `max_tokens` tokens (ellipsis included).
+    Cuts back to the last sentence end, or failing that the last word
+    boundary, in the kept part so the text does not stop mid-word.
+    """
+    if max_tokens <= 0 or not text:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    keep = max_tokens - count_tokens(ellipsis)
+    if keep <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is None:
+        head = text[:keep * 4]
+    else:
+        head = encoding.decode(encoding.encode(text, disallowed_special=())[:keep])
+    # Prefer a sentence end in the last third, otherwise the last space
+    sentence_end = max(head.rfind(". "), head.rfind("! "), head.rfind("? "))
+    if sentence_end >= len(head) * 2 // 3:
+        return head[:sentence_end + 1]
+    space = head.rfind(" ")
+    if space > 0:
+        head = head[:space]
+    return head.rstrip(" ,;:-") + ellipsis
@@ -1,12 +1,13 @@
 import os
 from dotenv import load_dotenv
-from crewai import LLM
 
 load_dotenv()
 
 # Commented out functions below are unused in the current implementation
 # They replicate logic handled by BaseAgent.get_llm() and LLMConfig
 # Keep for potential future use or alternative LLM client creation
+# (re-enabling them requires `from crewai import LLM`; import it inside the
+# function so importing this module does not pull in crewai)
 # def create_llm_client(provider: str = "gemini", temperature: float = 0.7):
 #     """
 #     Create a basic LLM client using CrewAI's LLM abstraction for non-agent use cases.